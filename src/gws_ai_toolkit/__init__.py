@@ -1,7 +1,10 @@
 from .apps.rag_app.generate_rag_app import GenerateDatahubRagFlowApp
+from .core.agents.agent_loop_policy import AgentLoopPolicy
+from .core.agents.agent_stats import AgentSessionStats, AgentStats, AgentSubStats
 from .core.agents.base_function_agent_ai import BaseFunctionAgentAi
 from .core.agents.base_function_agent_events import (
     BaseFunctionAgentEvent,
+    CodeDeltaEvent,
     CodeEvent,
     CreateSubAgent,
     ErrorEvent,
@@ -13,11 +16,13 @@ from .core.agents.base_function_agent_events import (
     ResponseCreatedEvent,
     ResponseEvent,
     ResponseFullTextEvent,
+    ResponseStatsEvent,
     SubAgentSuccess,
     TextDeltaEvent,
     UserQueryEventBase,
     UserQueryTextEvent,
 )
+from .core.agents.code_executor import CodeExecutor
 from .core.agents.env_agent_ai import EnvAgentAi
 from .core.agents.env_agent_ai_events import (
     EnvFileGeneratedEvent,
@@ -25,19 +30,28 @@ from .core.agents.env_agent_ai_events import (
     EnvInstallationSuccessEvent,
 )
 from .core.agents.env_generator_ai import CondaEnvGeneratorAi, PipEnvGeneratorAi
+from .core.agents.openai_stream_recording import (
+    OpenAiStreamRecording,
+    RecordingOpenAiClient,
+    ReplayOpenAiClient,
+)
+from .core.agents.subprocess_code_executor import SubprocessCodeExecutor
 from .core.agents.table.multi_table_agent_ai import MultiTableAgentAi, MultiTableTransformConfig
 from .core.agents.table.multi_table_agent_ai_events import MultiTableTransformEvent
 from .core.agents.table.plotly_agent_ai import PlotlyAgentAi
+from .core.agents.table.plotly_figure_decimator import PlotlyFigureDecimator
 from .core.agents.table.table_agent_ai import (
     PlotRequestConfig,
     TableAgentAi,
     TransformRequestConfig,
 )
 from .core.agents.table.table_agent_event_base import UserQueryMultiTablesEvent, UserQueryTableEvent
+from .core.agents.table.table_lineage import TableLineage, TableLineageStep
 from .core.agents.table.table_transform_agent_ai import TableTransformAgentAi, TableTransformConfig
 from .core.agents.table.table_transform_agent_ai_events import TableTransformEvent
 from .core.community_dto import BrickDocumentationDTO
 from .core.excel_file import ExcelFile
+from .core.openai_client_registry import OpenAiClientRegistry
 from .core.utils import Utils
 from .models.chat.chat_conversation import ChatConversation
 from .models.chat.chat_conversation_service import ChatConversationService
@@ -106,6 +120,7 @@ from .rag.dify.dify_class import (
     DifyDatasetDocument,
     DifyDocumentChunk,
     DifyDocumentChunksResponse,
+    DifyEndpointLatency,
     DifyGetDatasetMetadataResponse,
     DifyGetDatasetMetadataResponseMetadata,
     DifyGetDocumentsResponse,
@@ -170,6 +185,7 @@ from .stats.ai_table_stats_type import (
     TukeyHSDTestDetails,
     TwoGroupNonParametricTestDetails,
 )
+from .tasks.download_and_push_community_to_ragflow import DownloadAndPushCommunityToRagFlow
 from .tasks.download_bricks_documentation import DownloadBricksDocumentation
 from .tasks.download_community_stories import DownloadCommunityStories
 from .tasks.table_subtable_selector import TableSubtableSelector
@@ -178,6 +194,7 @@ __all__ = [
     # Core utilities
     "ExcelFile",
     "Utils",
+    "OpenAiClientRegistry",
     "BrickDocumentationDTO",
     # Apps
     "GenerateDatahubRagFlowApp",
@@ -219,6 +236,7 @@ __all__ = [
     "DifyChunksResponse",
     "DifyDocumentChunk",
     "DifyDocumentChunksResponse",
+    "DifyEndpointLatency",
     "DifyUploadFile",
     "DifyUploadFileResponse",
     "DifyMetadata",
@@ -240,6 +258,7 @@ __all__ = [
     "RagflowAskStreamResponse",
     # Agents
     "BaseFunctionAgentAi",
+    "CodeDeltaEvent",
     "CodeEvent",
     "CreateSubAgent",
     "ErrorEvent",
@@ -252,9 +271,19 @@ __all__ = [
     "ResponseCreatedEvent",
     "ResponseEvent",
     "ResponseFullTextEvent",
+    "ResponseStatsEvent",
     "TextDeltaEvent",
     "UserQueryEventBase",
     "UserQueryTextEvent",
+    "AgentLoopPolicy",
+    "AgentSessionStats",
+    "AgentStats",
+    "AgentSubStats",
+    "CodeExecutor",
+    "SubprocessCodeExecutor",
+    "OpenAiStreamRecording",
+    "RecordingOpenAiClient",
+    "ReplayOpenAiClient",
     "EnvAgentAi",
     "EnvFileGeneratedEvent",
     "EnvInstallationStartedEvent",
@@ -265,12 +294,15 @@ __all__ = [
     "MultiTableTransformConfig",
     "MultiTableTransformEvent",
     "PlotlyAgentAi",
+    "PlotlyFigureDecimator",
     "TableAgentAi",
     "PlotRequestConfig",
     "TransformRequestConfig",
     "SubAgentSuccess",
     "UserQueryMultiTablesEvent",
     "UserQueryTableEvent",
+    "TableLineage",
+    "TableLineageStep",
     "TableTransformAgentAi",
     "TableTransformConfig",
     "TableTransformEvent",
@@ -330,6 +362,7 @@ __all__ = [
     "CorrelationPairwiseDetails",
     "PairwiseComparisonResult",
     # Tasks
+    "DownloadAndPushCommunityToRagFlow",
     "DownloadBricksDocumentation",
     "DownloadCommunityStories",
     "TableSubtableSelector",
@@ -1,9 +1,9 @@
 import json
-import os
 from asyncio import sleep
 from typing import cast
 
 import reflex as rx
+from gws_ai_toolkit.core.openai_client_registry import OpenAiClientRegistry
 from gws_ai_toolkit.stats.ai_table_relation_stats import AiTableRelationStats
 from gws_ai_toolkit.stats.ai_table_stats_base import AiTableStatsBase
 from gws_ai_toolkit.stats.ai_table_stats_class import AiTableStats
@@ -534,8 +534,5 @@ Please provide a clear, direct answer to the user's original question based on t
             return reference_input
 
     def _get_openai_client(self) -> OpenAI:
-        """Get OpenAI client with API key"""
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OpenAI API key is not set")
-        return OpenAI(api_key=api_key)
+        """Get the shared OpenAI client for the OPENAI_API_KEY environment variable."""
+        return OpenAiClientRegistry.get_client_from_env()
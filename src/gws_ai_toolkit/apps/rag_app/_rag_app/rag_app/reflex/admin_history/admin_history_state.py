@@ -147,7 +147,7 @@ class AdminHistoryState(rx.State):
                             self.selected_document_name = resource_model.name
 
                 # Load messages
-                messages = conversation_service.get_messages_of_conversation(conversation_id)
+                messages = conversation_service.get_messages_of_conversation(conversation_id, lazy=True)
                 self.detail_messages = [msg.to_front_dto() for msg in messages]
         finally:
             self.is_loading_messages = False
@@ -106,7 +106,7 @@ class AiExpertState(ConversationChatStateBase, rx.State):
 
             conversation_service = ChatConversationService()
             conversation.chat_messages = conversation_service.get_messages_of_conversation(
-                conversation_id
+                conversation_id, lazy=True
             )
 
         self._conversation = conversation
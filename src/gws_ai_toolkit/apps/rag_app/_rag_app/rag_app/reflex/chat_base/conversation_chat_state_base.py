@@ -168,7 +168,7 @@ class ConversationChatStateBase(rx.State, mixin=True):
         main_state = await self.get_state(ReflexMainState)
         with await main_state.authenticate_user():
             conversation_service = ChatConversationService()
-            chat_messages = conversation_service.get_messages_of_conversation(conversation_id)
+            chat_messages = conversation_service.get_messages_of_conversation(conversation_id, lazy=True)
 
         self._chat_messages = [msg.to_front_dto() for msg in chat_messages]
         self.current_response_message = None
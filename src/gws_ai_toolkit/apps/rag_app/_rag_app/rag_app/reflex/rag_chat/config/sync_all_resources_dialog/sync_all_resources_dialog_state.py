@@ -119,20 +119,26 @@ class SyncAllResourcesDialogState(rx.State):
 
         rag_service = await config_state.get_dataset_rag_app_service()
 
-        for resource in self._get_limited_resources_to_sync():
+        resources = self._get_limited_resources_to_sync()
+        batch_size = rag_service.SYNC_BATCH_SIZE
+        # resources are sent by batch so the metadata of a batch are updated in a single call
+        for i in range(0, len(resources), batch_size):
+            batch = resources[i: i + batch_size]
             try:
                 with await main_state.authenticate_user():
-                    rag_service.send_resource_to_rag(resource, upload_options=None)
-
+                    errors = rag_service.send_resources_to_rag(batch, upload_options=None)
             except Exception as e:
                 Logger.log_exception_stack_trace(e)
-                async with self:
-                    self.sync_errors.append(
-                        f"Error syncing resource '{resource.resource_model.name}' {resource.resource_model.id}: {e}"
-                    )
+                errors = {resource.resource_model.id: e for resource in batch}
 
             async with self:
-                self.sync_resource_progress += 1
+                for resource in batch:
+                    error = errors.get(resource.resource_model.id)
+                    if error is not None:
+                        self.sync_errors.append(
+                            f"Error syncing resource '{resource.resource_model.name}' {resource.resource_model.id}: {error}"
+                        )
+                self.sync_resource_progress += len(batch)
 
     @rx.var
     async def get_compatible_resource_explanation(self) -> str:
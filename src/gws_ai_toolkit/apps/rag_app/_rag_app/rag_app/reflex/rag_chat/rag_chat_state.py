@@ -92,7 +92,7 @@ class RagChatState(ConversationChatStateBase, rx.State):
             # Load existing messages into the conversation object
             conversation_service = ChatConversationService()
             conversation.chat_messages = conversation_service.get_messages_of_conversation(
-                conversation_id
+                conversation_id, lazy=True
             )
 
         self._conversation = conversation
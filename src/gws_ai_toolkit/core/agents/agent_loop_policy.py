@@ -0,0 +1,167 @@
+import re
+import time
+from typing import ClassVar
+
+from gws_core import BaseModelDTO
+
+from .base_function_agent_events import FunctionErrorEvent, ResponseStatsEvent
+
+
+class AgentLoopPolicy(BaseModelDTO):
+    """Limits of the loop of an agent call (BaseFunctionAgentAi.call_agent).
+
+    The loop calls OpenAI until there is no more function to call, the policy stops it
+    when a limit is reached and trims the stack traces sent back to OpenAI on errors.
+    The limits are checked before each call to OpenAI.
+    """
+
+    max_consecutive_errors: int = 5
+    max_consecutive_calls: int = 10
+    # maximum duration of the agent call in seconds, None for no limit
+    deadline: float | None = None
+    # maximum number of tokens (input + output) of the agent call including its sub agents, None for no limit
+    max_tokens: int | None = None
+    # stop when the function calls fail this number of times in a row with the same error, None to disable
+    max_identical_errors: int | None = 3
+    # maximum number of frames and characters of the stack traces sent to OpenAI
+    max_stack_trace_frames: int = 4
+    max_stack_trace_length: int = 3000
+
+    # name of the file of the code executed with exec
+    GENERATED_CODE_FILE: ClassVar[str] = '"<string>"'
+
+    def start(self) -> "AgentLoopRun":
+        """Create the state of a new agent call"""
+        return AgentLoopRun(self)
+
+    def trim_stack_trace(self, stack_trace: str) -> str:
+        """Keep the relevant frames of a stack trace: the frames of the generated code and the
+        last frame (where the error was raised). The other frames are replaced by '...'.
+        """
+        # chained exceptions contain multiple tracebacks, trim each of them
+        blocks = re.split(r"(?m)^(?=Traceback \(most recent call last\):)", stack_trace.strip())
+        trimmed = "\n".join(self._trim_traceback(block) for block in blocks if block)
+
+        if len(trimmed) > self.max_stack_trace_length:
+            # keep the end, it contains the error
+            trimmed = "...\n" + trimmed[-self.max_stack_trace_length:]
+        return trimmed
+
+    def _trim_traceback(self, traceback_text: str) -> str:
+        head: list[str] = []
+        frames: list[list[str]] = []
+        tail: list[str] = []
+        for line in traceback_text.splitlines():
+            if tail:
+                tail.append(line)
+            elif line.startswith('  File "'):
+                frames.append([line])
+            elif frames and line.startswith("    "):
+                frames[-1].append(line)
+            elif frames:
+                tail.append(line)
+            else:
+                head.append(line)
+
+        if not frames:
+            return traceback_text.rstrip()
+
+        kept_indexes = [
+            i
+            for i, frame in enumerate(frames)
+            if frame[0].startswith(f"  File {self.GENERATED_CODE_FILE}") or i == len(frames) - 1
+        ]
+        kept_indexes = kept_indexes[-self.max_stack_trace_frames:]
+
+        lines = list(head)
+        previous_index = -1
+        for index in kept_indexes:
+            if index > previous_index + 1:
+                lines.append("  ...")
+            lines.extend(frames[index])
+            previous_index = index
+        lines.extend(tail)
+        return "\n".join(lines)
+
+
+class AgentLoopRun:
+    """State of an agent call, checked against the AgentLoopPolicy"""
+
+    policy: AgentLoopPolicy
+    call_count: int
+    error_count: int
+    # errors since the last successful step, reported as the retry count of the responses
+    consecutive_error_count: int
+    token_count: int
+    identical_error_count: int
+    _start_time: float
+    _last_error_signature: str | None
+
+    def __init__(self, policy: AgentLoopPolicy):
+        self.policy = policy
+        self.call_count = 0
+        self.error_count = 0
+        self.consecutive_error_count = 0
+        self.token_count = 0
+        self.identical_error_count = 0
+        self._start_time = time.perf_counter()
+        self._last_error_signature = None
+
+    def get_stop_reason(self) -> str | None:
+        """Return the message explaining why the loop must stop before the next call to OpenAI,
+        None if the loop can continue."""
+        policy = self.policy
+        if self.error_count >= policy.max_consecutive_errors:
+            return f"Maximum consecutive errors ({policy.max_consecutive_errors}) reached. Please rephrase your request."
+
+        if (
+            policy.max_identical_errors is not None
+            and self.identical_error_count >= policy.max_identical_errors
+        ):
+            return (
+                f"The same error occurred {self.identical_error_count} times in a row. Please rephrase your request."
+            )
+
+        if self.call_count >= policy.max_consecutive_calls:
+            return f"Maximum consecutive calls ({policy.max_consecutive_calls}) reached. Please rephrase your request."
+
+        if policy.deadline is not None and self.get_duration() >= policy.deadline:
+            return f"Maximum duration ({policy.deadline:g} seconds) reached. Please rephrase your request."
+
+        if policy.max_tokens is not None and self.token_count >= policy.max_tokens:
+            return f"Maximum number of tokens ({policy.max_tokens}) reached. Please rephrase your request."
+
+        return None
+
+    def get_duration(self) -> float:
+        return time.perf_counter() - self._start_time
+
+    def add_call(self) -> None:
+        self.call_count += 1
+
+    def add_response_stats(self, event: ResponseStatsEvent) -> None:
+        self.token_count += event.input_tokens + event.output_tokens
+
+    def add_errors(self, error_events: list[FunctionErrorEvent]) -> None:
+        """Count the errors of a step, a step whose errors are the same as the previous step is an identical error"""
+        self.error_count += 1
+        self.consecutive_error_count += 1
+        signature = "\n".join(sorted(self._get_error_signature(event) for event in error_events))
+        if signature == self._last_error_signature:
+            self.identical_error_count += 1
+        else:
+            self.identical_error_count = 1
+        self._last_error_signature = signature
+
+    def add_success(self) -> None:
+        self.consecutive_error_count = 0
+        self.identical_error_count = 0
+        self._last_error_signature = None
+
+    def _get_error_signature(self, event: FunctionErrorEvent) -> str:
+        # the last line of the stack trace is the exception with its message
+        if event.stack_trace:
+            lines = event.stack_trace.strip().splitlines()
+            if lines:
+                return lines[-1]
+        return event.message
@@ -0,0 +1,100 @@
+import time
+from collections.abc import Generator, Iterable
+from typing import Any
+
+from gws_core import BaseModelDTO
+
+from .base_function_agent_events import ResponseStatsEvent
+
+
+class AgentStats(BaseModelDTO):
+    """Aggregated usage and timings of OpenAI responses, the durations are in seconds"""
+
+    response_count: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    stream_duration: float = 0
+    function_duration: float = 0
+    function_call_count: int = 0
+    # number of responses that retried after a function error
+    retry_count: int = 0
+
+    def add_response_stats(self, event: ResponseStatsEvent) -> None:
+        self.response_count += 1
+        self.input_tokens += event.input_tokens
+        self.cached_tokens += event.cached_tokens
+        self.output_tokens += event.output_tokens
+        self.stream_duration += event.stream_duration
+        self.function_duration += event.function_duration
+        self.function_call_count += event.function_call_count
+        if event.retry_count > 0:
+            self.retry_count += 1
+
+
+class AgentSubStats(AgentStats):
+    """Stats of one agent of a session"""
+
+    agent_id: str
+    parent_agent_id: str | None = None
+    depth: int = 0
+
+
+class AgentSessionStats(BaseModelDTO):
+    """Usage and timings of a session of an agent and its sub agents.
+
+    The function_duration of an agent includes the time of its sub agents, so the
+    durations of the agents must not be summed. The total stream_duration is the time
+    spent waiting for OpenAI in the session.
+    """
+
+    total: AgentStats
+    agents: list[AgentSubStats]
+
+    @classmethod
+    def from_events(cls, events: Iterable[Any]) -> "AgentSessionStats":
+        """Aggregate the ResponseStatsEvent of the events, the other events are ignored"""
+        total = AgentStats()
+        agents: dict[str, AgentSubStats] = {}
+
+        for event in events:
+            if not isinstance(event, ResponseStatsEvent):
+                continue
+
+            total.add_response_stats(event)
+            agent_stats = agents.get(event.agent_id)
+            if agent_stats is None:
+                agent_stats = AgentSubStats(
+                    agent_id=event.agent_id, parent_agent_id=event.parent_agent_id, depth=event.depth
+                )
+                agents[event.agent_id] = agent_stats
+            agent_stats.add_response_stats(event)
+
+        # the function time of the sub agents is already counted in their parent
+        total.function_duration = sum(stats.function_duration for stats in agents.values() if stats.depth == 0)
+
+        return AgentSessionStats(total=total, agents=list(agents.values()))
+
+
+class DurationCounter:
+    """Count the time spent to generate the events of generators.
+    The time spent by the consumer between 2 events is not counted."""
+
+    duration: float
+
+    def __init__(self):
+        self.duration = 0
+
+    def count(self, events: Generator[Any, None, None]) -> Generator[Any, None, None]:
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    event = next(events)
+                except StopIteration:
+                    return
+                finally:
+                    self.duration += time.perf_counter() - start
+                yield event
+        finally:
+            events.close()
@@ -1,7 +1,11 @@
 import asyncio
 import json
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
 from collections.abc import AsyncGenerator, Generator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Generic, TypeVar, cast
 from uuid import uuid4
 
@@ -9,9 +13,15 @@ from gws_core import BaseModelDTO
 from openai import OpenAI
 from openai.types.responses import ResponseFunctionToolCall, ResponseOutputItemDoneEvent
 
+from gws_ai_toolkit.core.agents.agent_loop_policy import AgentLoopPolicy
+from gws_ai_toolkit.core.agents.agent_stats import AgentSessionStats, DurationCounter
+from gws_ai_toolkit.core.agents.code_executor import CodeExecutor
+from gws_ai_toolkit.core.agents.json_argument_streamer import JsonArgumentStreamer
 from gws_ai_toolkit.core.agents.table.agent_event_list import AgentEventList
+from gws_ai_toolkit.core.openai_client_registry import OpenAiClientRegistry
 
 from .base_function_agent_events import (
+    CodeDeltaEvent,
     CreateSubAgent,
     ErrorEvent,
     FunctionCallEvent,
@@ -22,6 +32,7 @@ from .base_function_agent_events import (
     ResponseCreatedEvent,
     ResponseEvent,
     ResponseFullTextEvent,
+    ResponseStatsEvent,
     SubAgentSuccess,
     TextDeltaEvent,
     UserQueryEventBase,
@@ -34,8 +45,16 @@ U = TypeVar("U", bound=UserQueryEventBase)
 class BaseFunctionAgentAi(ABC, Generic[T, U]):
     """Base class for AI agents that interact with OpenAI streaming API to call functions"""
 
+    # Limits of the default loop policy, see set_loop_policy
     MAX_CONSECUTIVE_ERRORS = 5
     MAX_CONSECUTIVE_CALLS = 10
+    # If true, the TextDeltaEvent are yielded but not stored in the event list,
+    # only the ResponseFullTextEvent of the response is stored
+    COMPACT_EVENT_LIST = True
+    # Maximum number of function calls handled concurrently in parallel mode
+    MAX_PARALLEL_FUNCTION_CALLS = 4
+    # Argument of the function calls streamed with CodeDeltaEvent while OpenAI generates it
+    STREAMED_CODE_ARGUMENT = "code"
 
     # We only store the open ai api key, not the client itself
     # because this is used in reflex and reflex can't pickle open_ai client
@@ -45,8 +64,16 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
     _temperature: float
     _event_list: AgentEventList[T]
     _skip_success_response: bool
+    # If true, OpenAI can call multiple functions in a response and the independent calls are handled concurrently
+    _parallel_tool_calls: bool = False
     _replay_mode: bool = False
     _replayed_events: AgentEventList[T] | None = None
+    # Set when the agent is called as a sub agent, reported in the ResponseStatsEvent
+    _parent_agent_id: str | None = None
+    _depth: int = 0
+    _loop_policy: AgentLoopPolicy | None = None
+    # Executor of the generated code for the agents that execute code, None to execute it in the current process
+    _code_executor: CodeExecutor | None = None
 
     def __init__(
         self,
@@ -54,36 +81,77 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
         model: str,
         temperature: float,
         skip_success_response: bool = False,
+        parallel_tool_calls: bool = False,
     ):
         self.id = str(uuid4())
         self._openai_api_key = openai_api_key
         self._model = model
         self._temperature = temperature
-        self._event_list = AgentEventList[T]()
+        self._event_list = AgentEventList[T](compact_mode=self.COMPACT_EVENT_LIST)
         self._success_inputs = None
         self._skip_success_response = skip_success_response
+        self._parallel_tool_calls = parallel_tool_calls
 
     def _get_openai_client(self) -> OpenAI:
-        """Create and return OpenAI client on-demand.
+        """Get the shared OpenAI client from the registry.
 
         This avoids storing the client which contains unpicklable objects like SSLContext.
         """
-        return OpenAI(api_key=self._openai_api_key)
+        return OpenAiClientRegistry.get_client(self._openai_api_key)
 
     async def call_agent_async(
         self,
         user_query: U,
     ) -> AsyncGenerator[T, None]:
-        """Asynchronous wrapper for call_agent to collect all events into a list
+        """Asynchronous version of call_agent that streams the events
+
+        The agent runs in a worker thread and each event is passed to the event loop
+        through a queue as soon as it is emitted, so the text deltas reach the consumer
+        at the same time as with call_agent. If the consumer stops the iteration,
+        the agent is stopped at its next event.
 
         Args:
             user_query: User's request
-        Returns:
-            List of all events emitted during generation
+        Yields:
+            T: Stream of events during generation
         """
-        loop = asyncio.get_event_loop()
-        for event in await loop.run_in_executor(None, lambda: list(self.call_agent(user_query))):
-            yield event
+        loop = asyncio.get_running_loop()
+        event_queue: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue()
+        stop_event = threading.Event()
+
+        def put_in_queue(is_end: bool, value: Any) -> None:
+            try:
+                loop.call_soon_threadsafe(event_queue.put_nowait, (is_end, value))
+            except RuntimeError:
+                # the event loop is closed, nobody is listening anymore
+                stop_event.set()
+
+        def run_agent() -> None:
+            events = self.call_agent(user_query)
+            try:
+                for event in events:
+                    if stop_event.is_set():
+                        break
+                    put_in_queue(False, event)
+            except Exception as err:
+                put_in_queue(True, err)
+                return
+            finally:
+                events.close()
+            put_in_queue(True, None)
+
+        loop.run_in_executor(None, run_agent)
+
+        try:
+            while True:
+                is_end, value = await event_queue.get()
+                if is_end:
+                    if value is not None:
+                        raise value
+                    return
+                yield value
+        finally:
+            stop_event.set()
 
     def call_agent(
         self,
@@ -98,8 +166,19 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
         Yields:
             PlotAgentEvent: Stream of events during generation
         """
-        consecutive_error_count = 0
-        consecutive_call_count = 0
+        try:
+            yield from self._call_agent_loop(user_query)
+        finally:
+            # keep the text of an interrupted response when the deltas are not stored
+            self._event_list.flush_pending_text()
+
+    def _call_agent_loop(
+        self,
+        user_query: U,
+    ) -> Generator[T, None, None]:
+        """Main loop of call_agent, call OpenAI until there is no more function to call
+        or a limit of the loop policy is reached"""
+        loop_run = self.get_loop_policy().start()
 
         messages = [{"role": "user", "content": [{"type": "input_text", "text": user_query.query}]}]
         user_event = cast(T, user_query)
@@ -107,17 +186,28 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
         yield user_event
 
         # Main generation loop - replace recursion with iteration
-        while (
-            consecutive_error_count < self.MAX_CONSECUTIVE_ERRORS
-            and consecutive_call_count < self.MAX_CONSECUTIVE_CALLS
-        ):
-            consecutive_call_count += 1
+        while True:
+            stop_reason = loop_run.get_stop_reason()
+            if stop_reason is not None:
+                error = cast(T, ErrorEvent(message=stop_reason, agent_id=self.id))
+                self._event_list.append(error)
+                yield error
+                break
 
-            success_event: FunctionSuccessEvent | None = None
-            error_event: FunctionErrorEvent | None = None
+            loop_run.add_call()
+
+            # function results of this step by call id (several calls in parallel mode)
+            function_results: dict[str, FunctionSuccessEvent | FunctionErrorEvent] = {}
+            function_call_ids: list[str] = []
 
             # Generate events for this attempt
             for event in self._generate_stream_internal(messages, user_query):
+                if isinstance(event, ResponseStatsEvent):
+                    # the tokens of the sub agents count in the budget
+                    loop_run.add_response_stats(event)
+                    if event.agent_id == self.id:
+                        event.retry_count = loop_run.consecutive_error_count
+
                 self._event_list.append(event)
                 yield event
 
@@ -125,74 +215,69 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
                 # we only filter the events for the current response_id
                 # this is useful to ignore events from sub agents in case of delegation
                 if isinstance(event, FunctionEventBase) and event.agent_id == self.id:
-                    if isinstance(event, FunctionErrorEvent):
-                        error_event = event
+                    if isinstance(event, FunctionCallEvent):
+                        function_call_ids.append(event.call_id)
+
+                    if isinstance(event, FunctionErrorEvent) and not isinstance(
+                        function_results.get(event.call_id), FunctionSuccessEvent
+                    ):
+                        function_results[event.call_id] = event
 
                     if isinstance(event, FunctionSuccessEvent) and not self._skip_success_response:
                         # this is a successful function call
-                        success_event = event
+                        function_results[event.call_id] = event
 
-            # If function was successfully called, prepare success response
-            if success_event:
-                messages = [
-                    {
-                        "type": "function_call_output",
-                        "call_id": success_event.call_id,
-                        "output": json.dumps({"Result": success_event.function_response}),
-                    }
-                ]
-                continue
+            # If there were no function call and no error, we are done
+            if not function_results:
+                break
+
+            messages = [self._get_function_call_output(result) for result in function_results.values()]
+            # all the function calls of the response must have an output
+            for call_id in function_call_ids:
+                if call_id not in function_results:
+                    messages.append(
+                        {
+                            "type": "function_call_output",
+                            "call_id": call_id,
+                            "output": json.dumps({"Result": "No result"}),
+                        }
+                    )
 
             # If there was an error during the function call, prepare error message for next iteration
-            if error_event:
-                consecutive_error_count += 1
-                if not error_event.call_id:
+            error_events = [
+                result for result in function_results.values() if isinstance(result, FunctionErrorEvent)
+            ]
+            if error_events:
+                loop_run.add_errors(error_events)
+                if any(not error_event.call_id for error_event in error_events):
                     # If no call_id, we cannot proceed with function call output
                     break
-                # Include stack trace in AI context if available
-                error_output = error_event.message
-                if error_event.stack_trace:
-                    error_output = (
-                        f"{error_event.message}\n\nStack trace:\n{error_event.stack_trace}"
-                    )
-                messages = [
-                    {
-                        "type": "function_call_output",
-                        "call_id": error_event.call_id,
-                        "output": json.dumps({"Result": error_output}),
-                    },
+                messages.append(
                     {
                         "role": "user",
                         "content": [{"type": "input_text", "text": "Can you fix the code?"}],
-                    },
-                ]
-                continue
-
-            # If there were no function call and no error, we are done
-            if not success_event and not error_event:
-                break
-
-        if consecutive_error_count >= self.MAX_CONSECUTIVE_ERRORS:
-            error = cast(
-                T,
-                ErrorEvent(
-                    message=f"Maximum consecutive errors ({self.MAX_CONSECUTIVE_ERRORS}) reached. Please rephrase your request.",
-                    agent_id=self.id,
-                ),
-            )
-            self._event_list.append(error)
-            yield error
-
-        if consecutive_call_count >= self.MAX_CONSECUTIVE_CALLS:
-            error = cast(
-                T,
-                ErrorEvent(
-                    message=f"Maximum consecutive calls ({self.MAX_CONSECUTIVE_CALLS}) reached. Please rephrase your request.",
-                    agent_id=self.id,
-                ),
-            )
-            self._event_list.append(error)
-            yield error
+                    }
+                )
+            else:
+                loop_run.add_success()
+
+    def _get_function_call_output(self, result_event: FunctionSuccessEvent | FunctionErrorEvent) -> dict:
+        """Create the function_call_output message sent to OpenAI for a function result"""
+        if isinstance(result_event, FunctionSuccessEvent):
+            output = result_event.function_response
+        else:
+            # Include stack trace in AI context if available
+            output = result_event.message
+            if result_event.stack_trace:
+                # only send the relevant frames to reduce the size of the request
+                stack_trace = self.get_loop_policy().trim_stack_trace(result_event.stack_trace)
+                output = f"{result_event.message}\n\nStack trace:\n{stack_trace}"
+
+        return {
+            "type": "function_call_output",
+            "call_id": result_event.call_id,
+            "output": json.dumps({"Result": output}),
+        }
 
     def _generate_stream_internal(
         self,
@@ -209,8 +294,18 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
 
         current_response_id: str = ""
         text_response: str = ""
-
-        # Get OpenAI client (creates new instance on-demand)
+        # in parallel mode, the function calls are handled together when the response is completed
+        pending_function_calls: list[FunctionCallEvent] = []
+
+        # timings of the response
+        request_start = time.perf_counter()
+        time_to_first_delta: float | None = None
+        function_duration_counter = DurationCounter()
+        function_call_count = 0
+        # parsers of the arguments of the function calls being generated, by output index
+        argument_streamers: dict[int, tuple[ResponseFunctionToolCall, JsonArgumentStreamer]] = {}
+
+        # Get OpenAI client (shared by all the agents using the same api key)
         openai_client = self._get_openai_client()
 
         # Stream OpenAI response directly
@@ -221,12 +316,15 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
             temperature=self._temperature,
             previous_response_id=self._get_and_check_last_response_id(),
             tools=tools,
-            parallel_tool_calls=False,  # Disable parallel function calls for iterative processing
+            # parallel function calls are disabled by default for iterative processing
+            parallel_tool_calls=self._parallel_tool_calls,
         ) as stream:
             # Process streaming events
             for event in stream:
                 # Yield streaming events to consumer
                 if event.type == "response.output_text.delta":
+                    if time_to_first_delta is None:
+                        time_to_first_delta = time.perf_counter() - request_start
                     text_response = (text_response or "") + event.delta
                     yield cast(
                         T,
@@ -242,6 +340,14 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
                         T, ResponseCreatedEvent(response_id=current_response_id, agent_id=self.id)
                     )
                 elif event.type == "response.completed":
+                    # handle the function calls before completing the response so the
+                    # sub agent events stay inside the response
+                    if pending_function_calls:
+                        yield from function_duration_counter.count(
+                            self._handle_function_calls(pending_function_calls, user_query)
+                        )
+                        pending_function_calls = []
+
                     # If the response was a text response containing only text deltas, we can yield the full text event here
                     if text_response is not None:
                         yield cast(
@@ -250,15 +356,98 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
                                 response_id=event.response.id, text=text_response, agent_id=self.id
                             ),
                         )
+                    yield cast(
+                        T,
+                        self._get_response_stats_event(
+                            event.response,
+                            time_to_first_delta=time_to_first_delta,
+                            duration=time.perf_counter() - request_start,
+                            function_duration=function_duration_counter.duration,
+                            function_call_count=function_call_count,
+                        ),
+                    )
                     yield cast(
                         T, ResponseCompletedEvent(response_id=event.response.id, agent_id=self.id)
                     )
                     text_response = ""
                     current_response_id = ""
-                elif event.type == "response.output_item.done":
-                    yield from self._handle_response_output_item_done_event(
-                        event, current_response_id, user_query
+                elif event.type == "response.output_item.added":
+                    if isinstance(event.item, ResponseFunctionToolCall) and self.STREAMED_CODE_ARGUMENT:
+                        argument_streamers[event.output_index] = (
+                            event.item,
+                            JsonArgumentStreamer(self.STREAMED_CODE_ARGUMENT),
+                        )
+                elif event.type == "response.function_call_arguments.delta":
+                    code_delta_event = self._get_code_delta_event(
+                        argument_streamers.get(event.output_index), event.delta, current_response_id
                     )
+                    if code_delta_event is not None:
+                        yield cast(T, code_delta_event)
+                elif event.type == "response.output_item.done":
+                    argument_streamers.pop(event.output_index, None)
+                    if self._parallel_tool_calls:
+                        function_call_event = self._get_function_call_event(event, current_response_id)
+                        if function_call_event is not None:
+                            function_call_count += 1
+                            yield cast(T, function_call_event)
+                            pending_function_calls.append(function_call_event)
+                    else:
+                        for output_event in function_duration_counter.count(
+                            self._handle_response_output_item_done_event(event, current_response_id, user_query)
+                        ):
+                            if isinstance(output_event, FunctionCallEvent) and output_event.agent_id == self.id:
+                                function_call_count += 1
+                            yield output_event
+
+    def _get_code_delta_event(
+        self,
+        argument_streamer: tuple[ResponseFunctionToolCall, JsonArgumentStreamer] | None,
+        arguments_delta: str,
+        current_response_id: str,
+    ) -> CodeDeltaEvent | None:
+        """Parse the delta of the arguments of a function call and create the CodeDeltaEvent
+        of the new part of the code argument, None if the delta contains no code"""
+        if argument_streamer is None:
+            return None
+
+        function_call, streamer = argument_streamer
+        code_delta = streamer.feed(arguments_delta)
+        if not code_delta:
+            return None
+
+        return CodeDeltaEvent(
+            delta=code_delta,
+            function_name=function_call.name,
+            call_id=function_call.call_id,
+            response_id=current_response_id,
+            agent_id=self.id,
+        )
+
+    def _get_response_stats_event(
+        self,
+        response: Any,
+        time_to_first_delta: float | None,
+        duration: float,
+        function_duration: float,
+        function_call_count: int,
+    ) -> ResponseStatsEvent:
+        """Create the ResponseStatsEvent of a completed OpenAI response"""
+        usage = response.usage
+        input_tokens_details = usage.input_tokens_details if usage else None
+
+        return ResponseStatsEvent(
+            response_id=response.id,
+            agent_id=self.id,
+            input_tokens=usage.input_tokens if usage else 0,
+            cached_tokens=input_tokens_details.cached_tokens if input_tokens_details else 0,
+            output_tokens=usage.output_tokens if usage else 0,
+            time_to_first_delta=time_to_first_delta,
+            stream_duration=duration - function_duration,
+            function_duration=function_duration,
+            function_call_count=function_call_count,
+            parent_agent_id=self._parent_agent_id,
+            depth=self._depth,
+        )
 
     def _get_and_check_last_response_id(self) -> str | None:
         """Get and check that the current response ID is set
@@ -269,11 +458,10 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
         Raises:
             ValueError: If the current response ID is not set
         """
-        for event in reversed(self._event_list.get_all()):
-            if isinstance(event, ResponseEvent):
-                return event.response_id
-
-        return None
+        last_response_event = self._event_list.last_event(cast(type[T], ResponseEvent))
+        if last_response_event is None:
+            return None
+        return cast(ResponseEvent, last_response_event).response_id
 
     def _handle_response_output_item_done_event(
         self, event: ResponseOutputItemDoneEvent, current_response_id: str, user_query: U
@@ -287,16 +475,28 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
         Returns:
             Optional[PlotAgentEvent]: Event generated from handling the output, or None
         """
+        function_call_event = self._get_function_call_event(event, current_response_id)
+        if function_call_event is None:
+            return
+
+        yield cast(T, function_call_event)
+
+        yield from self._handle_function_call(function_call_event, user_query)
+
+    def _get_function_call_event(
+        self, event: ResponseOutputItemDoneEvent, current_response_id: str
+    ) -> FunctionCallEvent | None:
+        """Create the FunctionCallEvent of an output item done event, None if the item is not a function call"""
         if not isinstance(event, ResponseOutputItemDoneEvent) or not isinstance(
             event.item, ResponseFunctionToolCall
         ):
-            return
+            return None
 
         event_items = cast(ResponseFunctionToolCall, event.item)
 
         arguments = json.loads(event_items.arguments)
 
-        function_call_event = FunctionCallEvent(
+        return FunctionCallEvent(
             call_id=event_items.call_id,
             response_id=current_response_id,
             function_name=event_items.name,
@@ -304,9 +504,90 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
             agent_id=self.id,
         )
 
-        yield cast(T, function_call_event)
+    def _handle_function_calls(
+        self, function_call_events: list[FunctionCallEvent], user_query: U
+    ) -> Generator[T, None, None]:
+        """Handle the function calls of a response in parallel mode.
 
-        yield from self._handle_function_call(function_call_event, user_query)
+        The calls are grouped with _are_function_calls_independent, the calls of a group
+        are handled in order and the groups are handled concurrently in worker threads.
+        The events of the groups are interleaved in the yielded events, but the events
+        of a group (and so of a sub agent) keep their order.
+        """
+        groups = self._group_dependent_function_calls(function_call_events)
+
+        if len(groups) <= 1:
+            for function_call_event in function_call_events:
+                yield from self._handle_function_call(function_call_event, user_query)
+            return
+
+        # (is_group_end, event) sent by the worker threads
+        event_queue: queue.Queue[tuple[bool, T | None]] = queue.Queue()
+        stop_event = threading.Event()
+
+        def handle_group(group: list[FunctionCallEvent]) -> None:
+            try:
+                for function_call_event in group:
+                    try:
+                        for event in self._handle_function_call(function_call_event, user_query):
+                            if stop_event.is_set():
+                                return
+                            event_queue.put((False, event))
+                    except Exception as err:
+                        error = FunctionErrorEvent(
+                            message=f"Error handling {function_call_event.function_name}: {err}",
+                            call_id=function_call_event.call_id,
+                            response_id=function_call_event.response_id,
+                            agent_id=self.id,
+                        )
+                        event_queue.put((False, cast(T, error)))
+            finally:
+                event_queue.put((True, None))
+
+        max_workers = min(len(groups), self.MAX_PARALLEL_FUNCTION_CALLS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for group in groups:
+                executor.submit(handle_group, group)
+
+            remaining_groups = len(groups)
+            try:
+                while remaining_groups > 0:
+                    is_group_end, event = event_queue.get()
+                    if is_group_end:
+                        remaining_groups -= 1
+                        continue
+                    yield cast(T, event)
+            finally:
+                # stop the workers if the consumer stopped the generation
+                stop_event.set()
+
+    def _group_dependent_function_calls(
+        self, function_call_events: list[FunctionCallEvent]
+    ) -> list[list[FunctionCallEvent]]:
+        """Group the function calls that depend on each other, the calls keep their order in a group"""
+        groups: list[list[int]] = []
+        for index, function_call_event in enumerate(function_call_events):
+            dependent_groups = [
+                group
+                for group in groups
+                if any(
+                    not self._are_function_calls_independent(function_call_events[i], function_call_event)
+                    for i in group
+                )
+            ]
+            merged_group = sorted([i for group in dependent_groups for i in group] + [index])
+            groups = [group for group in groups if group not in dependent_groups] + [merged_group]
+
+        groups.sort(key=lambda group: group[0])
+        return [[function_call_events[i] for i in group] for group in groups]
+
+    def _are_function_calls_independent(
+        self, function_call_1: FunctionCallEvent, function_call_2: FunctionCallEvent
+    ) -> bool:
+        """Return true if 2 function calls of the same response can be handled concurrently.
+        Override it to enable parallel handling, by default the calls are handled one after the other.
+        """
+        return False
 
     @abstractmethod
     def _handle_function_call(
@@ -401,8 +682,16 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
         yield CreateSubAgent(
             response_id=parent_response_id,
             agent_id=sub_agent.id,
+            call_id=parent_call_id,
         )
 
+        sub_agent._parent_agent_id = parent_agent_id
+        sub_agent._depth = self._depth + 1
+        if sub_agent._loop_policy is None:
+            sub_agent._loop_policy = self._loop_policy
+        if sub_agent._code_executor is None:
+            sub_agent._code_executor = self._code_executor
+
         events: Generator[Any, None, None]
 
         if self._replay_mode:
@@ -410,7 +699,7 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
             if not self._replayed_events:
                 raise ValueError("No replayed events available in replay mode")
             create_sub_agent_event = self._replayed_events.find_create_sub_agent_event(
-                parent_response_id
+                parent_response_id, parent_call_id
             )
             if not create_sub_agent_event:
                 raise ValueError("Could not find sub agent ID in replayed events")
@@ -441,6 +730,32 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
                 agent_id=parent_agent_id,
             )
 
+    def get_loop_policy(self) -> AgentLoopPolicy:
+        """Get the policy that limits the loop of call_agent, by default built from
+        MAX_CONSECUTIVE_ERRORS and MAX_CONSECUTIVE_CALLS"""
+        if self._loop_policy is not None:
+            return self._loop_policy
+        return AgentLoopPolicy(
+            max_consecutive_errors=self.MAX_CONSECUTIVE_ERRORS,
+            max_consecutive_calls=self.MAX_CONSECUTIVE_CALLS,
+        )
+
+    def set_loop_policy(self, loop_policy: AgentLoopPolicy | None) -> None:
+        """Set the policy that limits the loop of call_agent (deadline, tokens, repeated errors...).
+        The sub agents called by this agent use the same policy unless they have their own.
+        """
+        self._loop_policy = loop_policy
+
+    def get_code_executor(self) -> CodeExecutor:
+        """Get the executor of the generated code, by default the code is executed in the current process"""
+        return self._code_executor or CodeExecutor()
+
+    def set_code_executor(self, code_executor: CodeExecutor | None) -> None:
+        """Set the executor of the generated code (e.g. SubprocessCodeExecutor to isolate it from the app).
+        The sub agents called by this agent use the same executor unless they have their own.
+        """
+        self._code_executor = code_executor
+
     def get_last_user_query(self) -> U | None:
         """Get the last user query event"""
         return cast(U, self._event_list.last_event(cast(type[T], UserQueryEventBase)))
@@ -456,3 +771,7 @@ class BaseFunctionAgentAi(ABC, Generic[T, U]):
     def get_events(self) -> AgentEventList[T]:
         """Get all events emitted during the last generation"""
         return self._event_list
+
+    def get_session_stats(self) -> AgentSessionStats:
+        """Get the tokens usage and the timings of the responses of the agent and its sub agents"""
+        return AgentSessionStats.from_events(self._event_list.get_all())
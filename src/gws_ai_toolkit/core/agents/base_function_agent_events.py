@@ -64,6 +64,15 @@ class CodeEvent(FunctionEventBase):
     code: str
 
 
+class CodeDeltaEvent(FunctionEventBase):
+    """Part of the code argument of a function call, emitted while OpenAI generates the arguments.
+    The complete arguments are in the FunctionCallEvent."""
+
+    type: Literal["code_delta"] = "code_delta"
+    function_name: str
+    delta: str
+
+
 class FunctionCallEvent(FunctionEventBase):
     type: Literal["function_call"] = "function_call"
     function_name: str
@@ -83,6 +92,28 @@ class ResponseFullTextEvent(ResponseEvent):
     text: str
 
 
+class ResponseStatsEvent(ResponseEvent):
+    """Usage and timings of an OpenAI response of an agent, emitted before the ResponseCompletedEvent.
+    The durations are in seconds."""
+
+    type: Literal["response_stats"] = "response_stats"
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    # time between the request and the first text delta, None if the response has no text
+    time_to_first_delta: float | None = None
+    # time of the stream, without the time spent in the function calls
+    stream_duration: float = 0
+    # time spent in the function calls of the response (including the sub agents)
+    function_duration: float = 0
+    function_call_count: int = 0
+    # number of consecutive function errors before this response (0 if it is not a retry)
+    retry_count: int = 0
+    # the agent that called this agent as a sub agent and the nesting level (0 for the main agent)
+    parent_agent_id: str | None = None
+    depth: int = 0
+
+
 class CreateSubAgent(ResponseEvent):
     """Event trigger before calling a sub agent.
     The reponse_id is the reponse_id that led to agent creation
@@ -94,6 +125,9 @@ class CreateSubAgent(ResponseEvent):
     """
 
     type: Literal["create_sub_agent"] = "create_sub_agent"
+    # call_id of the function call that created the sub agent, used to retrieve
+    # the sub agent when multiple function calls of a response create sub agents
+    call_id: str | None = None
 
 
 class SubAgentSuccess(FunctionSuccessEvent):
@@ -103,6 +137,7 @@ class SubAgentSuccess(FunctionSuccessEvent):
 # Union type for all events
 BaseFunctionAgentEvent = (
     TextDeltaEvent
+    | CodeDeltaEvent
     | FunctionErrorEvent
     | ErrorEvent
     | ResponseCreatedEvent
@@ -110,11 +145,13 @@ BaseFunctionAgentEvent = (
     | CodeEvent
     | FunctionCallEvent
     | ResponseFullTextEvent
+    | ResponseStatsEvent
 )
 
 # Type for events that can involve sub-agents
 BaseFunctionWithSubAgentEvent = Annotated[
     TextDeltaEvent
+    | CodeDeltaEvent
     | FunctionErrorEvent
     | ErrorEvent
     | ResponseCreatedEvent
@@ -122,6 +159,7 @@ BaseFunctionWithSubAgentEvent = Annotated[
     | CodeEvent
     | FunctionCallEvent
     | ResponseFullTextEvent
+    | ResponseStatsEvent
     | CreateSubAgent
     | SubAgentSuccess,
     Field(discriminator="type"),
@@ -0,0 +1,256 @@
+import traceback
+from typing import Any, ClassVar
+
+import numpy as np
+import pandas as pd
+from gws_core import BaseModelDTO
+
+from .code_execution_error import CodeExecutionError
+from .compiled_code_cache import CompiledCodeCache
+
+
+class CodeExecutor(BaseModelDTO):
+    """Execute the code generated by the agents in the current process.
+
+    The executors only contain their configuration so they can be stored in the agents
+    (the agents are pickled in the reflex states). Override _execute to execute the code
+    elsewhere, see SubprocessCodeExecutor.
+    """
+
+    # If true and the pandas Copy-on-Write mode is enabled for the whole process (always the case
+    # with pandas >= 3), the code receives lazy copies of the input DataFrames: the inputs are
+    # protected from the modifications of the code without copying their data, only the modified
+    # columns are copied. The mode is not switched on for the execution only because the option
+    # is global to the process, without it the results that share memory with an input are copied.
+    copy_on_write: bool = False
+    # If set, the code is first executed on a sample of this number of rows of the input DataFrames
+    # so the errors on the types and names are raised without running the code on the full data.
+    # The inputs smaller than twice the sample are executed directly. The side effects of the code
+    # (file writes, prints, random numbers...) happen twice when the sample execution succeeds.
+    sample_row_count: int | None = None
+
+    # errors of the sample execution that would also happen on the full data, the other errors
+    # may come from the sample itself and the code is executed on the full data. KeyError is not
+    # included, the label lookups (.loc['x'], get_group...) fail when the rows are not in the sample
+    SAMPLE_ERROR_TYPES: ClassVar[tuple[str, ...]] = (
+        "TypeError",
+        "NameError",
+        "AttributeError",
+        "SyntaxError",
+        "ImportError",
+        "ModuleNotFoundError",
+    )
+
+    def execute(self, code: str, execution_globals: dict[str, Any], result_names: list[str]) -> dict[str, Any]:
+        """Execute the code with the globals and return the result variables defined by the code.
+        With sample_row_count, the code may be executed twice (on a sample then on the full data),
+        its side effects happen on each execution.
+
+        :param code: python code to execute
+        :param execution_globals: globals of the code (modules and input variables)
+        :param result_names: names of the variables to return
+        :raises CodeExecutionError: if the code raises an error, with the stack trace for AI context
+        :return: the result variables by name, a variable not defined by the code is missing
+        """
+        if self.sample_row_count is not None:
+            sample_globals = get_sample_globals(execution_globals, self.sample_row_count)
+            if sample_globals is not None:
+                try:
+                    self._execute(code, sample_globals, result_names)
+                except CodeExecutionError as sample_error:
+                    if self.is_sample_error(sample_error):
+                        raise
+
+        return self._execute(code, execution_globals, result_names)
+
+    def protects_inputs(self) -> bool:
+        """True if the modifications of the code on the input DataFrames don't change the inputs,
+        the code doesn't need to copy them"""
+        return self.copy_on_write and is_pandas_copy_on_write_enabled()
+
+    def is_sample_error(self, error: CodeExecutionError) -> bool:
+        """True if the error of the sample execution must be raised without executing the code on the full data"""
+        # the last line of the stack trace is the exception with its message
+        lines = error.stack_trace.strip().splitlines()
+        if not lines:
+            return False
+        error_type = lines[-1].split(":", maxsplit=1)[0].rsplit(".", maxsplit=1)[-1]
+        return error_type in self.SAMPLE_ERROR_TYPES
+
+    def _execute(self, code: str, execution_globals: dict[str, Any], result_names: list[str]) -> dict[str, Any]:
+        """Execute the code once, see execute. Override it to execute the code elsewhere."""
+        if not self.copy_on_write:
+            self._exec(code, execution_globals)
+            return {name: execution_globals[name] for name in result_names if name in execution_globals}
+
+        input_dataframes = [
+            dataframe for value in execution_globals.values() for dataframe in get_dataframes(value)
+        ]
+        execution_globals = {name: get_lazy_copy(value) for name, value in execution_globals.items()}
+        self._exec(code, execution_globals)
+        results = {name: execution_globals[name] for name in result_names if name in execution_globals}
+
+        if is_pandas_copy_on_write_enabled():
+            return results
+        # without Copy-on-Write, a later modification of a result would modify the inputs
+        return {name: copy_if_shares_memory(value, input_dataframes) for name, value in results.items()}
+
+    def _exec(self, code: str, execution_globals: dict[str, Any]) -> None:
+        try:
+            exec(CompiledCodeCache.get_compiled_code(code), execution_globals)
+        except Exception as exec_error:
+            # Include stack trace in the exception for AI context
+            error_msg = f"Error executing generated code: {exec_error}"
+            stack_trace = traceback.format_exc()
+            raise CodeExecutionError(error_msg, stack_trace) from exec_error
+
+
+def is_pandas_copy_on_write_enabled() -> bool:
+    """True if the pandas Copy-on-Write mode is enabled for the process, it is always enabled
+    with pandas >= 3"""
+    if int(pd.__version__.split(".", maxsplit=1)[0]) >= 3:
+        return True
+    return pd.get_option("mode.copy_on_write") is True
+
+
+def enable_pandas_copy_on_write() -> None:
+    """Enable the pandas Copy-on-Write mode for the whole process. Only used in the dedicated worker
+    processes of SubprocessCodeExecutor, pandas doesn't support changing the mode in the app
+    process while other threads use pandas."""
+    if not is_pandas_copy_on_write_enabled():
+        pd.set_option("mode.copy_on_write", True)
+
+
+def get_lazy_copy(value: Any) -> Any:
+    """Get a copy of a DataFrame (or of a dict of DataFrames) that shares the data of the original.
+    With Copy-on-Write, the data is copied only when one of the objects is modified."""
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=False)
+    if isinstance(value, dict) and any(isinstance(item, pd.DataFrame) for item in value.values()):
+        return {key: get_lazy_copy(item) for key, item in value.items()}
+    return value
+
+
+def get_dataframes(value: Any) -> list[pd.DataFrame]:
+    """Get the DataFrame, or the DataFrames of the dict"""
+    if isinstance(value, pd.DataFrame):
+        return [value]
+    if isinstance(value, dict):
+        return [item for item in value.values() if isinstance(item, pd.DataFrame)]
+    return []
+
+
+def copy_if_shares_memory(value: Any, dataframes: list[pd.DataFrame]) -> Any:
+    """Get a deep copy of the DataFrame (or of the DataFrames of the dict) if it may share memory
+    with one of the DataFrames, otherwise the value itself"""
+    if isinstance(value, pd.DataFrame):
+        return value.copy() if dataframe_may_share_memory(value, dataframes) else value
+    if isinstance(value, dict) and any(isinstance(item, pd.DataFrame) for item in value.values()):
+        return {key: copy_if_shares_memory(item, dataframes) for key, item in value.items()}
+    return value
+
+
+def dataframe_may_share_memory(dataframe: pd.DataFrame, others: list[pd.DataFrame]) -> bool:
+    """True if the data of the DataFrame may share memory with the data of the other DataFrames.
+    The check is conservative: a column whose data is not in a numpy array (e.g. nullable or
+    Arrow columns) is considered shared."""
+    if not others:
+        return False
+
+    other_buffers = [buffer for other in others for buffer in _get_column_buffers(other) if buffer is not None]
+    for buffer in _get_column_buffers(dataframe):
+        if buffer is None:
+            return True
+        if any(np.may_share_memory(buffer, other_buffer) for other_buffer in other_buffers):
+            return True
+    return False
+
+
+def _get_column_buffers(dataframe: pd.DataFrame) -> list[np.ndarray | None]:
+    """Numpy array of the data of each column, None if the data is not in a numpy array"""
+    buffers: list[np.ndarray | None] = []
+    for _, column in dataframe.items():
+        if isinstance(column.dtype, np.dtype):
+            buffers.append(column.to_numpy(copy=False))
+        elif isinstance(column.dtype, pd.CategoricalDtype):
+            buffers.append(column.array.codes)
+        else:
+            buffers.append(None)
+    return buffers
+
+
+def get_sample_globals(execution_globals: dict[str, Any], row_count: int) -> dict[str, Any] | None:
+    """Replace the DataFrames of the globals (and the DataFrames of the dicts) by samples.
+    Return None if no DataFrame is larger than twice the sample, the sample execution is useless."""
+    has_large_dataframe = False
+    sample_globals: dict[str, Any] = {}
+    for name, value in execution_globals.items():
+        if isinstance(value, pd.DataFrame):
+            has_large_dataframe = has_large_dataframe or len(value) > 2 * row_count
+            value = get_dataframe_sample(value, row_count)
+        elif isinstance(value, dict) and any(isinstance(item, pd.DataFrame) for item in value.values()):
+            has_large_dataframe = has_large_dataframe or any(
+                isinstance(item, pd.DataFrame) and len(item) > 2 * row_count for item in value.values()
+            )
+            value = {
+                key: get_dataframe_sample(item, row_count) if isinstance(item, pd.DataFrame) else item
+                for key, item in value.items()
+            }
+        sample_globals[name] = value
+
+    return sample_globals if has_large_dataframe else None
+
+
+def get_dataframe_sample(dataframe: pd.DataFrame, row_count: int) -> pd.DataFrame:
+    """Get a sample of the rows of the DataFrame with the same columns, dtypes and index.
+
+    The sample is stratified: it contains the first rows, a row for each category of the categorical
+    columns, a row for each value of the other columns with few distinct values and a row with a
+    missing value for each column that has some (searched in a random subset of the rows), the other
+    rows are random. The rows keep their order. The sample is deterministic.
+    """
+    if len(dataframe) <= row_count:
+        return dataframe.copy()
+
+    rng = np.random.default_rng(0)
+    # the strata are searched in a random subset so the sample stays fast on large tables
+    pool_size = min(len(dataframe), row_count * 10)
+    pool_positions = np.sort(rng.choice(len(dataframe), size=pool_size, replace=False))
+    pool = dataframe.iloc[pool_positions]
+
+    # the first rows are often used by the code (df.iloc[0], df.loc[0]...)
+    selected: list[int] = list(range(min(5, row_count)))
+    for column_index in range(pool.shape[1]):
+        column = pool.iloc[:, column_index]
+        missing = column.isna().to_numpy()
+        if missing.any():
+            selected.append(int(pool_positions[np.argmax(missing)]))
+
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # the codes of the full column are cheap to deduplicate, the rare categories are kept
+            category_codes = pd.Series(dataframe.iloc[:, column_index].cat.codes.to_numpy())
+            first_positions = category_codes[category_codes >= 0].drop_duplicates().index[: row_count // 2]
+            selected.extend(int(position) for position in first_positions)
+            continue
+        if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+            continue
+        try:
+            codes, uniques = pd.factorize(column)
+        except TypeError:
+            # unhashable values (lists, dicts...)
+            continue
+        if len(uniques) > row_count // 2:
+            continue
+        # first row of each value
+        _, first_positions = np.unique(codes[codes >= 0], return_index=True)
+        selected.extend(int(position) for position in pool_positions[codes >= 0][first_positions])
+
+    # the strata first, completed with random rows of the pool
+    sample_positions = list(dict.fromkeys(selected))[:row_count]
+    remaining_count = row_count - len(sample_positions)
+    if remaining_count > 0:
+        other_positions = np.setdiff1d(pool_positions, sample_positions)
+        sample_positions.extend(
+            rng.choice(other_positions, size=min(remaining_count, len(other_positions)), replace=False).tolist()
+        )
+    return dataframe.iloc[np.sort(sample_positions)].copy()
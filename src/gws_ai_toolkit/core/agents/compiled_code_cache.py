@@ -0,0 +1,56 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from types import CodeType
+
+
+class CompiledCodeCache:
+    """Process level cache of the compiled generated code.
+
+    The same code is executed many times when the agent events are replayed (e.g. a recorded
+    session applied to many tables), the code objects are cached by the hash of the code so
+    it is compiled only once by process.
+    """
+
+    MAX_SIZE = 512
+    # name of the file of the compiled code, the same as exec with a string
+    FILE_NAME = "<string>"
+
+    # sha256 of the code -> compiled code
+    _cache: OrderedDict[str, CodeType] = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_compiled_code(cls, code: str) -> CodeType:
+        """Get the compiled code, compiled only if it is not in the cache.
+
+        :raises SyntaxError: if the code is invalid, invalid code is not cached
+        """
+        code_hash = hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+
+        with cls._lock:
+            compiled_code = cls._cache.get(code_hash)
+            if compiled_code is not None:
+                cls._cache.move_to_end(code_hash)
+                return compiled_code
+
+        compiled_code = compile(code, cls.FILE_NAME, "exec")
+
+        with cls._lock:
+            cls._cache[code_hash] = compiled_code
+            cls._cache.move_to_end(code_hash)
+            while len(cls._cache) > cls.MAX_SIZE:
+                cls._cache.popitem(last=False)
+
+        return compiled_code
+
+    @classmethod
+    def get_size(cls) -> int:
+        with cls._lock:
+            return len(cls._cache)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Clear the compiled code."""
+        with cls._lock:
+            cls._cache.clear()
@@ -0,0 +1,181 @@
+import re
+
+
+class JsonArgumentStreamer:
+    """Incremental parser of the JSON arguments of a function call, fed with the
+    response.function_call_arguments.delta events of OpenAI.
+
+    It streams the decoded value of a top level string argument (e.g. the generated code)
+    and keeps the names of the top level arguments received so far. The other values are
+    skipped without being decoded.
+    """
+
+    _ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+    # end of the current part of a string
+    _STRING_SPECIAL_CHARS_REGEX = re.compile(r'["\\]')
+
+    argument_name: str
+
+    _depth: int
+    _expecting_key: bool
+    _current_key: str | None
+    _keys: list[str]
+    _in_string: bool
+    # type of the current string: 'key', 'argument' (the streamed argument) or 'other'
+    _string_type: str
+    _key_buffer: list[str]
+    # characters after the backslash of an escape sequence not complete yet
+    _escape: str | None
+    # high surrogate of a \\u escape waiting for its low surrogate
+    _high_surrogate: str | None
+    _argument_complete: bool
+    _object_complete: bool
+
+    def __init__(self, argument_name: str):
+        self.argument_name = argument_name
+        self._depth = 0
+        self._expecting_key = False
+        self._current_key = None
+        self._keys = []
+        self._in_string = False
+        self._string_type = "other"
+        self._key_buffer = []
+        self._escape = None
+        self._high_surrogate = None
+        self._argument_complete = False
+        self._object_complete = False
+
+    def feed(self, delta: str) -> str:
+        """Parse the next part of the JSON arguments.
+
+        :return: the new decoded characters of the streamed argument, empty if there are none
+        """
+        output: list[str] = []
+        index = 0
+        length = len(delta)
+
+        while index < length:
+            if self._in_string:
+                if self._escape is not None:
+                    self._escape += delta[index]
+                    index += 1
+                    self._decode_escape(output)
+                    continue
+
+                match = self._STRING_SPECIAL_CHARS_REGEX.search(delta, index)
+                end = match.start() if match else length
+                if end > index:
+                    self._add_string_part(delta[index:end], output)
+                if match is None:
+                    break
+
+                index = end + 1
+                if delta[end] == '"':
+                    self._end_string(output)
+                else:
+                    self._escape = ""
+                continue
+
+            char = delta[index]
+            index += 1
+            if char == '"':
+                self._start_string()
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._expecting_key = char == "{"
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._object_complete = True
+            elif self._depth == 1 and char == ",":
+                self._expecting_key = True
+            elif self._depth == 1 and char == ":":
+                self._expecting_key = False
+
+        return "".join(output)
+
+    def get_keys(self) -> list[str]:
+        """Names of the top level arguments received so far"""
+        return list(self._keys)
+
+    def has_argument(self) -> bool:
+        """True if the streamed argument was received (at least its name)"""
+        return self.argument_name in self._keys
+
+    def is_argument_complete(self) -> bool:
+        return self._argument_complete
+
+    def is_complete(self) -> bool:
+        """True if the JSON object of the arguments is complete"""
+        return self._object_complete
+
+    def _start_string(self) -> None:
+        self._in_string = True
+        if self._depth != 1:
+            self._string_type = "other"
+        elif self._expecting_key:
+            self._string_type = "key"
+            self._key_buffer = []
+        elif self._current_key == self.argument_name:
+            self._string_type = "argument"
+        else:
+            self._string_type = "other"
+
+    def _end_string(self, output: list[str]) -> None:
+        self._flush_high_surrogate(output)
+        self._in_string = False
+        if self._string_type == "key":
+            self._current_key = "".join(self._key_buffer)
+            self._keys.append(self._current_key)
+        elif self._string_type == "argument":
+            self._argument_complete = True
+
+    def _add_string_part(self, part: str, output: list[str]) -> None:
+        if self._string_type == "other":
+            return
+        self._flush_high_surrogate(output)
+        if self._string_type == "key":
+            self._key_buffer.append(part)
+        else:
+            output.append(part)
+
+    def _decode_escape(self, output: list[str]) -> None:
+        escape = self._escape or ""
+        if escape[0] != "u":
+            self._escape = None
+            self._add_string_part(self._ESCAPES.get(escape, escape), output)
+            return
+
+        # unicode escape \\uXXXX
+        if len(escape) < 5:
+            return
+        self._escape = None
+        try:
+            code = int(escape[1:], 16)
+        except ValueError:
+            return
+
+        if 0xD800 <= code <= 0xDBFF:
+            self._flush_high_surrogate(output)
+            self._high_surrogate = chr(code)
+            return
+
+        if 0xDC00 <= code <= 0xDFFF and self._high_surrogate is not None:
+            high_code = ord(self._high_surrogate)
+            self._high_surrogate = None
+            character = chr(0x10000 + ((high_code - 0xD800) << 10) + (code - 0xDC00))
+        else:
+            character = chr(code)
+        self._add_string_part(character, output)
+
+    def _flush_high_surrogate(self, output: list[str]) -> None:
+        # a high surrogate without low surrogate, keep it as is
+        if self._high_surrogate is None:
+            return
+        high_surrogate = self._high_surrogate
+        self._high_surrogate = None
+        if self._string_type == "key":
+            self._key_buffer.append(high_surrogate)
+        elif self._string_type == "argument":
+            output.append(high_surrogate)
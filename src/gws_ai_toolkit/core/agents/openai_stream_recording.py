@@ -0,0 +1,192 @@
+import hashlib
+import json
+import threading
+from collections.abc import Iterator
+from typing import Any
+
+from openai import OpenAI
+from openai._models import construct_type
+from openai.types.responses import ResponseStreamEvent
+
+
+class OpenAiStreamRecording:
+    """Recorded calls to OpenAI responses.stream of an agent session.
+
+    Each recorded call contains the key of the request (see get_request_key) and the
+    events of the stream serialized as JSON. The recording is filled by a RecordingOpenAiClient
+    and served by a ReplayOpenAiClient, this allows running the agents without network access
+    (tests, benchmarks of the agent orchestration).
+    """
+
+    VERSION = 1
+
+    # parameters of responses.stream used to identify a request
+    REQUEST_KEY_PARAMETERS = ("model", "instructions", "input", "previous_response_id", "tools")
+
+    _responses: list[dict]
+    _lock: threading.Lock
+
+    def __init__(self, responses: list[dict] | None = None):
+        self._responses = list(responses) if responses else []
+        self._lock = threading.Lock()
+
+    def add_response(self, request_key: str, events: list[dict]) -> None:
+        """Add a recorded call, events are the JSON dumps of the stream events."""
+        with self._lock:
+            self._responses.append({"request_key": request_key, "events": events})
+
+    def pop_response(self, request_key: str | None = None) -> list[dict]:
+        """Remove and return the events of the first recorded call of the request.
+
+        :param request_key: key of the request, None to get the first recorded call whatever the request
+        :raises ValueError: if there is no recorded call for the request
+        """
+        with self._lock:
+            for i, response in enumerate(self._responses):
+                if request_key is None or response["request_key"] == request_key:
+                    return self._responses.pop(i)["events"]
+
+        if request_key is None:
+            raise ValueError("No more recorded OpenAI response")
+        raise ValueError(f"No recorded OpenAI response for the request '{request_key}'")
+
+    def get_responses_count(self) -> int:
+        return len(self._responses)
+
+    def to_json_dict(self) -> dict:
+        with self._lock:
+            return {"version": self.VERSION, "responses": list(self._responses)}
+
+    def save(self, file_path: str) -> None:
+        """Save the recording in a JSON file."""
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(self.to_json_dict(), file)
+
+    @classmethod
+    def from_json_dict(cls, json_dict: dict) -> "OpenAiStreamRecording":
+        if json_dict.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported OpenAI recording version '{json_dict.get('version')}'")
+        return cls(json_dict["responses"])
+
+    @classmethod
+    def load(cls, file_path: str) -> "OpenAiStreamRecording":
+        """Load a recording saved with save."""
+        with open(file_path, encoding="utf-8") as file:
+            return cls.from_json_dict(json.load(file))
+
+    @classmethod
+    def get_request_key(cls, request_parameters: dict[str, Any]) -> str:
+        """Get the key of a responses.stream request from its parameters (hash of the parameters
+        that define the request: model, instructions, input, previous response and tools).
+        """
+        key_parameters = {name: request_parameters.get(name) for name in cls.REQUEST_KEY_PARAMETERS}
+        dumped = json.dumps(key_parameters, sort_keys=True, default=str)
+        return hashlib.sha256(dumped.encode("utf-8")).hexdigest()
+
+
+class _RecordingStream:
+    """Context manager around a responses.stream manager that records the events of the stream."""
+
+    def __init__(self, stream_manager: Any, recording: OpenAiStreamRecording, request_key: str):
+        self._stream_manager = stream_manager
+        self._recording = recording
+        self._request_key = request_key
+        self._stream: Any = None
+        self._events: list[dict] = []
+
+    def __enter__(self) -> "_RecordingStream":
+        self._stream = self._stream_manager.__enter__()
+        return self
+
+    def __iter__(self) -> Iterator[Any]:
+        for event in self._stream:
+            self._events.append(event.model_dump(mode="json", exclude_unset=True))
+            yield event
+
+    def __exit__(self, exc_type, exc_value, traceback) -> Any:
+        # only the complete streams are recorded
+        if exc_type is None:
+            self._recording.add_response(self._request_key, self._events)
+        return self._stream_manager.__exit__(exc_type, exc_value, traceback)
+
+
+class _RecordingResponses:
+    def __init__(self, responses: Any, recording: OpenAiStreamRecording):
+        self._responses = responses
+        self._recording = recording
+
+    def stream(self, **kwargs) -> _RecordingStream:
+        request_key = OpenAiStreamRecording.get_request_key(kwargs)
+        return _RecordingStream(self._responses.stream(**kwargs), self._recording, request_key)
+
+
+class RecordingOpenAiClient:
+    """OpenAI client that records the calls to responses.stream in an OpenAiStreamRecording.
+
+    Register it in the OpenAiClientRegistry to record a session of the agents:
+
+        recording = OpenAiStreamRecording()
+        OpenAiClientRegistry.register_client(RecordingOpenAiClient(OpenAI(api_key=key), recording), key)
+        ... call the agent ...
+        recording.save(file_path)
+    """
+
+    def __init__(self, client: OpenAI, recording: OpenAiStreamRecording):
+        self._client = client
+        self.recording = recording
+        self.responses = _RecordingResponses(client.responses, recording)
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class _ReplayStream:
+    """Context manager that replays the recorded events of a stream."""
+
+    def __init__(self, events: list[dict]):
+        self._events = events
+
+    def __enter__(self) -> "_ReplayStream":
+        return self
+
+    def __iter__(self) -> Iterator[Any]:
+        for event in self._events:
+            # build the events like the OpenAI client does (no validation of the data)
+            yield construct_type(type_=ResponseStreamEvent, value=event)
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        return None
+
+
+class _ReplayResponses:
+    def __init__(self, recording: OpenAiStreamRecording, match_requests: bool):
+        self._recording = recording
+        self._match_requests = match_requests
+
+    def stream(self, **kwargs) -> _ReplayStream:
+        request_key = OpenAiStreamRecording.get_request_key(kwargs) if self._match_requests else None
+        return _ReplayStream(self._recording.pop_response(request_key))
+
+
+class ReplayOpenAiClient:
+    """Stand-in for the OpenAI client that replays the responses.stream calls of an
+    OpenAiStreamRecording, without network access. Each recorded call is replayed once.
+
+    Register it in the OpenAiClientRegistry with the api key given to the agents:
+
+        recording = OpenAiStreamRecording.load(file_path)
+        OpenAiClientRegistry.register_client(ReplayOpenAiClient(recording), "replay")
+        agent = TableAgentAi(openai_api_key="replay", ...)
+
+    :param recording: the recorded calls
+    :param match_requests: if True, a call replays the recorded call of the same request (model,
+        instructions, input...) so the order of the calls doesn't matter (parallel sub agents).
+        If False, the recorded calls are replayed in order whatever the request.
+    """
+
+    def __init__(self, recording: OpenAiStreamRecording, match_requests: bool = True):
+        self.recording = recording
+        self.responses = _ReplayResponses(recording, match_requests)
+
+    def close(self) -> None:
+        return None
@@ -0,0 +1,440 @@
+import builtins
+import importlib
+import json
+import math
+import multiprocessing
+import os
+import pickle
+import queue
+import signal
+import threading
+import traceback
+from contextlib import contextmanager
+from multiprocessing.connection import Connection
+from types import ModuleType
+from typing import Any
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from .code_execution_error import CodeExecutionError
+from .code_executor import CodeExecutor, enable_pandas_copy_on_write
+from .compiled_code_cache import CompiledCodeCache
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional, the DataFrames are pickled without it and can't be returned
+    pa = None
+
+try:
+    import resource
+except ImportError:  # not available on Windows, the CPU time and memory limits are ignored
+    resource = None
+
+
+class SubprocessCodeExecutor(CodeExecutor):
+    """Execute the code generated by the agents in a pool of pre-warmed subprocesses.
+
+    A runaway or crashing code only stops its worker process, not the app. Each execution is
+    limited by a wall-clock timeout (the worker is killed and replaced), a CPU time limit and a
+    memory limit (address space of the worker, the modules imported by the worker count in it).
+    The DataFrames are transferred with Arrow IPC when possible. The workers are shared by the
+    executors with the same configuration, see SubprocessCodeExecutorPool.
+
+    The results sent back by the workers are never unpickled, the code could return an object
+    that runs code in the app when it is unpickled. Only DataFrames (Arrow IPC, requires
+    pyarrow), plotly figures (JSON) and dicts of DataFrames can be returned, other results
+    raise a CodeExecutionError.
+
+    The inputs are always isolated from the code as the worker receives copies, with
+    copy_on_write the workers use the pandas Copy-on-Write mode to limit their memory.
+    """
+
+    max_workers: int = 2
+    # wall-clock timeout of an execution in seconds
+    timeout: float = 120
+    # CPU time limit of an execution in seconds, None for no limit
+    cpu_time_limit: float | None = 60
+    # address space limit of the worker during an execution in bytes, None for no limit
+    memory_limit: int | None = None
+    # modules imported when the workers start
+    preloaded_modules: list[str] = ["pandas", "numpy", "plotly.graph_objects", "plotly.express"]
+
+    def _execute(self, code: str, execution_globals: dict[str, Any], result_names: list[str]) -> dict[str, Any]:
+        return SubprocessCodeExecutorPool.get_pool(self).execute(code, execution_globals, result_names)
+
+    def protects_inputs(self) -> bool:
+        """The worker receives copies of the inputs"""
+        return True
+
+    def warm_up(self) -> None:
+        """Start the workers of the executor, otherwise they are started on the first execution"""
+        SubprocessCodeExecutorPool.get_pool(self)
+
+
+class _CodeWorker:
+    """A worker process with the connection to send it the code to execute"""
+
+    process: Any
+    connection: Connection
+    # true when the worker has imported the preloaded modules
+    _ready: bool
+
+    def __init__(self, context: Any, executor: SubprocessCodeExecutor):
+        self._ready = False
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_run_code_worker,
+            args=(
+                child_connection,
+                executor.preloaded_modules,
+                executor.cpu_time_limit,
+                executor.memory_limit,
+                executor.copy_on_write,
+            ),
+            daemon=True,
+        )
+        self.process.start()
+        child_connection.close()
+
+    def execute(self, message: tuple, timeout: float) -> tuple[dict, list[bytes]]:
+        """Send the code to the worker and wait for the response: a JSON header and the
+        buffers of the DataFrames (raw bytes, the response is not unpickled)
+
+        :raises TimeoutError: if the worker didn't answer before the timeout
+        :raises EOFError: if the worker stopped
+        """
+        # the start of the worker doesn't count in the timeout
+        if not self._ready:
+            self.connection.recv_bytes()
+            self._ready = True
+
+        self.connection.send(message)
+        if not self.connection.poll(timeout):
+            raise TimeoutError()
+        header = json.loads(self.connection.recv_bytes())
+        buffers = [self.connection.recv_bytes() for _ in range(header.get("buffer_count", 0))]
+        return header, buffers
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+    def close(self) -> None:
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.connection.close()
+
+
+class SubprocessCodeExecutorPool:
+    """Process level pools of workers, one pool by executor configuration"""
+
+    _pools: dict[str, "SubprocessCodeExecutorPool"] = {}
+    _lock = threading.Lock()
+    # Id of the process that created the pools, the workers can't be shared with a forked process
+    _pid: int | None = None
+
+    _executor: SubprocessCodeExecutor
+    _context: Any
+    _idle_workers: "queue.Queue[_CodeWorker]"
+
+    def __init__(self, executor: SubprocessCodeExecutor):
+        self._executor = executor
+        # forkserver avoids forking the threads of the app, spawn when it is not available
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._context = multiprocessing.get_context(start_method)
+        self._idle_workers = queue.Queue()
+        for _ in range(executor.max_workers):
+            self._idle_workers.put(_CodeWorker(self._context, executor))
+
+    @classmethod
+    def get_pool(cls, executor: SubprocessCodeExecutor) -> "SubprocessCodeExecutorPool":
+        """Get the pool of the executor configuration, the workers are started on first call"""
+        key = json.dumps(executor.to_json_dict(), sort_keys=True)
+        with cls._lock:
+            if cls._pid != os.getpid():
+                cls._pools = {}
+                cls._pid = os.getpid()
+
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = SubprocessCodeExecutorPool(executor)
+                cls._pools[key] = pool
+            return pool
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Stop the workers of all the pools"""
+        with cls._lock:
+            pools = list(cls._pools.values())
+            cls._pools = {}
+
+        for pool in pools:
+            pool.close()
+
+    def execute(self, code: str, execution_globals: dict[str, Any], result_names: list[str]) -> dict[str, Any]:
+        """Execute the code in an idle worker, wait for a worker if they are all busy.
+        See CodeExecutor.execute."""
+        encoded_globals = {
+            name: _encode_value(value) for name, value in execution_globals.items() if name != "__builtins__"
+        }
+        message = (code, encoded_globals, result_names)
+
+        worker = self._idle_workers.get()
+        try:
+            header, buffers = worker.execute(message, self._executor.timeout)
+        except TimeoutError:
+            worker = self._replace_worker(worker)
+            raise CodeExecutionError(
+                f"The execution of the generated code took more than {self._executor.timeout:g} seconds "
+                "and was stopped. Make the code faster or process less data.",
+                "",
+            )
+        except (EOFError, OSError, ValueError):
+            exit_code = worker.process.exitcode
+            worker = self._replace_worker(worker)
+            raise CodeExecutionError(
+                f"The process executing the generated code stopped unexpectedly (exit code {exit_code}), "
+                "the code probably used too much memory or CPU time.",
+                "",
+            )
+        finally:
+            self._idle_workers.put(worker)
+
+        if header["status"] == "error":
+            raise CodeExecutionError(str(header["message"]), str(header["stack_trace"]))
+
+        try:
+            return {name: _decode_result(value, buffers) for name, value in header["results"].items()}
+        except Exception as decode_error:
+            raise CodeExecutionError(f"The result of the generated code can't be read: {decode_error}", "")
+
+    def close(self) -> None:
+        while True:
+            try:
+                worker = self._idle_workers.get_nowait()
+            except queue.Empty:
+                return
+            worker.close()
+
+    def _replace_worker(self, worker: _CodeWorker) -> _CodeWorker:
+        worker.kill()
+        return _CodeWorker(self._context, self._executor)
+
+
+class _CpuTimeLimitExceeded(Exception):
+    pass
+
+
+def _raise_cpu_time_limit_exceeded(signum: int, frame: Any) -> None:
+    raise _CpuTimeLimitExceeded("The CPU time limit of the code execution was exceeded")
+
+
+@contextmanager
+def _execution_limits(cpu_time_limit: float | None, memory_limit: int | None):
+    """Limit the CPU time and the memory of the worker during an execution"""
+    if resource is None:
+        yield
+        return
+
+    previous_cpu_limit = resource.getrlimit(resource.RLIMIT_CPU)
+    previous_memory_limit = resource.getrlimit(resource.RLIMIT_AS)
+    try:
+        if cpu_time_limit is not None:
+            # the CPU limit is the total CPU time of the process, add the time already used
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            soft_limit = math.ceil(usage.ru_utime + usage.ru_stime + cpu_time_limit)
+            resource.setrlimit(resource.RLIMIT_CPU, (soft_limit, previous_cpu_limit[1]))
+        if memory_limit is not None:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, previous_memory_limit[1]))
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, previous_cpu_limit)
+        resource.setrlimit(resource.RLIMIT_AS, previous_memory_limit)
+
+
+def _run_code_worker(
+    connection: Connection,
+    preloaded_modules: list[str],
+    cpu_time_limit: float | None,
+    memory_limit: int | None,
+    copy_on_write: bool,
+) -> None:
+    """Main function of the worker processes: execute the code received until None is received"""
+    if copy_on_write:
+        enable_pandas_copy_on_write()
+
+    for module_name in preloaded_modules:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            pass
+    connection.send_bytes(b"ready")
+
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _raise_cpu_time_limit_exceeded)
+
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+
+        code, encoded_globals, result_names = message
+        header, buffers = _execute_code(code, encoded_globals, result_names, cpu_time_limit, memory_limit)
+        header["buffer_count"] = len(buffers)
+        connection.send_bytes(json.dumps(header).encode("utf-8"))
+        for buffer in buffers:
+            connection.send_bytes(buffer)
+
+
+def _execute_code(
+    code: str,
+    encoded_globals: dict[str, tuple],
+    result_names: list[str],
+    cpu_time_limit: float | None,
+    memory_limit: int | None,
+) -> tuple[dict, list[bytes]]:
+    try:
+        execution_globals = {name: _decode_value(value) for name, value in encoded_globals.items()}
+        execution_globals["__builtins__"] = builtins
+
+        with _execution_limits(cpu_time_limit, memory_limit):
+            exec(CompiledCodeCache.get_compiled_code(code), execution_globals)
+    except Exception as exec_error:
+        # Include stack trace in the exception for AI context
+        return _error_header(f"Error executing generated code: {exec_error}", traceback.format_exc()), []
+
+    buffers: list[bytes] = []
+    try:
+        results = {
+            name: _encode_result(execution_globals[name], buffers)
+            for name in result_names
+            if name in execution_globals
+        }
+    except Exception as encode_error:
+        return _error_header(f"The result of the generated code can't be transferred: {encode_error}", ""), []
+    return {"status": "ok", "results": results}, buffers
+
+
+def _error_header(message: str, stack_trace: str) -> dict:
+    return {"status": "error", "message": message, "stack_trace": stack_trace}
+
+
+def _encode_value(value: Any) -> tuple[str, Any]:
+    """Encode a value sent to a worker, it is pickled when it can't be sent with Arrow"""
+    if isinstance(value, ModuleType):
+        return ("module", value.__name__)
+
+    if isinstance(value, pd.DataFrame):
+        arrow_data = _dataframe_to_arrow(value)
+        if arrow_data is not None:
+            return ("arrow", arrow_data)
+
+    if isinstance(value, dict) and value and all(isinstance(item, pd.DataFrame) for item in value.values()):
+        return ("dict", {key: _encode_value(item) for key, item in value.items()})
+
+    return ("pickle", pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _decode_value(encoded_value: tuple[str, Any]) -> Any:
+    """Decode a value received by a worker (sent by the app)"""
+    value_type, data = encoded_value
+    if value_type == "module":
+        return importlib.import_module(data)
+    if value_type == "arrow":
+        return _arrow_to_dataframe(*data)
+    if value_type == "dict":
+        return {key: _decode_value(item) for key, item in data.items()}
+    return pickle.loads(data)
+
+
+def _encode_result(value: Any, buffers: list[bytes]) -> dict:
+    """Encode a result sent by a worker to the app as JSON, the Arrow data of the DataFrames
+    is added to buffers
+
+    :raises TypeError: if the result is not a DataFrame, a plotly figure or a dict of DataFrames
+    """
+    if isinstance(value, pd.DataFrame):
+        arrow_data = _dataframe_to_arrow(value)
+        if arrow_data is None:
+            raise TypeError(
+                "the DataFrame can't be converted with Arrow, use unique column names "
+                "of type str, int, float or bool and values supported by Arrow"
+            )
+        buffers.append(arrow_data[0])
+        return {"type": "arrow", "buffer": len(buffers) - 1, "columns": arrow_data[1]}
+
+    if isinstance(value, go.Figure):
+        return {"type": "plotly", "json": value.to_json()}
+
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        return {"type": "dict", "items": {key: _encode_result(item, buffers) for key, item in value.items()}}
+
+    raise TypeError(
+        f"results of type {type(value).__name__} are not supported, "
+        "only DataFrames, plotly figures and dicts of DataFrames can be returned"
+    )
+
+
+def _decode_result(encoded_result: dict, buffers: list[bytes]) -> Any:
+    """Decode a result received from a worker, the data is never unpickled"""
+    result_type = encoded_result["type"]
+    if result_type == "arrow":
+        return _arrow_to_dataframe(buffers[encoded_result["buffer"]], encoded_result["columns"])
+    if result_type == "plotly":
+        return pio.from_json(encoded_result["json"])
+    if result_type == "dict":
+        return {key: _decode_result(item, buffers) for key, item in encoded_result["items"].items()}
+    raise ValueError(f"unknown result type {result_type}")
+
+
+def _dataframe_to_arrow(dataframe: pd.DataFrame) -> tuple[bytes, dict] | None:
+    """Serialize the DataFrame with Arrow IPC, the column labels and name are returned
+    separately (JSON compatible). None if it can't be converted (no pyarrow, column labels that
+    are not str, int, float or bool, values not supported by Arrow...)"""
+    if pa is None:
+        return None
+
+    columns = dataframe.columns.tolist()
+    columns_name = dataframe.columns.name
+    if not all(isinstance(label, (str, int, float)) for label in [*columns, columns_name] if label is not None):
+        return None
+
+    # the Arrow columns are named by position, the labels can be duplicated or not be strings
+    renamed_dataframe = dataframe.copy(deep=False)
+    renamed_dataframe.columns = [str(i) for i in range(len(columns))]
+    try:
+        arrow_table = pa.Table.from_pandas(renamed_dataframe)
+    except (pa.ArrowException, ValueError, TypeError):
+        return None
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, arrow_table.schema) as writer:
+        writer.write_table(arrow_table)
+    return sink.getvalue().to_pybytes(), {"labels": columns, "name": columns_name}
+
+
+def _arrow_to_dataframe(data: bytes, columns: dict) -> pd.DataFrame:
+    arrow_table = pa.ipc.open_stream(data).read_all()
+    dataframe = arrow_table.to_pandas()
+
+    # lists and dicts are converted to numpy arrays by to_pandas, convert them back
+    for field in arrow_table.schema:
+        if pa.types.is_nested(field.type) and field.name in dataframe.columns:
+            dataframe[field.name] = pd.Series(
+                arrow_table.column(field.name).to_pylist(), index=dataframe.index, dtype=object
+            )
+
+    dataframe.columns = pd.Index(columns["labels"], name=columns["name"])
+    return dataframe
@@ -1,14 +1,17 @@
-from typing import Generic, TypeVar
+from typing import Generic, TypeVar, cast
 
 from gws_core import BaseModelDTO
 from pydantic import TypeAdapter
 
 from ..base_function_agent_events import (
     BaseFunctionWithSubAgentEvent,
+    CodeDeltaEvent,
     CreateSubAgent,
     ResponseCompletedEvent,
     ResponseCreatedEvent,
     ResponseEvent,
+    ResponseFullTextEvent,
+    TextDeltaEvent,
     UserQueryEventBase,
 )
 
@@ -16,33 +19,166 @@ T = TypeVar("T", bound=BaseModelDTO)
 
 
 class AgentEventList(Generic[T]):
-    """Manages a list of agent events with utility methods for querying and serialization"""
+    """Manages a list of agent events with utility methods for querying and serialization
+
+    Indexes are updated on each append so the lookups by type, response id and agent id
+    don't scan the whole list. The events must only be added with append.
+
+    In compact mode, the TextDeltaEvent are not stored because the ResponseFullTextEvent
+    emitted at the end of the response contains the full text. The CodeDeltaEvent are not
+    stored either, the FunctionCallEvent contains the full code. The text of a response
+    that is not completed is kept until flush_pending_text is called.
+    """
+
+    compact_mode: bool
 
     _events: list[T]
+    # text of the TextDeltaEvent not stored in compact mode, by response id
+    _pending_text_by_response_id: dict[str, tuple[str, str]]
+
+    # last event by event class (including the parent classes of the event)
+    _last_event_by_type: dict[type, T]
+    _events_by_response_id: dict[str, list[T]]
+    # first CreateSubAgent event by response id and by call id
+    _create_sub_agent_by_response_id: dict[str, CreateSubAgent]
+    _create_sub_agent_by_call_id: dict[str, CreateSubAgent]
+    # agent that emitted each response and parent agent of each sub agent (None if unknown)
+    _agent_id_by_response_id: dict[str, str]
+    _parent_agent_id_by_agent_id: dict[str, str | None]
+    # index in the list of the first event of each agent
+    _first_index_by_agent_id: dict[str, int]
+
+    def __init__(self, events: list[T] | None = None, compact_mode: bool = False):
+        self.compact_mode = compact_mode
+        self._pending_text_by_response_id = {}
+        self._reset([])
 
-    def __init__(self, events: list[T] | None = None):
-        self._events: list[T] = events if events is not None else []
+        for event in events or []:
+            self.append(event)
 
     def append(self, event: T) -> None:
         """Add an event to the list"""
+        if self.compact_mode:
+            if isinstance(event, TextDeltaEvent):
+                agent_id, text = self._pending_text_by_response_id.get(event.response_id, (event.agent_id, ""))
+                self._pending_text_by_response_id[event.response_id] = (agent_id, text + event.delta)
+                return
+
+            if isinstance(event, CodeDeltaEvent):
+                return
+
+            if isinstance(event, (ResponseFullTextEvent, ResponseCompletedEvent)):
+                self._pending_text_by_response_id.pop(event.response_id, None)
+
+        self._index_event(event, len(self._events))
         self._events.append(event)
 
+    def flush_pending_text(self) -> None:
+        """In compact mode, store a ResponseFullTextEvent for the text of the responses
+        that were not completed (e.g. interrupted generation).
+        """
+        pending_text = self._pending_text_by_response_id
+        self._pending_text_by_response_id = {}
+        for response_id, (agent_id, text) in pending_text.items():
+            self.append(cast(T, ResponseFullTextEvent(response_id=response_id, text=text, agent_id=agent_id)))
+
+    def compact(self) -> None:
+        """Remove the TextDeltaEvent and CodeDeltaEvent from the list.
+
+        The deltas of a response without ResponseFullTextEvent are replaced by
+        a single ResponseFullTextEvent at the position of the last delta.
+        """
+        full_text_response_ids = {
+            event.response_id for event in self._events if isinstance(event, ResponseFullTextEvent)
+        }
+
+        # text and position of the last delta of the responses without full text
+        missing_texts: dict[str, tuple[str, str, int]] = {}
+        for index, event in enumerate(self._events):
+            if isinstance(event, TextDeltaEvent) and event.response_id not in full_text_response_ids:
+                agent_id, text, _ = missing_texts.get(event.response_id, (event.agent_id, "", index))
+                missing_texts[event.response_id] = (agent_id, text + event.delta, index)
+
+        last_delta_indexes = {index: response_id for response_id, (_, _, index) in missing_texts.items()}
+
+        events: list[T] = []
+        for index, event in enumerate(self._events):
+            if isinstance(event, CodeDeltaEvent):
+                continue
+
+            if not isinstance(event, TextDeltaEvent):
+                events.append(event)
+                continue
+
+            if index in last_delta_indexes:
+                agent_id, text, _ = missing_texts[event.response_id]
+                events.append(
+                    cast(T, ResponseFullTextEvent(response_id=event.response_id, text=text, agent_id=agent_id))
+                )
+
+        self._reset(events)
+
+    def _reset(self, events: list[T]) -> None:
+        """Replace the events of the list and rebuild the indexes, the pending text is kept"""
+        self._events = []
+        self._last_event_by_type = {}
+        self._events_by_response_id = {}
+        self._create_sub_agent_by_response_id = {}
+        self._create_sub_agent_by_call_id = {}
+        self._agent_id_by_response_id = {}
+        self._parent_agent_id_by_agent_id = {}
+        self._first_index_by_agent_id = {}
+
+        for event in events:
+            self._index_event(event, len(self._events))
+            self._events.append(event)
+
+    def _index_event(self, event: T, index: int) -> None:
+        for event_type in type(event).__mro__:
+            self._last_event_by_type[event_type] = event
+
+        response_id = getattr(event, "response_id", None)
+        if response_id is not None:
+            self._events_by_response_id.setdefault(response_id, []).append(event)
+
+            if isinstance(event, CreateSubAgent):
+                self._create_sub_agent_by_response_id.setdefault(response_id, event)
+                if event.call_id:
+                    self._create_sub_agent_by_call_id.setdefault(event.call_id, event)
+                # the CreateSubAgent has the response id of the parent agent
+                self._parent_agent_id_by_agent_id.setdefault(
+                    event.agent_id, self._agent_id_by_response_id.get(response_id)
+                )
+            else:
+                self._agent_id_by_response_id.setdefault(response_id, event.agent_id)
+
+        agent_id = getattr(event, "agent_id", None)
+        if agent_id is not None:
+            self._first_index_by_agent_id.setdefault(agent_id, index)
+
+    def __getstate__(self) -> dict:
+        # only the events are pickled (reflex state), the indexes are rebuilt
+        return {
+            "_events": self._events,
+            "compact_mode": self.compact_mode,
+            "_pending_text_by_response_id": self._pending_text_by_response_id,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["_events"], state.get("compact_mode", False))
+        self._pending_text_by_response_id = state.get("_pending_text_by_response_id", {})
+
     def get_all(self) -> list[T]:
         """Get all events"""
         return self._events
 
     def last_event(self, event_type: type[T]) -> T | None:
         """Get the last event of a specific type"""
-        for event in reversed(self._events):
-            if isinstance(event, event_type):
-                return event
-        return None
+        return self._last_event_by_type.get(event_type)
 
     def get_events_by_response_id(self, response_id: str) -> list[T]:
         """Get all events for a specific response ID"""
-        return [
-            event for event in self._events if getattr(event, "response_id", None) == response_id
-        ]
+        return list(self._events_by_response_id.get(response_id, []))
 
     def get_agent_and_sub_agents_events(self, agent_id: str) -> list[T]:
         """Get all events for a specific agent and its sub-agents.
@@ -71,7 +207,12 @@ class AgentEventList(Generic[T]):
         agent_events = []
         active_response_ids: set[str] = set()  # Track response IDs from the target agent
 
-        for event in self._events:
+        # the events before the first event of the agent can't be related to the agent
+        first_index = self._first_index_by_agent_id.get(agent_id)
+        if first_index is None:
+            return agent_events
+
+        for event in self._events[first_index:]:
             event_agent_id: str | None = None
             event_response_id: str | None = None
 
@@ -99,10 +240,12 @@ class AgentEventList(Generic[T]):
                 active_response_ids.discard(event_response_id)
                 continue
 
-            # If we're currently tracking a response, add all events regardless of agent_id
+            # If we're currently tracking a response, add all events of the agent and its sub-agents
             # This captures sub-agent events that occur during the main agent's response
+            # (the events of other agents can be interleaved when sub agents run in parallel)
             if len(active_response_ids) > 0:
-                agent_events.append(event)
+                if event_agent_id is None or self._is_agent_or_sub_agent(event_agent_id, agent_id):
+                    agent_events.append(event)
                 continue
 
             # Always add events that belong directly to the target agent
@@ -111,18 +254,45 @@ class AgentEventList(Generic[T]):
 
         return agent_events
 
-    def find_create_sub_agent_event(self, response_id: str) -> CreateSubAgent | None:
+    def _is_agent_or_sub_agent(self, event_agent_id: str, agent_id: str) -> bool:
+        """Check if event_agent_id is agent_id or one of its (nested) sub agents.
+        Return true when the lineage of the event agent is unknown (no CreateSubAgent event).
+        """
+        ancestor_ids: set[str] = set()
+        parent_agent_id = self._parent_agent_id_by_agent_id.get(agent_id)
+        while parent_agent_id is not None and parent_agent_id not in ancestor_ids:
+            ancestor_ids.add(parent_agent_id)
+            parent_agent_id = self._parent_agent_id_by_agent_id.get(parent_agent_id)
+
+        current_agent_id: str | None = event_agent_id
+        while current_agent_id is not None:
+            if current_agent_id == agent_id:
+                return True
+            if current_agent_id in ancestor_ids:
+                # event of a parent agent or of a sibling sub agent
+                return False
+            if current_agent_id not in self._parent_agent_id_by_agent_id:
+                return True
+            current_agent_id = self._parent_agent_id_by_agent_id[current_agent_id]
+        return True
+
+    def find_create_sub_agent_event(
+        self, response_id: str, call_id: str | None = None
+    ) -> CreateSubAgent | None:
         """Find the CreateSubAgent event for a given response ID.
 
         Args:
             response_id: The response ID to search for
+            call_id: The function call ID that created the sub agent, required when
+                multiple sub agents were created in the same response
         Returns:
             The CreateSubAgent event if found, else None
         """
-        for event in self._events:
-            if isinstance(event, CreateSubAgent) and event.response_id == response_id:
-                return event
-        return None
+        if call_id:
+            create_sub_agent_event = self._create_sub_agent_by_call_id.get(call_id)
+            if create_sub_agent_event is not None:
+                return create_sub_agent_event
+        return self._create_sub_agent_by_response_id.get(response_id)
 
     @staticmethod
     def from_json_list(json_list: list[dict]) -> "AgentEventList[T]":
@@ -1,4 +1,3 @@
-import traceback
 from collections.abc import Generator
 
 import numpy as np
@@ -8,6 +7,7 @@ from pydantic import Field
 
 from gws_ai_toolkit.core.agents.base_function_agent_events import CodeEvent, FunctionCallEvent
 from gws_ai_toolkit.core.agents.code_execution_error import CodeExecutionError
+from gws_ai_toolkit.core.agents.code_executor import CodeExecutor
 from gws_ai_toolkit.core.agents.table.table_agent_ai_events import UserQueryMultiTablesEvent
 
 from ..base_function_agent_ai import BaseFunctionAgentAi, FunctionErrorEvent
@@ -126,12 +126,33 @@ class MultiTableAgentAi(
         Returns:
             Dictionary of table names to Table objects
 
+        Raises:
+            ValueError: If code is invalid or doesn't produce expected output
+            CodeExecutionError: If code execution fails (includes stack trace)
+        """
+        return self.execute_multi_transform_code(code, tables, self.get_code_executor())
+
+    @classmethod
+    def execute_multi_transform_code(
+        cls, code: str, tables: dict[str, Table], code_executor: CodeExecutor
+    ) -> dict[str, Table]:
+        """Execute the code of a multi-table transformation (it defines 'result_tables' from 'tables')
+        on the tables, without calling OpenAI. Used to re-run stored code (see TableLineage.recompute).
+
+        Args:
+            code: Python code to execute
+            tables: Input tables by name
+            code_executor: Executor of the code
+
+        Returns:
+            Dictionary of table names to Table objects
+
         Raises:
             ValueError: If code is invalid or doesn't produce expected output
             CodeExecutionError: If code execution fails (includes stack trace)
         """
         # Create safe execution environment
-        execution_globals = self._get_code_execution_globals()
+        execution_globals = cls._get_code_execution_globals()
 
         # Add all tables to a dictionary for access by name
         tables_dict = {}
@@ -142,23 +163,17 @@ class MultiTableAgentAi(
         execution_globals["tables"] = tables_dict
 
         # Execute the code
-        try:
-            exec(code, execution_globals)
-        except Exception as exec_error:
-            # Include stack trace in the exception for AI context
-            error_msg = f"Error executing generated code: {exec_error}"
-            stack_trace = traceback.format_exc()
-            raise CodeExecutionError(error_msg, stack_trace) from exec_error
+        results = code_executor.execute(code, execution_globals, ["result_tables"])
 
         # Validate result_tables dictionary was created
-        if "result_tables" not in execution_globals:
+        if "result_tables" not in results:
             raise ValueError(
                 "The executed code did not define a variable named 'result_tables'. "
                 "Make sure to assign the transformed DataFrames to a dictionary named 'result_tables' "
                 "where keys are table names and values are pandas DataFrames."
             )
 
-        result_tables_dict = execution_globals["result_tables"]
+        result_tables_dict = results["result_tables"]
 
         if not isinstance(result_tables_dict, dict):
             raise ValueError(
@@ -183,7 +198,8 @@ class MultiTableAgentAi(
 
         return result_tables
 
-    def _get_code_execution_globals(self) -> dict:
+    @classmethod
+    def _get_code_execution_globals(cls) -> dict:
         """Get globals for code execution environment"""
         return {
             "pd": pd,
@@ -199,6 +215,8 @@ class MultiTableAgentAi(
             Formatted prompt for OpenAI
         """
 
+        # the tables information is at the end so the beginning of the instructions stays
+        # identical between calls and can be cached by the provider
         tables_info = user_query.get_tables_info()
 
         output_tables_instruction = ""
@@ -209,16 +227,13 @@ The user expects the following output table names (use these as keys in the 'res
 {", ".join(f"'{name}'" for name in user_query.output_table_names)}
 """
 
-        return f"""You are an AI assistant specialized in multi-table data operations, including joining, merging, transforming, and analyzing multiple datasets. You have access to information about multiple tables/datasets but not the actual data.
+        return f"""You are an AI assistant specialized in multi-table data operations, including joining, merging, transforming, and analyzing multiple datasets. You have access to information about multiple tables/datasets (provided at the end) but not the actual data.
 
-# Available Tables
-{tables_info}
-{output_tables_instruction}
 Your role is to help users perform operations on multiple tables. When users request transformations, you should:
 
 1. Generate Python code that works with multiple DataFrames
 2. Ensure the code assigns the final result(s) to a dictionary named 'result_tables'
-3. The 'result_tables' dictionary should have descriptive keys and pandas DataFrame values{" - use the expected output table names if provided above" if user_query.output_table_names else ""}
+3. The 'result_tables' dictionary should have descriptive keys and pandas DataFrame values - use the expected output table names if provided in the 'Expected Output Tables' section
 4. Use pandas operations for data manipulation and merging
 5. Make reasonable assumptions about data based on column names and types
 6. Handle potential data issues gracefully (missing values, data types, etc.)
@@ -273,4 +288,8 @@ result_tables = {{
 Remember:
 - Always access tables via `tables['table_name']` using the exact names from 'Available Tables' section
 - Assign final results to the `result_tables` dictionary
-- Use descriptive keys for the result tables"""
+- Use descriptive keys for the result tables
+
+# Available Tables
+{tables_info}
+{output_tables_instruction}"""
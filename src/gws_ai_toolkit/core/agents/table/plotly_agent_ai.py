@@ -1,4 +1,3 @@
-import traceback
 from collections.abc import Generator
 
 import pandas as pd
@@ -12,10 +11,12 @@ from gws_ai_toolkit.core.agents.base_function_agent_events import (
     FunctionErrorEvent,
 )
 from gws_ai_toolkit.core.agents.code_execution_error import CodeExecutionError
+from gws_ai_toolkit.core.agents.table.table_ai_description_cache import TableAiDescriptionCache
 from gws_ai_toolkit.core.agents.table.table_agent_event_base import UserQueryTableEvent
 
 from ..base_function_agent_ai import BaseFunctionAgentAi
 from .plotly_agent_ai_events import PlotGeneratedEvent, PlotlyAgentEvent
+from .plotly_figure_decimator import PlotlyFigureDecimator
 
 
 class PlotlyCodeConfig(BaseModelDTO):
@@ -35,6 +36,9 @@ class PlotlyCodeConfig(BaseModelDTO):
 class PlotlyAgentAi(BaseFunctionAgentAi[PlotlyAgentEvent, UserQueryTableEvent]):
     """Standalone plot agent service for data visualization using OpenAI"""
 
+    # Reduce the size of the figures generated on large tables, None to keep all the points
+    _figure_decimator: PlotlyFigureDecimator | None
+
     def __init__(
         self,
         openai_api_key: str,
@@ -45,6 +49,7 @@ class PlotlyAgentAi(BaseFunctionAgentAi[PlotlyAgentEvent, UserQueryTableEvent]):
         super().__init__(
             openai_api_key, model, temperature, skip_success_response=skip_success_response
         )
+        self._figure_decimator = PlotlyFigureDecimator()
 
     def _get_tools(self) -> list[dict]:
         """Get tools configuration for OpenAI"""
@@ -154,22 +159,16 @@ class PlotlyAgentAi(BaseFunctionAgentAi[PlotlyAgentEvent, UserQueryTableEvent]):
         execution_globals["df"] = table.get_data()
 
         # Execute the code
-        try:
-            exec(code, execution_globals)
-        except Exception as exec_error:
-            # Include stack trace in the exception for AI context
-            error_msg = f"Error executing generated code: {exec_error}"
-            stack_trace = traceback.format_exc()
-            raise CodeExecutionError(error_msg, stack_trace) from exec_error
+        results = self.get_code_executor().execute(code, execution_globals, ["fig"])
 
         # Validate figure was created
-        if "fig" not in execution_globals:
+        if "fig" not in results:
             raise ValueError(
                 "The executed code did not define a variable named 'fig'. "
                 "Make sure to assign the plotly figure to a variable named 'fig'."
             )
 
-        fig = execution_globals["fig"]
+        fig = results["fig"]
 
         if not isinstance(fig, go.Figure):
             raise ValueError(
@@ -177,8 +176,18 @@ class PlotlyAgentAi(BaseFunctionAgentAi[PlotlyAgentEvent, UserQueryTableEvent]):
                 "Make sure to assign a plotly Figure object to a variable named 'fig'."
             )
 
+        if self._figure_decimator is not None:
+            fig = self._figure_decimator.decimate(fig)
+
         return fig
 
+    def get_figure_decimator(self) -> PlotlyFigureDecimator | None:
+        return self._figure_decimator
+
+    def set_figure_decimator(self, figure_decimator: PlotlyFigureDecimator | None) -> None:
+        """Set the decimation of the figures generated on large tables, None to keep all the points"""
+        self._figure_decimator = figure_decimator
+
     def _get_code_execution_globals(self) -> dict:
         """Get globals for code execution environment"""
         return {"pd": pd, "go": go, "__builtins__": __builtins__}
@@ -193,10 +202,10 @@ class PlotlyAgentAi(BaseFunctionAgentAi[PlotlyAgentEvent, UserQueryTableEvent]):
             Formatted prompt for OpenAI
         """
 
-        table_metadata = user_query.table.get_ai_description()
-        return f"""You are an AI assistant specialized in data analysis and visualization. You have access to information about a table/dataset but not the actual data.
-
-{table_metadata}
+        # the table information is at the end so the beginning of the instructions stays
+        # identical between calls and can be cached by the provider
+        table_metadata = TableAiDescriptionCache.get_ai_description(user_query.table)
+        return f"""You are an AI assistant specialized in data analysis and visualization. You have access to information about a table/dataset (provided at the end) but not the actual data.
 
 Your role is to help users analyze and visualize this data. When users request visualizations or charts, you should:
 
@@ -228,4 +237,7 @@ fig = go.Figure()
 # Add traces and configure layout
 fig.add_trace(go.Scatter(x=df['column1'], y=df['column2']))
 fig.update_layout(title='Chart Title')
-```"""
+```
+
+# Table information
+{table_metadata}"""
@@ -0,0 +1,162 @@
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from gws_core import BaseModelDTO
+
+
+class PlotlyFigureDecimator(BaseModelDTO):
+    """Reduce the size of the figures generated on large tables.
+
+    The figures generated by the agents contain all the points of the table, a scatter plot of
+    millions of rows is too large to be stored and rendered. The scatter traces with many points
+    are switched to WebGL (scattergl) and decimated so their size depends on the screen
+    resolution instead of the number of rows:
+    - the line traces keep the first, last, min and max points of each bucket of consecutive points
+      (min-max decimation, the peaks of the line are kept)
+    - the marker traces keep one point by cell of a grid over the x and y ranges (binning)
+
+    The arrays of the traces with one value by point (marker colors, texts, custom data...)
+    are decimated with the points.
+    """
+
+    # traces with more points are drawn with WebGL
+    webgl_threshold: int = 5000
+    # traces with more points are decimated
+    decimation_threshold: int = 20000
+    # number of buckets of the line traces, about the width of a screen in pixels
+    line_bucket_count: int = 2000
+    # number of cells of the grid of the marker traces on each axis
+    scatter_grid_size: int = 400
+
+    def decimate(self, figure: go.Figure) -> go.Figure:
+        """Decimate the large scatter traces of the figure and draw them with WebGL.
+        The traces of the figure are replaced (the layout is not copied, it is slow to validate)."""
+        if not any(self._get_point_count(trace) > self.webgl_threshold for trace in figure.data):
+            return figure
+
+        traces = [self._decimate_trace(trace) for trace in figure.data]
+        figure.data = ()
+        figure.add_traces(traces)
+        return figure
+
+    def _decimate_trace(self, trace: Any) -> Any:
+        point_count = self._get_point_count(trace)
+        if point_count <= self.webgl_threshold:
+            return trace
+
+        trace_dict = trace.to_plotly_json()
+        if point_count > self.decimation_threshold:
+            indexes = self._get_kept_indexes(trace, point_count)
+            if indexes is not None:
+                if trace.x is None:
+                    # the x values are the positions of the points, they must be kept
+                    trace_dict["x"] = (trace.x0 or 0) + indexes * (trace.dx or 1)
+                    trace_dict.pop("x0", None)
+                    trace_dict.pop("dx", None)
+                trace_dict = _take_points(trace_dict, point_count, indexes)
+
+        # WebGL doesn't support the stacked traces
+        if trace_dict.get("stackgroup"):
+            return go.Scatter(trace_dict)
+        return go.Scattergl(trace_dict, skip_invalid=True)
+
+    def _get_point_count(self, trace: Any) -> int:
+        if trace.type not in ("scatter", "scattergl") or trace.y is None:
+            return 0
+        return len(trace.y)
+
+    def _get_kept_indexes(self, trace: Any, point_count: int) -> np.ndarray | None:
+        """Get the indexes of the points to keep, None if the trace can't be decimated"""
+        y = _to_numeric(trace.y)
+        if y is None:
+            return None
+
+        # plotly draws lines by default for large traces
+        mode = trace.mode or "lines"
+        if "lines" in mode:
+            if trace.x is not None:
+                x = _to_numeric(trace.x)
+                # the buckets are consecutive points, the points must be sorted along x
+                if x is None or np.any(np.diff(x[~np.isnan(x)]) < 0):
+                    return None
+            return self._get_line_indexes(y)
+
+        if "markers" in mode:
+            x = _to_numeric(trace.x) if trace.x is not None else np.arange(point_count, dtype=float)
+            if x is None:
+                return None
+            return self._get_grid_indexes(x, y)
+
+        return None
+
+    def _get_line_indexes(self, y: np.ndarray) -> np.ndarray:
+        """Min-max decimation: first, last, min and max points of each bucket. The first missing
+        value of a bucket is kept so the gaps of the line are kept."""
+        edges = np.linspace(0, len(y), self.line_bucket_count + 1).astype(int)
+        indexes: list[int] = []
+        for start, end in zip(edges[:-1], edges[1:]):
+            if end <= start:
+                continue
+            bucket = y[start:end]
+            indexes.append(start)
+            indexes.append(end - 1)
+            missing = np.isnan(bucket)
+            if missing.all():
+                continue
+            if missing.any():
+                indexes.append(start + int(np.argmax(missing)))
+            indexes.append(start + int(np.nanargmin(bucket)))
+            indexes.append(start + int(np.nanargmax(bucket)))
+        return np.unique(indexes)
+
+    def _get_grid_indexes(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Binning: the first point of each cell of the grid, the missing points are removed
+        as they are not drawn"""
+        valid_indexes = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+        if len(valid_indexes) == 0:
+            return valid_indexes
+
+        grid_size = self.scatter_grid_size
+        x_cells = _get_cells(x[valid_indexes], grid_size)
+        y_cells = _get_cells(y[valid_indexes], grid_size)
+        # hashing is faster than sorting to find the first point of the cells
+        first_positions = pd.Series(x_cells * grid_size + y_cells).drop_duplicates().index.to_numpy()
+        return valid_indexes[first_positions]
+
+
+def _to_numeric(values: Any) -> np.ndarray | None:
+    """Convert the values of an axis to floats (dates to nanoseconds), None if they are not numeric"""
+    array = np.asarray(values)
+    if array.dtype.kind == "M":
+        numeric = array.astype("datetime64[ns]").astype(np.int64).astype(float)
+        numeric[np.isnat(array)] = np.nan
+        return numeric
+    if array.dtype.kind in "biuf":
+        return array.astype(float)
+    if array.dtype.kind == "O":
+        try:
+            return array.astype(float)
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _get_cells(values: np.ndarray, grid_size: int) -> np.ndarray:
+    minimum = values.min()
+    value_range = values.max() - minimum
+    if value_range == 0:
+        return np.zeros(len(values), dtype=np.int64)
+    return np.minimum(((values - minimum) / value_range * grid_size).astype(np.int64), grid_size - 1)
+
+
+def _take_points(value: Any, point_count: int, indexes: np.ndarray) -> Any:
+    """Keep the points of the indexes in the arrays with one value by point of the trace properties"""
+    if isinstance(value, dict):
+        return {key: _take_points(item, point_count, indexes) for key, item in value.items()}
+    if isinstance(value, np.ndarray) and value.ndim > 0 and len(value) == point_count:
+        return value[indexes]
+    if isinstance(value, (list, tuple)) and len(value) == point_count:
+        return [value[index] for index in indexes]
+    return value
@@ -19,6 +19,7 @@ from .multi_table_agent_ai import MultiTableAgentAi
 from .multi_table_agent_ai_events import MultiTableTransformEvent
 from .plotly_agent_ai import PlotlyAgentAi
 from .table_agent_ai_events import TableAgentEvent, UserQueryMultiTablesEvent
+from .table_lineage import TableLineage
 from .table_transform_agent_ai import TableTransformAgentAi
 
 
@@ -73,13 +74,29 @@ class MultiTableTransformRequestConfig(BaseModelDTO):
 class TableAgentAi(BaseFunctionAgentAi[TableAgentEvent, UserQueryMultiTablesEvent]):
     """Main table agent that orchestrates plot and transformation operations using function calling"""
 
+    # Derivation of the tables generated by the agent, to recompute them when a table changes
+    _table_lineage: TableLineage
+
     def __init__(
         self,
         openai_api_key: str,
         model: str,
         temperature: float,
+        parallel_tool_calls: bool = False,
     ):
-        super().__init__(openai_api_key, model, temperature, skip_success_response=False)
+        """
+        Args:
+            parallel_tool_calls: If true, the agent can call multiple functions in a single response.
+                The calls on different tables (or plot only calls) run concurrently.
+        """
+        super().__init__(
+            openai_api_key,
+            model,
+            temperature,
+            skip_success_response=False,
+            parallel_tool_calls=parallel_tool_calls,
+        )
+        self._table_lineage = TableLineage()
 
     def _get_tools(self) -> list[dict]:
         """Get tools configuration for OpenAI"""
@@ -154,6 +171,32 @@ class TableAgentAi(BaseFunctionAgentAi[TableAgentEvent, UserQueryMultiTablesEven
                 agent_id=self.id,
             )
 
+    def _are_function_calls_independent(
+        self, function_call_1: FunctionCallEvent, function_call_2: FunctionCallEvent
+    ) -> bool:
+        """Plot calls can run together, the other calls can run together if they use different tables"""
+        if function_call_1.function_name == "generate_plot" and function_call_2.function_name == "generate_plot":
+            return True
+
+        table_names_1 = self._get_function_call_table_names(function_call_1)
+        table_names_2 = self._get_function_call_table_names(function_call_2)
+        if table_names_1 is None or table_names_2 is None:
+            return False
+        return table_names_1.isdisjoint(table_names_2)
+
+    def _get_function_call_table_names(self, function_call_event: FunctionCallEvent) -> set[str] | None:
+        """Get the input and output table names of a function call, None if the function is unknown"""
+        arguments = function_call_event.arguments
+        function_name = function_call_event.function_name
+
+        if function_name == "generate_plot":
+            return {arguments.get("table_name", "")}
+        if function_name == "transform_table":
+            return {arguments.get("table_name", ""), arguments.get("output_table_name", "")}
+        if function_name == "transform_multiple_tables":
+            return set(arguments.get("table_names", [])) | set(arguments.get("output_table_names", []))
+        return None
+
     def _handle_plot_request(
         self,
         sub_user_request: str,
@@ -244,7 +287,10 @@ class TableAgentAi(BaseFunctionAgentAi[TableAgentEvent, UserQueryMultiTablesEven
             agent_id=transform_agent.id,
         )
         # Delegate to transform agent and yield events directly
-        yield from self.call_sub_agent(transform_agent, sub_query, response_id, call_id, self.id)
+        for event in self.call_sub_agent(transform_agent, sub_query, response_id, call_id, self.id):
+            if isinstance(event, TableTransformEvent):
+                self._table_lineage.add_transform(event.code, {table_name: table}, event.table_name)
+            yield event
 
     def _handle_multi_table_transform_request(
         self,
@@ -309,18 +355,21 @@ class TableAgentAi(BaseFunctionAgentAi[TableAgentEvent, UserQueryMultiTablesEven
         )
 
         # Delegate to multi-table agent and yield events directly
-        yield from self.call_sub_agent(multi_table_agent, user_query, response_id, call_id, self.id)
+        for event in self.call_sub_agent(multi_table_agent, user_query, response_id, call_id, self.id):
+            if isinstance(event, MultiTableTransformEvent):
+                self._table_lineage.add_multi_transform(event.code, input_tables, list(event.tables.keys()))
+            yield event
 
     def _get_ai_instruction(self, user_query: UserQueryMultiTablesEvent) -> str:
         """Create prompt for OpenAI with table metadata"""
 
-        # Generate table information for all tables
-        tables_info = user_query.get_tables_info()
-
-        return f"""You are an AI assistant specialized in table operations including data analysis, visualization, and manipulation. You have access to information about multiple tables/datasets but not the actual data.
+        # Generate table information for all tables, it is at the end so the beginning
+        # of the instructions stays identical between calls and can be cached by the provider.
+        # Only the schema is needed to choose the function, the sub agents that write the code
+        # receive the detailed description
+        tables_info = user_query.get_tables_schema_info()
 
-# Available Tables
-{tables_info}
+        return f"""You are an AI assistant specialized in table operations including data analysis, visualization, and manipulation. You have access to information about multiple tables/datasets (provided at the end) but not the actual data.
 
 You can help users with three main types of operations:
 
@@ -354,7 +403,7 @@ You can help users with three main types of operations:
 - For single table operations: specify the table_name and output_table_name
 - For multi-table operations: specify table_names (list) and output_table_names (list)
 - Pass the complete user request to the selected function
-- **CRITICAL: Call EXACTLY ONE function per response - NEVER call multiple functions simultaneously**
+{self._get_function_call_count_guideline()}
 - **If the user requests multiple operations in sequence (e.g., "multiply columns by 10, then make a scatter plot"):**
   - Identify the FIRST operation that needs to be performed (in this case: transformation)
   - Call ONLY that function (transform_table)
@@ -377,7 +426,20 @@ You can help users with three main types of operations:
 - "Merge sales and inventory, then filter for low stock" → Call ONLY `transform_multiple_tables` with "Merge sales and inventory"
 
 You should call the appropriate function based on the user's request and let the specialized agent handle the detailed implementation.
-If you don't have enough information to determine the user's intent, ask clarifying questions instead of making assumptions."""
+If you don't have enough information to determine the user's intent, ask clarifying questions instead of making assumptions.
+
+# Available Tables
+{tables_info}"""
+
+    def _get_function_call_count_guideline(self) -> str:
+        if self._parallel_tool_calls:
+            return """- You can call multiple functions in the same response ONLY for independent operations \
+(e.g. plots, or transformations of different tables). Dependent operations must be called one at a time"""
+        return "- **CRITICAL: Call EXACTLY ONE function per response - NEVER call multiple functions simultaneously**"
+
+    def get_table_lineage(self) -> TableLineage:
+        """Derivation of the tables generated by the agent, see TableLineage.recompute"""
+        return self._table_lineage
 
     def get_output_tables(self) -> dict[str, Table]:
         tables: dict[str, Table] = {}
@@ -3,6 +3,7 @@ from typing import Literal
 from gws_core import BaseModelDTO, Table
 
 from gws_ai_toolkit.core.agents.base_function_agent_events import UserQueryEventBase
+from gws_ai_toolkit.core.agents.table.table_ai_description_cache import TableAiDescriptionCache
 
 # ============================================================================
 # SERIALIZABLE VERSIONS (No Table objects)
@@ -60,12 +61,28 @@ class UserQueryMultiTablesEvent(UserQueryEventBase):
             for table_unique_name, table in self.tables.items()
         )
 
+    def get_tables_schema_info(self) -> str:
+        """Compact version of get_tables_info with only the schema of the tables,
+        for the agents that don't write code"""
+        return "\n".join(
+            self._get_table_schema_info(table_unique_name, table)
+            for table_unique_name, table in self.tables.items()
+        )
+
     def _get_table_ai_info(self, table_unique_name: str, table: Table) -> str:
         """Get AI info string for a specific table"""
         table_name = f"## '{table_unique_name}'"
-        table_description = table.get_ai_description()
+        table_description = TableAiDescriptionCache.get_ai_description(table)
         return f"""{table_name}
 {table_description}
+"""
+
+    def _get_table_schema_info(self, table_unique_name: str, table: Table) -> str:
+        """Get schema info string for a specific table"""
+        table_name = f"## '{table_unique_name}'"
+        table_schema = TableAiDescriptionCache.get_schema_summary(table)
+        return f"""{table_name}
+{table_schema}
 """
 
     def get_and_check_table(self, table_unique_name: str) -> Table:
@@ -8,7 +8,10 @@ then replays those messages through the TableAgentAI to reproduce the transforma
 and plotting operations, resulting in a ResourceSet with multiple output tables.
 """
 
+import multiprocessing
 import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from typing import cast
 
 from gws_core import (
@@ -176,20 +179,18 @@ class TableAgentReplayTask(Task):
         # Parse serialized events into SerializableTableAgentEvent objects
         self.log_info_message("Parsing serialized events")
         try:
-            adapter = TypeAdapter(list[SerializableTableAgentEvent])
-            serialized_events = adapter.validate_python(serialized_events_data)
+            serialized_events = self.parse_serialized_events(serialized_events_data)
             self.log_info_message(f"Successfully parsed {len(serialized_events)} event(s)")
-        except Exception as e:
-            error_msg = f"Failed to parse serialized events: {str(e)}"
-            self.log_error_message(error_msg)
-            raise ValueError(error_msg)
+        except ValueError as e:
+            self.log_error_message(str(e))
+            raise
 
         # Get OpenAI API key from environment
-        openai_api_key = os.getenv("OPENAI_API_KEY", "")
-        if not openai_api_key:
-            error_msg = "OPENAI_API_KEY environment variable is not set"
-            self.log_error_message(error_msg)
-            raise ValueError(error_msg)
+        try:
+            openai_api_key = self._get_openai_api_key()
+        except ValueError as e:
+            self.log_error_message(str(e))
+            raise
 
         # Get model and temperature from config
         model = params.get_value("model")
@@ -212,7 +213,7 @@ class TableAgentReplayTask(Task):
 
         try:
             output_resources = self._replay_with_progressive_deserialization(
-                replay_agent, serialized_events, input_resources
+                replay_agent, serialized_events, input_resources, self.log_info_message
             )
             self.log_success_message("Successfully replayed all events")
         except Exception as e:
@@ -221,14 +222,9 @@ class TableAgentReplayTask(Task):
             raise RuntimeError(error_msg) from e
 
         # Create output resource set with transformed tables (exclude unchanged input tables)
-        output_resource_set = ResourceSet()
-        for resource_name, resource in output_resources.items():
-            # Only include tables that are new or different from input tables
-            if (
-                resource_name not in input_resources
-                or resource is not input_resources[resource_name]
-            ):
-                output_resource_set.add_resource(resource, unique_name=resource_name)
+        output_resource_set = self._create_resource_set(
+            self._get_new_resources(output_resources, input_resources)
+        )
 
         self.update_progress_value(100, "Replay completed")
         self.log_success_message(
@@ -237,11 +233,148 @@ class TableAgentReplayTask(Task):
 
         return {"output_resource_set": output_resource_set}
 
+    @classmethod
+    def replay_batch(
+        cls,
+        serialized_events_data: list,
+        input_table_sets: list[dict[str, Table]],
+        model: str = "gpt-4o",
+        temperature: float = 0.1,
+        max_workers: int | None = None,
+    ) -> list[ResourceSet]:
+        """Replay the same recorded events on many sets of input tables, e.g. to apply a
+        recorded session to many datasets in a batch pipeline.
+
+        The input sets are independent and replayed concurrently in a pool of processes. Each
+        process compiles the generated code once for all the input sets it replays
+        (see CompiledCodeCache). With a single worker (or a single input set), the input sets
+        are replayed one after the other in the current process, without a pool.
+
+        Args:
+            serialized_events_data: JSON list of SerializableTableAgentEvent objects to replay
+            input_table_sets: Input tables of each replay, by table name
+            model: OpenAI model of the replay agents
+            temperature: Temperature of the replay agents
+            max_workers: Maximum number of processes, the number of CPUs by default. Use 1 to
+                replay in the current process
+
+        Returns:
+            The ResourceSet of the output tables and plots of each input set, in the same order
+
+        Raises:
+            ValueError: If the events can't be parsed or the OpenAI API key is not set
+            RuntimeError: If the replay of an input set fails
+        """
+        serialized_events = cls.parse_serialized_events(serialized_events_data)
+        openai_api_key = cls._get_openai_api_key()
+        if not input_table_sets:
+            return []
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = max(1, min(max_workers, len(input_table_sets)))
+
+        if max_workers == 1:
+            output_resource_sets: list[ResourceSet] = []
+            for index, input_tables in enumerate(input_table_sets):
+                try:
+                    output_resources = cls._replay_input_set(
+                        serialized_events, input_tables, openai_api_key, model, temperature
+                    )
+                except Exception as e:
+                    raise RuntimeError(f"Error during event replay of the input set {index}: {str(e)}") from e
+                output_resource_sets.append(cls._create_resource_set(output_resources))
+            return output_resource_sets
+
+        # forkserver avoids forking the threads of the app, spawn when it is not available
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context(start_method)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    cls._replay_input_set, serialized_events, input_tables, openai_api_key, model, temperature
+                )
+                for input_tables in input_table_sets
+            ]
+
+            output_resource_sets: list[ResourceSet] = []
+            for index, future in enumerate(futures):
+                try:
+                    output_resources = future.result()
+                except Exception as e:
+                    raise RuntimeError(f"Error during event replay of the input set {index}: {str(e)}") from e
+                output_resource_sets.append(cls._create_resource_set(output_resources))
+
+        return output_resource_sets
+
+    @classmethod
+    def parse_serialized_events(cls, serialized_events_data: list) -> list[SerializableTableAgentEvent]:
+        """Parse the JSON list of events to replay
+
+        Raises:
+            ValueError: If the events are invalid
+        """
+        try:
+            adapter = TypeAdapter(list[SerializableTableAgentEvent])
+            return adapter.validate_python(serialized_events_data)
+        except Exception as e:
+            raise ValueError(f"Failed to parse serialized events: {str(e)}")
+
+    @classmethod
+    def _get_openai_api_key(cls) -> str:
+        openai_api_key = os.getenv("OPENAI_API_KEY", "")
+        if not openai_api_key:
+            raise ValueError("OPENAI_API_KEY environment variable is not set")
+        return openai_api_key
+
+    @classmethod
+    def _replay_input_set(
+        cls,
+        serialized_events: list[SerializableTableAgentEvent],
+        input_tables: dict[str, Table],
+        openai_api_key: str,
+        model: str,
+        temperature: float,
+    ) -> dict[str, Resource]:
+        """Replay the events on an input set and return the new resources, executed in the
+        processes of replay_batch or in the current process with a single worker (the input
+        tables are compared in the process that received them)"""
+        replay_agent = TableAgentAi(
+            openai_api_key=openai_api_key,
+            model=model,
+            temperature=temperature,
+        )
+        output_resources = cls._replay_with_progressive_deserialization(
+            replay_agent, serialized_events, input_tables
+        )
+        return cls._get_new_resources(output_resources, input_tables)
+
+    @classmethod
+    def _get_new_resources(
+        cls, output_resources: dict[str, Resource], input_tables: dict[str, Table]
+    ) -> dict[str, Resource]:
+        """Get the resources that are new or different from input tables (exclude unchanged input tables)"""
+        return {
+            resource_name: resource
+            for resource_name, resource in output_resources.items()
+            if resource_name not in input_tables or resource is not input_tables[resource_name]
+        }
+
+    @classmethod
+    def _create_resource_set(cls, resources: dict[str, Resource]) -> ResourceSet:
+        resource_set = ResourceSet()
+        for resource_name, resource in resources.items():
+            resource_set.add_resource(resource, unique_name=resource_name)
+        return resource_set
+
+    @classmethod
     def _replay_with_progressive_deserialization(
-        self,
+        cls,
         agent: TableAgentAi,
         serialized_events: list[SerializableTableAgentEvent],
         input_tables: dict[str, Table],
+        log_info_message: Callable[[str], None] | None = None,
     ) -> dict[str, Resource]:
         """Replay events with progressive deserialization.
 
@@ -253,6 +386,7 @@ class TableAgentReplayTask(Task):
             agent: The TableAgentAi instance to use for replay
             serialized_events: List of serialized events to replay
             input_tables: Dictionary of input tables
+            log_info_message: Optional function to log the progress
 
         Returns:
             Dictionary of all output resources (tables + plots)
@@ -280,10 +414,11 @@ class TableAgentReplayTask(Task):
 
         # Process each chunk
         for i, chunk in enumerate(event_chunks):
-            self.log_info_message(f"Processing event chunk {i + 1}/{len(event_chunks)}")
+            if log_info_message is not None:
+                log_info_message(f"Processing event chunk {i + 1}/{len(event_chunks)}")
 
             # Deserialize this chunk with current available tables
-            runtime_chunk = self._deserialize_chunk(chunk, available_tables)
+            runtime_chunk = cls._deserialize_chunk(chunk, available_tables)
 
             # Replay this chunk
             list(agent.replay_events(runtime_chunk))
@@ -297,8 +432,9 @@ class TableAgentReplayTask(Task):
 
         return output_resources
 
+    @classmethod
     def _deserialize_chunk(
-        self,
+        cls,
         chunk: list[SerializableTableAgentEvent],
         available_tables: dict[str, Table],
     ) -> list[TableAgentEvent]:
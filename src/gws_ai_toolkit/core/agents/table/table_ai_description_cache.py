@@ -0,0 +1,111 @@
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable
+
+import pandas as pd
+from gws_core import Table
+
+
+class TableAiDescriptionCache:
+    """Process level cache of the tables AI descriptions (Table.get_ai_description).
+
+    The description of a table is computed from its data (columns, types, statistics), this is
+    expensive for wide tables and the agents need it on each call to OpenAI. The descriptions are
+    cached by table object and a cheap fingerprint of the data, so a table whose data was replaced
+    or modified (shape, columns, dtypes, first and last rows) gets a new description.
+
+    The cache also contains a compact schema summary of the tables (see get_schema_summary) for
+    the agents that only need to know the structure of the tables.
+    """
+
+    MAX_SIZE = 256
+    # number of rows at the beginning and at the end of the table used in the fingerprint
+    FINGERPRINT_ROW_COUNT = 5
+    # maximum number of columns listed in the schema summary
+    MAX_SCHEMA_COLUMNS = 200
+
+    # (id of the table, kind of text) -> (weak reference to the table, fingerprint, text)
+    _cache: OrderedDict[tuple[int, str], tuple[weakref.ref, tuple, str]] = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_ai_description(cls, table: Table) -> str:
+        """Get the AI description of the table, computed only if the table changed since the last call."""
+        return cls._get_cached_text(table, "description", lambda fingerprint: table.get_ai_description())
+
+    @classmethod
+    def get_schema_summary(cls, table: Table) -> str:
+        """Get a compact summary of the table: row count, column names and dtypes and a sketch
+        (hash of the fingerprint of the data, it changes when the data changes). It is much
+        shorter than the AI description and computed only if the table changed since the last call."""
+        return cls._get_cached_text(table, "schema", cls._create_schema_summary)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Clear the cached descriptions."""
+        with cls._lock:
+            cls._cache.clear()
+
+    @classmethod
+    def _get_cached_text(cls, table: Table, kind: str, compute: Callable[[tuple], str]) -> str:
+        fingerprint = cls.get_fingerprint(table)
+        key = (id(table), kind)
+
+        with cls._lock:
+            cached = cls._cache.get(key)
+            # check the reference because the id of a deleted table can be reused
+            if cached is not None and cached[0]() is table and cached[1] == fingerprint:
+                cls._cache.move_to_end(key)
+                return cached[2]
+
+        text = compute(fingerprint)
+
+        with cls._lock:
+            cls._cache[key] = (weakref.ref(table), fingerprint, text)
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.MAX_SIZE:
+                cls._cache.popitem(last=False)
+
+        return text
+
+    @classmethod
+    def _create_schema_summary(cls, fingerprint: tuple) -> str:
+        (row_count, column_count), columns, dtypes, _ = fingerprint
+        sketch = hashlib.sha256(repr(fingerprint).encode("utf-8")).hexdigest()[:12]
+
+        lines = [f"Rows: {row_count}, columns: {column_count}, sketch: {sketch}", "Columns:"]
+        lines.extend(
+            f"- {column} ({dtype})"
+            for column, dtype in zip(columns[: cls.MAX_SCHEMA_COLUMNS], dtypes[: cls.MAX_SCHEMA_COLUMNS])
+        )
+        if column_count > cls.MAX_SCHEMA_COLUMNS:
+            lines.append(f"- ... and {column_count - cls.MAX_SCHEMA_COLUMNS} more columns")
+        return "\n".join(lines)
+
+    @classmethod
+    def get_fingerprint(cls, table: Table) -> tuple:
+        """Get a cheap fingerprint of the data of the table: shape, columns, dtypes and a hash of the
+        first and last rows. The whole table is not hashed, a change of a row in the middle of the
+        table without any change of the shape, columns or dtypes is not detected."""
+        dataframe = table.get_data()
+
+        row_count = cls.FINGERPRINT_ROW_COUNT
+        if len(dataframe) > 2 * row_count:
+            sample = pd.concat([dataframe.head(row_count), dataframe.tail(row_count)])
+        else:
+            sample = dataframe
+
+        try:
+            sample_hash = int(pd.util.hash_pandas_object(sample, index=True).sum())
+        except TypeError:
+            # unhashable values (e.g. lists in cells)
+            sample_hash = hash(sample.to_string())
+
+        return (
+            dataframe.shape,
+            tuple(str(column) for column in dataframe.columns),
+            tuple(str(dtype) for dtype in dataframe.dtypes),
+            sample_hash,
+        )
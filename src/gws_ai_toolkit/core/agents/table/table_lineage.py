@@ -0,0 +1,178 @@
+import hashlib
+import threading
+from typing import ClassVar, Literal
+
+from gws_core import BaseModelDTO, Table
+
+from gws_ai_toolkit.core.agents.code_executor import CodeExecutor
+from gws_ai_toolkit.core.agents.table.table_ai_description_cache import TableAiDescriptionCache
+
+from .multi_table_agent_ai import MultiTableAgentAi
+from .table_transform_agent_ai import TableTransformAgentAi
+
+
+class TableLineageStep(BaseModelDTO):
+    """A transformation of the lineage: the code that computed the output tables from the input tables"""
+
+    type: Literal["transform", "multi_transform"]
+    code: str
+    input_table_names: list[str]
+    output_table_names: list[str]
+    # fingerprints of the input tables when the output tables were computed
+    input_fingerprints: dict[str, str]
+
+
+class TableLineage(BaseModelDTO):
+    """Derivation of the tables generated by the table agents: for each output table, the code
+    and the input tables that computed it (a DAG of the tables by name).
+
+    When a table changes (e.g. the source file was reloaded), the tables derived from it are
+    recomputed locally by re-running the stored code, without calling the model. The table names
+    are unique (the agents ask for output names that don't conflict with the existing tables),
+    an output computed again replaces its previous step.
+    """
+
+    # in execution order, the inputs of a step are computed by the previous steps
+    steps: list[TableLineageStep] = []
+
+    # the steps are added by the sub agent calls, they can run in parallel threads
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def add_step(self, step: TableLineageStep) -> None:
+        """Add a step, the previous steps of its output tables are replaced"""
+        output_names = set(step.output_table_names)
+        with self._lock:
+            self.steps = [
+                previous_step
+                for previous_step in self.steps
+                if not output_names & set(previous_step.output_table_names)
+            ] + [step]
+
+    def add_transform(self, code: str, input_tables: dict[str, Table], output_table_name: str) -> None:
+        """Add the step of a single table transformation (TableTransformEvent)"""
+        self.add_step(self._create_step("transform", code, input_tables, [output_table_name]))
+
+    def add_multi_transform(self, code: str, input_tables: dict[str, Table], output_table_names: list[str]) -> None:
+        """Add the step of a multi-table transformation (MultiTableTransformEvent)"""
+        self.add_step(self._create_step("multi_transform", code, input_tables, output_table_names))
+
+    def get_step(self, table_name: str) -> TableLineageStep | None:
+        """Get the step that computed the table, None for a source table"""
+        for step in self.steps:
+            if table_name in step.output_table_names:
+                return step
+        return None
+
+    def get_downstream_table_names(self, table_names: list[str]) -> list[str]:
+        """Get the tables derived from the tables (directly or not), in computation order"""
+        changed_names = set(table_names)
+        downstream_names: list[str] = []
+        for step in self.steps:
+            if changed_names.intersection(step.input_table_names):
+                changed_names.update(step.output_table_names)
+                downstream_names.extend(step.output_table_names)
+        return downstream_names
+
+    def get_stale_table_names(self, tables: dict[str, Table]) -> list[str]:
+        """Get the tables that must be recomputed because one of their inputs (directly or not)
+        changed since they were computed, in computation order. The changes are detected with a
+        cheap fingerprint (see get_table_fingerprint), pass the changed tables to recompute when
+        they are known."""
+        return self.get_downstream_table_names(self._get_changed_input_names(tables))
+
+    def recompute(
+        self,
+        tables: dict[str, Table],
+        changed_table_names: list[str] | None = None,
+        code_executor: CodeExecutor | None = None,
+    ) -> dict[str, Table]:
+        """Recompute the tables derived from the changed tables by re-running the stored code,
+        the steps are updated with the new fingerprints of their inputs.
+
+        Args:
+            tables: Current tables by name (sources and derived tables)
+            changed_table_names: Tables that changed, by default the inputs whose fingerprint changed
+            code_executor: Executor of the code, the code is executed in the current process by default
+
+        Returns:
+            The recomputed tables by name, in computation order
+
+        Raises:
+            ValueError: If an input table of a step to recompute is missing
+            CodeExecutionError: If the code of a step fails on the new data
+        """
+        if changed_table_names is None:
+            changed_table_names = self._get_changed_input_names(tables)
+
+        if code_executor is None:
+            code_executor = CodeExecutor()
+
+        current_tables = dict(tables)
+        changed_names = set(changed_table_names)
+        recomputed_tables: dict[str, Table] = {}
+        for step in self.steps:
+            if not changed_names.intersection(step.input_table_names):
+                continue
+
+            missing_names = [name for name in step.input_table_names if name not in current_tables]
+            if missing_names:
+                raise ValueError(
+                    f"Tables {', '.join(missing_names)} not found, they are required to recompute "
+                    f"{', '.join(step.output_table_names)}"
+                )
+            input_tables = {name: current_tables[name] for name in step.input_table_names}
+
+            if step.type == "transform":
+                dataframe = TableTransformAgentAi.execute_transform_code(
+                    step.code, input_tables[step.input_table_names[0]], code_executor
+                )
+                output_table = Table(dataframe)
+                output_table.name = step.output_table_names[0]
+                output_tables = {step.output_table_names[0]: output_table}
+            else:
+                output_tables = MultiTableAgentAi.execute_multi_transform_code(step.code, input_tables, code_executor)
+
+            step.input_fingerprints = {name: get_table_fingerprint(table) for name, table in input_tables.items()}
+            step.output_table_names = list(output_tables.keys())
+            current_tables.update(output_tables)
+            recomputed_tables.update(output_tables)
+            changed_names.update(output_tables.keys())
+
+        return recomputed_tables
+
+    def _get_changed_input_names(self, tables: dict[str, Table]) -> list[str]:
+        # a table can be the input of multiple steps, it is hashed once
+        fingerprints: dict[str, str] = {}
+        changed_names: list[str] = []
+        for step in self.steps:
+            for name, fingerprint in step.input_fingerprints.items():
+                if name not in tables or name in changed_names:
+                    continue
+                if name not in fingerprints:
+                    fingerprints[name] = get_table_fingerprint(tables[name])
+                if fingerprints[name] != fingerprint:
+                    changed_names.append(name)
+        return changed_names
+
+    def _create_step(
+        self,
+        step_type: Literal["transform", "multi_transform"],
+        code: str,
+        input_tables: dict[str, Table],
+        output_table_names: list[str],
+    ) -> TableLineageStep:
+        return TableLineageStep(
+            type=step_type,
+            code=code,
+            input_table_names=list(input_tables.keys()),
+            output_table_names=output_table_names,
+            input_fingerprints={name: get_table_fingerprint(table) for name, table in input_tables.items()},
+        )
+
+
+def get_table_fingerprint(table: Table) -> str:
+    """Hash of the cheap fingerprint of the table (see TableAiDescriptionCache.get_fingerprint): shape,
+    columns, dtypes and first and last rows. It is computed on each transformation so the whole
+    table is not hashed."""
+    fingerprint = TableAiDescriptionCache.get_fingerprint(table)
+    return hashlib.sha256(repr(fingerprint).encode("utf-8")).hexdigest()
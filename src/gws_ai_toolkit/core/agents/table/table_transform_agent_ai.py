@@ -1,4 +1,3 @@
-import traceback
 from collections.abc import Generator
 
 import numpy as np
@@ -12,6 +11,8 @@ from gws_ai_toolkit.core.agents.base_function_agent_events import (
     FunctionErrorEvent,
 )
 from gws_ai_toolkit.core.agents.code_execution_error import CodeExecutionError
+from gws_ai_toolkit.core.agents.code_executor import CodeExecutor
+from gws_ai_toolkit.core.agents.table.table_ai_description_cache import TableAiDescriptionCache
 from gws_ai_toolkit.core.agents.table.table_agent_event_base import UserQueryTableTransformEvent
 
 from ..base_function_agent_ai import BaseFunctionAgentAi
@@ -155,27 +156,40 @@ class TableTransformAgentAi(
             ValueError: If code is invalid or doesn't produce expected output
             RuntimeError: If code execution fails
         """
+        return self.execute_transform_code(code, table, self.get_code_executor())
+
+    @classmethod
+    def execute_transform_code(cls, code: str, table: Table, code_executor: CodeExecutor) -> pd.DataFrame:
+        """Execute the code of a transformation (it defines 'transformed_df' from 'df') on the table,
+        without calling OpenAI. Used to re-run stored code (see TableLineage.recompute).
+
+        Args:
+            code: Python code to execute
+            table: Table to transform
+            code_executor: Executor of the code
+
+        Returns:
+            Transformed DataFrame
+
+        Raises:
+            ValueError: If code is invalid or doesn't produce expected output
+            CodeExecutionError: If code execution fails
+        """
         # Create safe execution environment
-        execution_globals = self._get_code_execution_globals()
+        execution_globals = cls._get_code_execution_globals()
         execution_globals["df"] = table.get_data()
 
         # Execute the code
-        try:
-            exec(code, execution_globals)
-        except Exception as exec_error:
-            # Include stack trace in the exception for AI context
-            error_msg = f"Error executing generated code: {exec_error}"
-            stack_trace = traceback.format_exc()
-            raise CodeExecutionError(error_msg, stack_trace) from exec_error
+        results = code_executor.execute(code, execution_globals, ["transformed_df"])
 
         # Validate transformed DataFrame was created
-        if "transformed_df" not in execution_globals:
+        if "transformed_df" not in results:
             raise ValueError(
                 "The executed code did not define a variable named 'transformed_df'. "
                 "Make sure to assign the transformed DataFrame to a variable named 'transformed_df'."
             )
 
-        transformed_df = execution_globals["transformed_df"]
+        transformed_df = results["transformed_df"]
 
         if not isinstance(transformed_df, pd.DataFrame):
             raise ValueError(
@@ -185,7 +199,8 @@ class TableTransformAgentAi(
 
         return transformed_df
 
-    def _get_code_execution_globals(self) -> dict:
+    @classmethod
+    def _get_code_execution_globals(cls) -> dict:
         """Get globals for code execution environment"""
         return {
             "pd": pd,
@@ -204,18 +219,21 @@ class TableTransformAgentAi(
             Formatted prompt for OpenAI
         """
 
-        table_metadata = user_query.table.get_ai_description()
+        # the table information is at the end so the beginning of the instructions stays
+        # identical between calls and can be cached by the provider
+        table_metadata = TableAiDescriptionCache.get_ai_description(user_query.table)
         table_name = f"Input table name : {user_query.table_name}" if user_query.table_name else ""
         output_table_name = (
             f"Output table name: {user_query.output_table_name}"
             if user_query.output_table_name
             else ""
         )
-        return f"""You are an AI assistant specialized in data cleaning, transformation, and manipulation. You have access to information about a table/dataset but not the actual data.
-
-{table_name}
-{output_table_name}
-{table_metadata}
+        if self.get_code_executor().protects_inputs():
+            # the input is protected by the executor, copying it only doubles the memory
+            example_copy = "# df is protected against modifications, don't copy it\ntransformed_df = df"
+        else:
+            example_copy = "transformed_df = df.copy()"
+        return f"""You are an AI assistant specialized in data cleaning, transformation, and manipulation. You have access to information about a table/dataset (provided at the end) but not the actual data.
 
 Your role is to help users transform, clean, and manipulate this data. When users request data transformations, you should:
 
@@ -253,8 +271,13 @@ Call the function only once per user request for a transformation.
 Example code structure:
 ```python
 # Perform transformations on df
-transformed_df = df.copy()
+{example_copy}
 # Apply specific transformations
 transformed_df = transformed_df.dropna()
 transformed_df['new_column'] = transformed_df['existing_column'] * 2
-```"""
+```
+
+# Table information
+{table_name}
+{output_table_name}
+{table_metadata}"""
@@ -0,0 +1,83 @@
+import os
+import threading
+
+from openai import OpenAI
+
+
+class OpenAiClientRegistry:
+    """Process level registry of OpenAI clients.
+
+    An OpenAI client holds an HTTP connection pool, creating a new client for each call
+    means a new TCP connection and TLS handshake. The clients are shared by api key and
+    base url so the connections are reused between the calls of the agents and the
+    conversations.
+
+    The clients are stored outside of the objects that use them because objects stored
+    in the reflex states must be picklable (the client is not). Only keep the api key
+    in these objects and get the client from the registry when needed.
+    """
+
+    _clients: dict[tuple[str, str | None], OpenAI] = {}
+    _lock = threading.Lock()
+    # Id of the process that created the clients, the connections can't be shared with a forked process
+    _pid: int | None = None
+
+    @classmethod
+    def get_client(cls, api_key: str, base_url: str | None = None) -> OpenAI:
+        """Get the shared OpenAI client for the api key and base url, it is created on first call.
+
+        :param api_key: OpenAI api key
+        :param base_url: base url of the OpenAI API, None to use the default one
+        :return: the shared OpenAI client
+        """
+        key = (api_key, base_url)
+        with cls._lock:
+            if cls._pid != os.getpid():
+                cls._clients = {}
+                cls._pid = os.getpid()
+
+            client = cls._clients.get(key)
+            if client is None:
+                client = OpenAI(api_key=api_key, base_url=base_url)
+                cls._clients[key] = client
+            return client
+
+    @classmethod
+    def register_client(cls, client: OpenAI, api_key: str, base_url: str | None = None) -> None:
+        """Register a client for the api key and base url, it replaces the shared client.
+
+        Used to plug a client that doesn't call the OpenAI API (e.g. a ReplayOpenAiClient
+        that replays recorded responses) without changing the code that uses the registry.
+        """
+        with cls._lock:
+            if cls._pid != os.getpid():
+                cls._clients = {}
+                cls._pid = os.getpid()
+            cls._clients[(api_key, base_url)] = client
+
+    @classmethod
+    def unregister_client(cls, api_key: str, base_url: str | None = None) -> None:
+        """Remove the client of the api key and base url, a new client is created on next call."""
+        with cls._lock:
+            cls._clients.pop((api_key, base_url), None)
+
+    @classmethod
+    def get_client_from_env(cls) -> OpenAI:
+        """Get the shared OpenAI client for the OPENAI_API_KEY environment variable.
+
+        :raises ValueError: if the OPENAI_API_KEY environment variable is not set
+        """
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OpenAI API key is not set")
+        return cls.get_client(api_key)
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close the connections of all the clients and clear the registry."""
+        with cls._lock:
+            clients = list(cls._clients.values())
+            cls._clients = {}
+
+        for client in clients:
+            client.close()
@@ -197,21 +197,24 @@ class ChatConversationService:
         # Convert back to DTO
         return message_model.to_chat_message()
 
-    def get_messages_of_conversation(self, conversation_id: str) -> list[ChatMessageBase]:
+    def get_messages_of_conversation(self, conversation_id: str, lazy: bool = False) -> list[ChatMessageBase]:
         """Get all messages of a conversation with their sources loaded.
 
         :param conversation_id: The ID of the conversation
         :type conversation_id: str
+        :param lazy: If True, the payload files of the messages (table, figure, image) are not
+            read, they are loaded on first access (to_front_dto of the table messages never reads them)
+        :type lazy: bool
         :return: List of ChatMessage union type instances with sources
         :rtype: List[ChatMessage]
         """
         # Verify conversation exists
         ChatConversation.get_by_id_and_check(conversation_id)
 
-        # Get messages ordered by creation date
-        messages = ChatMessageModel.get_by_conversation(conversation_id)
+        # Get messages ordered by creation date, with their user and sources (2 queries)
+        messages = ChatMessageModel.get_by_conversation_with_sources(conversation_id)
 
-        return [message.to_chat_message() for message in messages]
+        return [message.to_chat_message(lazy=lazy) for message in messages]
 
     @AiToolkitDbManager.transaction()
     def delete_conversation(self, conversation_id: str) -> None:
@@ -229,6 +232,8 @@ class ChatConversationService:
     ) -> list[ChatMessageSourceModel]:
         """Create source records for a message.
 
+        The sources are inserted with a single query, in the transaction of the caller.
+
         :param message: The message to attach sources to
         :type message: ChatMessageModel
         :param sources: List of SaveChatMessageSourceDTO
@@ -251,7 +256,9 @@ class ChatConversationService:
             source_record.score = source.score
             source_record.set_chunk(source.chunk)
 
-            db_sources.append(source_record.save())
+            db_sources.append(source_record)
+
+        ChatMessageSourceModel.insert_many([source_record.__data__ for source_record in db_sources]).execute()
         return db_sources
 
     def set_conversation_external_id(
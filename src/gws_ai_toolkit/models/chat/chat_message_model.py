@@ -2,7 +2,7 @@ import os
 from typing import TYPE_CHECKING, Literal
 
 from gws_core import JSONField, Model
-from peewee import CharField, ForeignKeyField, TextField
+from peewee import CharField, ForeignKeyField, TextField, prefetch
 
 from gws_ai_toolkit.core.ai_toolkit_db_manager import AiToolkitDbManager
 from gws_ai_toolkit.models.chat.chat_conversation import ChatConversation
@@ -57,6 +57,31 @@ class ChatMessageModel(Model):
             cls.select().where(cls.conversation == conversation_id).order_by(cls.created_at.asc())
         )
 
+    @classmethod
+    def get_by_conversation_with_sources(cls, conversation_id: str) -> list["ChatMessageModel"]:
+        """Get messages by conversation ID, ordered by creation date (oldest first), with their
+        user and their sources loaded.
+
+        The messages are selected with their user (join) and the sources of all the messages
+        are selected with a second query (prefetch), the number of queries doesn't depend on
+        the number of messages.
+
+        :param conversation_id: The ID of the conversation
+        :type conversation_id: str
+        :return: List of messages with the sources attribute filled
+        :rtype: List[ChatMessage]
+        """
+        # Import here to avoid circular imports
+        from gws_ai_toolkit.models.chat.chat_message_source_model import ChatMessageSourceModel
+
+        messages = (
+            cls.select(cls, User)
+            .join(User)
+            .where(cls.conversation == conversation_id)
+            .order_by(cls.created_at.asc())
+        )
+        return list(prefetch(messages, ChatMessageSourceModel.select()))
+
     @classmethod
     def build_message(
         cls,
@@ -78,15 +103,17 @@ class ChatMessageModel(Model):
         message.filename = filename
         return message
 
-    def to_chat_message(self) -> ChatMessageBase:
+    def to_chat_message(self, lazy: bool = False) -> ChatMessageBase:
         """Convert database ChatMessage model to ChatMessageDTO union type.
 
+        :param lazy: If True, the payload files (table, figure, image) are loaded on first access
+        :type lazy: bool
         :return: ChatMessage union type instance
         :rtype: ChatMessageDTO
         """
         from gws_ai_toolkit.models.chat.message.chat_message_base import ChatMessageBase
 
-        return ChatMessageBase.from_chat_message_model(self)
+        return ChatMessageBase.from_chat_message_model(self, lazy=lazy)
 
     def get_filepath_if_exists(self) -> str | None:
         """Get the full file path for the message's filename if it exists.
@@ -7,6 +7,7 @@ from openai import OpenAI
 from openai.types.responses import ResponseCreatedEvent, ResponseOutputTextAnnotationAddedEvent
 from PIL import Image
 
+from gws_ai_toolkit.core.openai_client_registry import OpenAiClientRegistry
 from gws_ai_toolkit.models.chat.conversation.ai_expert_chat_config import AiExpertChatConfig
 from gws_ai_toolkit.models.chat.message.chat_message_error import ChatMessageError
 from gws_ai_toolkit.models.chat.message.chat_message_image import ChatMessageImage
@@ -83,11 +84,8 @@ class AiExpertChatConversation(BaseChatConversation[ChatUserMessageText]):
         self._current_external_response_id = None
 
     def _get_openai_client(self) -> OpenAI:
-        """Get OpenAI client with API key."""
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OpenAI API key is not set")
-        return OpenAI(api_key=api_key)
+        """Get the shared OpenAI client for the OPENAI_API_KEY environment variable."""
+        return OpenAiClientRegistry.get_client_from_env()
 
     def _call_ai_chat(
         self, user_message: ChatUserMessageText
@@ -70,13 +70,16 @@ class ChatMessageBase(BaseModelDTO):
         return message_class
 
     @classmethod
-    def from_chat_message_model(cls, chat_message: "ChatMessageModel") -> "ChatMessageBase":
+    def from_chat_message_model(cls, chat_message: "ChatMessageModel", lazy: bool = False) -> "ChatMessageBase":
         """Convert database ChatMessage model to ChatMessageBase union type.
 
         Uses the registered message classes to delegate conversion to the appropriate subclass.
 
         :param chat_message: The database ChatMessage instance to convert
         :type chat_message: ChatMessage
+        :param lazy: If True, the payload files (table, figure, image) are not read,
+            they are loaded on first access
+        :type lazy: bool
         :return: ChatMessageBase union type instance
         :rtype: ChatMessageBase
         """
@@ -99,12 +102,22 @@ class ChatMessageBase(BaseModelDTO):
         )
 
         message.fill_from_model(chat_message)
+        if not lazy:
+            message.load_payload()
 
         return message
 
     def fill_from_model(self, chat_message: "ChatMessageModel") -> None:
         """Fill additional fields from the ChatMessageModel.
         This is called after the initial creation in from_chat_message_model.
+        The payload files of the message must not be read here, see load_payload.
+        """
+
+    def load_payload(self) -> None:
+        """Load the payload file of the message (table, figure, image...) if it is not loaded yet.
+
+        Called by from_chat_message_model unless the message is loaded lazily. Messages
+        with a payload file must override it, their payload is also loaded on first access.
         """
 
     def to_chat_message_model(self, conversation: "ChatConversation") -> "ChatMessageModel":
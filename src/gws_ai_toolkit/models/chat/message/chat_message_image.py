@@ -15,11 +15,12 @@ class ChatMessageImage(ChatMessageBase):
     """Chat message containing image content.
 
     Specialized chat message for images, supporting PIL Image objects.
-    Images are stored as files in the conversation folder and loaded on demand.
+    Images are stored as files in the conversation folder and loaded on demand,
+    when the message is loaded lazily the image is read on the first call of get_image.
 
     Attributes:
         type: Fixed as "image" to identify this as an image message
-        image: The PIL Image object (may be None if not loaded)
+        image: The PIL Image object (None until loaded with get_image)
 
     Example:
         image_msg = ChatMessageImage(
@@ -34,22 +35,37 @@ class ChatMessageImage(ChatMessageBase):
 
     image: Image.Image | None = None
 
+    # file of the image, read on the first call of get_image
+    _image_file_path: str | None = None
+
     class Config:
         arbitrary_types_allowed = True
 
     def fill_from_model(self, chat_message: "ChatMessageModel") -> None:
         """Fill additional fields from the ChatMessageModel.
         This is called after the initial creation in from_chat_message_model.
+        Only the path of the image is read, the image file is read by get_image.
+        """
+        self.image = None
+        self._image_file_path = chat_message.get_filepath_if_exists()
+
+    def get_image(self) -> Image.Image | None:
+        """Get the image, it is read from the file of the message on the first call.
+
+        :return: The image, None if the file doesn't exist or can't be read
+        :rtype: Image.Image | None
         """
-        file_path = chat_message.get_filepath_if_exists()
-        if file_path:
-            # Load image from file
+        if self.image is None and self._image_file_path:
             try:
-                self.image = Image.open(file_path)
+                self.image = Image.open(self._image_file_path)
             except Exception:
                 self.image = None
-        else:
-            self.image = None
+            # the file is not read again if it failed
+            self._image_file_path = None
+        return self.image
+
+    def load_payload(self) -> None:
+        self.get_image()
 
     def _save_image_to_message(self, message: "ChatMessageModel") -> None:
         """Save the image to the conversation folder and update message filename.
@@ -97,3 +113,8 @@ class ChatMessageImage(ChatMessageBase):
             self._save_image_to_message(message)
 
         return message
+
+    def to_front_dto(self) -> ChatMessageBase:
+        # the image is rendered by the front, it is loaded if the message was loaded lazily
+        self.get_image()
+        return self
@@ -17,11 +17,13 @@ class ChatMessagePlotly(ChatMessageBase):
 
     Specialized chat message for interactive Plotly visualizations created
     through function calls. Used to display charts, graphs, and data
-    visualizations in the chat interface.
+    visualizations in the chat interface. The figure is stored as a JSON file,
+    when the message is loaded lazily it is read on the first call of get_plot.
 
     Attributes:
         type: Fixed as "plotly" to identify this as a plotly message
-        figure: The Plotly figure object for rendering (may be None if not loaded)
+        plot: The Plotly resource for rendering (None until loaded with get_plot)
+        plot_name: Name of the plot, available without loading the figure
 
     Example:
         plotly_msg = ChatMessagePlotly(
@@ -34,6 +36,10 @@ class ChatMessagePlotly(ChatMessageBase):
     message_type: str = "plotly"
     role: Literal["assistant"] = "assistant"
     plot: PlotlyResource | None = None
+    plot_name: str | None = None
+
+    # file of the figure, read on the first call of get_plot
+    _plot_file_path: str | None = None
 
     class Config:
         arbitrary_types_allowed = True
@@ -41,16 +47,29 @@ class ChatMessagePlotly(ChatMessageBase):
     def fill_from_model(self, chat_message: "ChatMessageModel") -> None:
         """Fill additional fields from the ChatMessageModel.
         This is called after the initial creation in from_chat_message_model.
+        Only the metadata is read, the figure file is read by get_plot.
         """
-        file_path = chat_message.get_filepath_if_exists()
-        if file_path:
-            # Load figure from file
+        self.plot = None
+        self.plot_name = (chat_message.data or {}).get("plot_name")
+        self._plot_file_path = chat_message.get_filepath_if_exists()
+
+    def get_plot(self) -> PlotlyResource | None:
+        """Get the Plotly resource, it is read from the file of the message on the first call.
+
+        :return: The Plotly resource, None if the file doesn't exist or can't be read
+        :rtype: PlotlyResource | None
+        """
+        if self.plot is None and self._plot_file_path:
             try:
-                self.plot = PlotlyResource.from_json_file(file_path)
+                self.plot = PlotlyResource.from_json_file(self._plot_file_path)
             except Exception:
                 self.plot = None
-        else:
-            self.plot = None
+            # the file is not read again if it failed
+            self._plot_file_path = None
+        return self.plot
+
+    def load_payload(self) -> None:
+        self.get_plot()
 
     def _save_plot_to_message(self, message: "ChatMessageModel") -> None:
         """Save the Plotly figure to the conversation folder and update message filename.
@@ -85,12 +104,14 @@ class ChatMessagePlotly(ChatMessageBase):
         """
         from gws_ai_toolkit.models.chat.chat_message_model import ChatMessageModel
 
+        plot_name = self._get_plot_name()
         message = ChatMessageModel.build_message(
             conversation=conversation,
             role=self.role,
             type_=self.message_type,
             content="",
             external_id=self.external_id,
+            data={"plot_name": plot_name} if plot_name else {},
         )
 
         # Save figure to folder if present
@@ -99,13 +120,20 @@ class ChatMessagePlotly(ChatMessageBase):
 
         return message
 
+    def _get_plot_name(self) -> str | None:
+        if self.plot is not None and self.plot.name:
+            return self.plot.name
+        return self.plot_name
+
     def to_front_dto(self) -> ChatMessageBase:
+        # the figure is rendered by the front, it is loaded if the message was loaded lazily
+        plot = self.get_plot()
         return ChatMessagePlotlyFront(
             id=self.id,
             role=self.role,
             message_type=self.message_type,
-            figure=self.plot.figure if self.plot else None,
-            plot_name=self.plot.name if self.plot else None,
+            figure=plot.figure if plot else None,
+            plot_name=self._get_plot_name(),
         )
 
 
@@ -2,10 +2,15 @@ import os
 from typing import TYPE_CHECKING, Literal
 
 import pandas as pd
-from gws_core import Table
+from gws_core import Logger, Table
 
 from gws_ai_toolkit.models.chat.message.chat_message_base import ChatMessageBase
 
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional, the tables are saved as CSV without it
+    pa = None
+
 if TYPE_CHECKING:
     from gws_ai_toolkit.models.chat.chat_conversation import ChatConversation
     from gws_ai_toolkit.models.chat.chat_message_model import ChatMessageModel
@@ -16,18 +21,22 @@ class ChatMessageTable(ChatMessageBase):
     """Chat message containing DataFrame content.
 
     Specialized chat message for pandas DataFrame objects, supporting
-    tabular data display in the chat interface. DataFrames are stored
-    as CSV files and loaded on demand.
+    tabular data display in the chat interface. Tables are stored as
+    Arrow IPC files (zstd compressed, CSV for the messages saved before
+    or without pyarrow). A message loaded lazily from the database only
+    contains the name of the table until get_table is called, to_front_dto
+    never reads the table.
 
     Attributes:
-        type: Fixed as "dataframe" to identify this as a dataframe message
-        dataframe: The pandas DataFrame object (may be None if not loaded)
+        type: Fixed as "table" to identify this as a table message
+        table: The Table object (None until loaded with get_table)
+        table_name: Name of the table, available without loading the table
 
     Example:
         df_msg = ChatMessageTable(
             role="assistant",
             id="msg_df_123",
-            dataframe=pd.DataFrame({'A': [1, 2], 'B': [3, 4]})
+            table=Table(pd.DataFrame({'A': [1, 2], 'B': [3, 4]}))
         )
     """
 
@@ -35,6 +44,10 @@ class ChatMessageTable(ChatMessageBase):
     role: Literal["assistant"] = "assistant"
     content: str | None = None
     table: Table | None = None
+    table_name: str | None = None
+
+    # file of the table, read on the first call of get_table
+    _table_file_path: str | None = None
 
     class Config:
         arbitrary_types_allowed = True
@@ -42,15 +55,33 @@ class ChatMessageTable(ChatMessageBase):
     def fill_from_model(self, chat_message: "ChatMessageModel") -> None:
         """Fill additional fields from the ChatMessageModel.
         This is called after the initial creation in from_chat_message_model.
+        Only the metadata is read, the table file is read by get_table.
         """
-        file_path = chat_message.get_filepath_if_exists()
-        if file_path:
+        self.table = None
+        self.table_name = (chat_message.data or {}).get("table_name")
+        self._table_file_path = chat_message.get_filepath_if_exists()
+
+    def load_payload(self) -> None:
+        self.get_table()
+
+    def get_table(self) -> Table | None:
+        """Get the table, it is read from the file of the message on the first call.
+
+        :return: The table, None if the file doesn't exist or can't be read
+        :rtype: Table | None
+        """
+        if self.table is None and self._table_file_path:
             try:
-                self.dataframe = pd.read_csv(file_path)
-            except Exception:
-                self.dataframe = None
-        else:
-            self.dataframe = None
+                self.table = Table(read_table_file(self._table_file_path))
+                if self.table_name:
+                    self.table.name = self.table_name
+            except Exception as e:
+                Logger.error(f"Error while reading the table file '{self._table_file_path}': {e}")
+                Logger.log_exception_stack_trace(e)
+                self.table = None
+            # the file is not read again if it failed
+            self._table_file_path = None
+        return self.table
 
     def to_chat_message_model(self, conversation: "ChatConversation") -> "ChatMessageModel":
         """Convert DTO to database ChatMessage model.
@@ -62,25 +93,26 @@ class ChatMessageTable(ChatMessageBase):
         """
         from gws_ai_toolkit.models.chat.chat_message_model import ChatMessageModel
 
+        table_name = self._get_table_name()
         message = ChatMessageModel.build_message(
             conversation=conversation,
             role=self.role,
             type_=self.message_type,
             content=self.content,
             external_id=self.external_id,
-            data={"table_name": self.table.name} if self.table else {},
+            data={"table_name": table_name} if table_name else {},
         )
 
-        # Save dataframe to folder if present
-        if self.dataframe is not None:
+        # Save table to folder if present
+        if self.table is not None:
             self._save_table_to_message(message)
 
         return message
 
     def _save_table_to_message(self, message: "ChatMessageModel") -> None:
-        """Save the DataFrame to the conversation folder and update message filename.
+        """Save the table to the conversation folder and update message filename.
 
-        :param message: The ChatMessage instance to save the dataframe for
+        :param message: The ChatMessage instance to save the table for
         :type message: ChatMessage
         """
         if self.table is None:
@@ -91,21 +123,22 @@ class ChatMessageTable(ChatMessageBase):
         # Ensure folder exists
         os.makedirs(folder_path, exist_ok=True)
 
-        # Generate unique filename
-        filename = f"table_{message.id}.csv"
-        file_path = os.path.join(folder_path, filename)
+        # Generate unique filename, the extension depends on the format of the file
+        file_path = write_table_file(self.table.get_data(), os.path.join(folder_path, f"table_{message.id}"))
 
-        # Save DataFrame as CSV
-        self.table.get_data().to_csv(file_path, index=False)
+        message.filename = os.path.basename(file_path)
 
-        message.filename = filename
+    def _get_table_name(self) -> str | None:
+        if self.table is not None and self.table.name:
+            return self.table.name
+        return self.table_name
 
     def to_front_dto(self) -> ChatMessageBase:
         return ChatMessageTableFront(
             id=self.id,
             content=self.content if self.content else "",
             table_id=self.table.uid if self.table else "",
-            table_name=self.table.name if self.table else "Table",
+            table_name=self._get_table_name() or "Table",
         )
 
 
@@ -115,3 +148,56 @@ class ChatMessageTableFront(ChatMessageBase):
     content: str
     table_id: str
     table_name: str
+
+
+def write_table_file(dataframe: pd.DataFrame, file_path_without_extension: str) -> str:
+    """Write the DataFrame to an Arrow IPC file compressed with zstd (.arrow), or to a CSV file
+    (.csv) if pyarrow is not installed or the DataFrame can't be converted to Arrow.
+
+    The file is written to a temporary file then renamed, a reader never sees a partial file.
+
+    :return: The path of the written file
+    :rtype: str
+    """
+    arrow_table = _dataframe_to_arrow_table(dataframe)
+    if arrow_table is None:
+        file_path = file_path_without_extension + ".csv"
+    else:
+        file_path = file_path_without_extension + ".arrow"
+
+    temp_file_path = file_path + ".tmp"
+    try:
+        if arrow_table is None:
+            dataframe.to_csv(temp_file_path, index=False)
+        else:
+            options = pa.ipc.IpcWriteOptions(compression="zstd")
+            with pa.OSFile(temp_file_path, "wb") as sink:
+                with pa.ipc.new_file(sink, arrow_table.schema, options=options) as writer:
+                    writer.write_table(arrow_table)
+        os.replace(temp_file_path, file_path)
+    finally:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+    return file_path
+
+
+def read_table_file(file_path: str) -> pd.DataFrame:
+    """Read a DataFrame written by write_table_file, the Arrow files are memory mapped so only
+    the buffers of the table are read. The CSV files are read with pandas."""
+    if not file_path.endswith(".arrow"):
+        return pd.read_csv(file_path)
+
+    if pa is None:
+        raise ImportError("pyarrow is required to read the table file " + file_path)
+    with pa.memory_map(file_path, "r") as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def _dataframe_to_arrow_table(dataframe: pd.DataFrame) -> "pa.Table | None":
+    if pa is None:
+        return None
+    try:
+        # the index is not saved, like the CSV files
+        return pa.Table.from_pandas(dataframe, preserve_index=False)
+    except (pa.ArrowException, ValueError, TypeError):
+        return None
@@ -19,6 +19,8 @@ class BaseRagAppService:
 
     # Common constants
     CONSTELLAB_RESOURCE_ID_METADATA_KEY = "constellab_resource_id"
+    # Number of resources sent together when syncing multiple resources
+    SYNC_BATCH_SIZE = 20
 
     def __init__(self, rag_service: BaseRagService, dataset_id: str) -> None:
         self.rag_service = rag_service
@@ -58,25 +60,7 @@ class BaseRagAppService:
             e: _description_
         """
 
-        if rag_resource.is_compatible_with_rag() is False:
-            raise ValueError("The resource is not compatible with Rag.")
-
-        file = rag_resource.get_file()
-
-        rag_uploaded_doc: RagDocument
-        if rag_resource.is_synced_with_rag():
-            # if the resource is already synced with rag, we need to update the document
-            rag_uploaded_doc = self.rag_service.update_document_and_parse(
-                file.path,
-                self.dataset_id,
-                rag_resource.get_and_check_document_id(),
-                upload_options,
-                filename=file.get_name(),
-            )
-        else:
-            rag_uploaded_doc = self.rag_service.upload_document_and_parse(
-                file.path, self.dataset_id, upload_options, filename=file.get_name()
-            )
+        rag_uploaded_doc = self._upload_resource_document(rag_resource, upload_options)
 
         try:
             metadata = self.get_document_metadata_before_sync(rag_resource)
@@ -92,6 +76,100 @@ class BaseRagAppService:
             self.rag_service.delete_document(self.dataset_id, rag_uploaded_doc.id)
             raise e
 
+        self._mark_resource_as_sent_to_rag(rag_resource, rag_uploaded_doc)
+
+    def send_resources_to_rag(
+        self, rag_resources: list[RagResource], upload_options: Any
+    ) -> dict[str, Exception]:
+        """Send multiple resources to the RAG platform.
+
+        Same as send_resource_to_rag but the metadata of all the uploaded documents
+        are updated at once, so the platform can do it in a single call.
+        Use SYNC_BATCH_SIZE to split a large sync in batches.
+
+        Args:
+            rag_resources (list[RagResource]): The resources to send.
+            upload_options (Any): Options for the upload, specific to the RAG platform.
+
+        Returns:
+            dict[str, Exception]: The errors by resource model id, the other resources were sent.
+        """
+        errors: dict[str, Exception] = {}
+
+        uploaded_docs: list[tuple[RagResource, RagDocument]] = []
+        for rag_resource in rag_resources:
+            try:
+                rag_uploaded_doc = self._upload_resource_document(rag_resource, upload_options)
+                uploaded_docs.append((rag_resource, rag_uploaded_doc))
+            except Exception as e:
+                Logger.log_exception_stack_trace(e)
+                errors[rag_resource.resource_model.id] = e
+
+        # the metadata is computed by resource so an error only fails its resource
+        documents_metadata: dict[str, dict[str, str]] = {}
+        metadata_docs: list[tuple[RagResource, RagDocument]] = []
+        for rag_resource, rag_uploaded_doc in uploaded_docs:
+            try:
+                documents_metadata[rag_uploaded_doc.id] = self.get_document_metadata_before_sync(rag_resource)
+                metadata_docs.append((rag_resource, rag_uploaded_doc))
+            except Exception as e:
+                Logger.error(
+                    f"Error while getting metadata for rag object {rag_resource.resource_model.id} after rag upload: {e}"
+                )
+                Logger.log_exception_stack_trace(e)
+                errors[rag_resource.resource_model.id] = e
+                self._delete_uploaded_document(rag_uploaded_doc)
+
+        if not metadata_docs:
+            return errors
+
+        try:
+            self.rag_service.update_documents_metadata(self.dataset_id, documents_metadata)
+        except Exception as e:
+            Logger.error(f"Error while updating metadata of {len(metadata_docs)} rag objects after rag upload: {e}")
+            Logger.log_exception_stack_trace(e)
+            for rag_resource, rag_uploaded_doc in metadata_docs:
+                errors[rag_resource.resource_model.id] = e
+                self._delete_uploaded_document(rag_uploaded_doc)
+            return errors
+
+        for rag_resource, rag_uploaded_doc in metadata_docs:
+            try:
+                self._mark_resource_as_sent_to_rag(rag_resource, rag_uploaded_doc)
+            except Exception as e:
+                errors[rag_resource.resource_model.id] = e
+
+        return errors
+
+    def _delete_uploaded_document(self, rag_uploaded_doc: RagDocument) -> None:
+        """Delete a document uploaded by a failed sync, the errors are only logged."""
+        try:
+            self.rag_service.delete_document(self.dataset_id, rag_uploaded_doc.id)
+        except Exception as delete_error:
+            Logger.log_exception_stack_trace(delete_error)
+
+    def _upload_resource_document(self, rag_resource: RagResource, upload_options: Any) -> RagDocument:
+        """Upload or update the document of the resource in Rag, without the metadata."""
+        if rag_resource.is_compatible_with_rag() is False:
+            raise ValueError("The resource is not compatible with Rag.")
+
+        file = rag_resource.get_file()
+
+        if rag_resource.is_synced_with_rag():
+            # if the resource is already synced with rag, we need to update the document
+            return self.rag_service.update_document_and_parse(
+                file.path,
+                self.dataset_id,
+                rag_resource.get_and_check_document_id(),
+                upload_options,
+                filename=file.get_name(),
+            )
+
+        return self.rag_service.upload_document_and_parse(
+            file.path, self.dataset_id, upload_options, filename=file.get_name()
+        )
+
+    def _mark_resource_as_sent_to_rag(self, rag_resource: RagResource, rag_uploaded_doc: RagDocument) -> None:
         try:
             # Add the Rag document tag to the resource
             rag_resource.mark_resource_as_sent_to_rag(rag_uploaded_doc.id, self.dataset_id)
@@ -130,10 +208,9 @@ class BaseRagAppService:
 
     def get_rag_documents_to_delete(self) -> list[RagDocument]:
         """List all RAG documents that are not in the datahub anymore."""
-        ragflow_documents = self.rag_service.get_all_documents(self.dataset_id)
-
         document_to_delete = []
-        for ragflow_document in ragflow_documents:
+        # iterate while the documents are retrieved to check the first pages during the listing
+        for ragflow_document in self.rag_service.iter_documents(self.dataset_id):
             # Check if the resource is compatible with RagFlow
             ragflow_resource = RagResource.from_document_id(ragflow_document.id)
             if ragflow_resource is None:
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
 from typing import Any
 
 from .rag_credentials import CredentialsDataRag
@@ -36,6 +36,13 @@ class BaseRagService(ABC):
         """Update metadata fields of an existing document in the knowledge base."""
         raise NotImplementedError
 
+    def update_documents_metadata(self, dataset_id: str, documents_metadata: dict[str, dict]) -> None:
+        """Update metadata fields of multiple documents, documents_metadata is the metadata by document id.
+        Override it when the platform can update the metadata of multiple documents in a single call.
+        """
+        for document_id, metadata in documents_metadata.items():
+            self.update_document_metadata(dataset_id, document_id, metadata)
+
     @abstractmethod
     def parse_document(self, dataset_id: str, document_id: str) -> RagDocument:
         """Parse a document in the knowledge base."""
@@ -51,6 +58,12 @@ class BaseRagService(ABC):
         """Get all documents from a knowledge base."""
         raise NotImplementedError
 
+    def iter_documents(self, dataset_id: str) -> Iterator[RagDocument]:
+        """Iterate over all documents of a knowledge base.
+        Override it when the platform can provide the documents before the full list is retrieved.
+        """
+        yield from self.get_all_documents(dataset_id)
+
     @abstractmethod
     def get_document(self, dataset_id: str, document_id: str) -> RagDocument | None:
         """Get a document from the knowledge base."""
@@ -0,0 +1,204 @@
+import json
+import re
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+
+class SseEvent:
+    """A server-sent event decoded by the SseDecoder.
+    The data is kept as a string, the JSON is only decoded on demand.
+    """
+
+    event: str | None
+    data: str
+    id: str | None
+
+    _json: Any
+    _json_loaded: bool
+
+    # Match the "event" key of a JSON payload, used to get the type without decoding the JSON
+    _JSON_EVENT_TYPE_REGEX = re.compile(r'"event"\s*:\s*"([^"]*)"')
+    # Only the beginning of the payload is searched, Dify puts the event key first
+    JSON_EVENT_TYPE_SEARCH_LENGTH = 64
+
+    def __init__(self, data: str, event: str | None = None, id_: str | None = None):
+        self.data = data
+        self.event = event
+        self.id = id_
+        self._json = None
+        self._json_loaded = False
+
+    def get_type(self) -> str | None:
+        """Get the type of the event: the SSE 'event' field if provided, otherwise the
+        'event' key of the JSON payload found without decoding the JSON.
+        """
+        if self.event is not None:
+            return self.event
+
+        match = self._JSON_EVENT_TYPE_REGEX.search(self.data, 0, self.JSON_EVENT_TYPE_SEARCH_LENGTH)
+        if match is None:
+            return None
+        return match.group(1)
+
+    def get_json(self) -> Any:
+        """Decode the data as JSON (decoded once).
+
+        :raises json.JSONDecodeError: if the data is not a valid JSON
+        """
+        if not self._json_loaded:
+            self._json = json.loads(self.data)
+            self._json_loaded = True
+        return self._json
+
+
+class SseDecoder:
+    """Incremental decoder of a server-sent events (SSE) stream.
+
+    The decoder is fed with raw byte chunks as they are received from the network.
+    Events split across chunks are buffered until they are complete, and the
+    bytes are only decoded to text once per complete event (so multi-bytes
+    characters split between 2 chunks are supported).
+
+    Events with a type in `ignored_event_types` (SSE 'event' field or 'event' key at the
+    beginning of the JSON payload) are dropped without decoding their JSON.
+
+    Used by the Dify and RagFlow streaming chats.
+    """
+
+    ignored_event_types: frozenset[str]
+
+    _buffer: bytearray
+    _scan_position: int
+    _pending_cr: bool
+
+    _EVENT_SEPARATOR = b"\n\n"
+
+    def __init__(self, ignored_event_types: Iterable[str] | None = None):
+        self.ignored_event_types = frozenset(ignored_event_types or ())
+        self._buffer = bytearray()
+        self._scan_position = 0
+        self._pending_cr = False
+
+    def feed(self, chunk: bytes) -> list[SseEvent]:
+        """Add a chunk of bytes to the decoder and return the events completed by this chunk.
+
+        :param chunk: raw bytes received from the stream
+        :return: the completed events (ignored events are not returned)
+        """
+        if not chunk:
+            return []
+
+        chunk = self._normalize_line_endings(chunk)
+        self._buffer += chunk
+
+        events: list[SseEvent] = []
+        while True:
+            separator_index = self._buffer.find(self._EVENT_SEPARATOR, self._scan_position)
+            if separator_index == -1:
+                # the separator can start on the last byte of the buffer
+                self._scan_position = max(len(self._buffer) - 1, 0)
+                break
+
+            raw_event = bytes(self._buffer[:separator_index])
+            del self._buffer[: separator_index + len(self._EVENT_SEPARATOR)]
+            self._scan_position = 0
+
+            event = self._parse_event(raw_event)
+            if event is not None:
+                events.append(event)
+
+        return events
+
+    def flush(self) -> list[SseEvent]:
+        """Decode the remaining buffered data at the end of the stream,
+        for streams that don't end with an empty line.
+        """
+        raw_event = bytes(self._buffer)
+        self._buffer = bytearray()
+        self._scan_position = 0
+        self._pending_cr = False
+
+        event = self._parse_event(raw_event.strip(b"\n"))
+        if event is None:
+            return []
+        return [event]
+
+    def iter_events(self, chunks: Iterable[bytes]) -> Iterator[SseEvent]:
+        """Decode a stream of byte chunks (for example requests' iter_content(chunk_size=None))
+        and yield the events as soon as they are complete.
+        """
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.flush()
+
+    def _normalize_line_endings(self, chunk: bytes) -> bytes:
+        """Convert the \\r\\n and \\r line endings to \\n, even when a \\r\\n is split between chunks."""
+        if self._pending_cr:
+            chunk = b"\r" + chunk
+            self._pending_cr = False
+
+        if b"\r" not in chunk:
+            return chunk
+
+        # keep a trailing \r until the next chunk to know if it is followed by \n
+        if chunk.endswith(b"\r"):
+            chunk = chunk[:-1]
+            self._pending_cr = True
+
+        return chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+    def _parse_event(self, raw_event: bytes) -> SseEvent | None:
+        if not raw_event:
+            return None
+
+        # fast path for the most common event: a single data line
+        if raw_event.startswith(b"data:") and b"\n" not in raw_event:
+            event_type = None
+            event_id = None
+            # remove the optional space after the colon
+            data = raw_event[6:] if raw_event.startswith(b"data: ") else raw_event[5:]
+        else:
+            event_type, data, event_id = self._parse_fields(raw_event)
+            if data is None:
+                return None
+
+        if event_type is not None and event_type in self.ignored_event_types:
+            return None
+
+        event = SseEvent(data.decode("utf-8"), event_type, event_id)
+
+        if self.ignored_event_types and event_type is None:
+            json_event_type = event.get_type()
+            if json_event_type is not None and json_event_type in self.ignored_event_types:
+                return None
+
+        return event
+
+    def _parse_fields(self, raw_event: bytes) -> tuple[str | None, bytes | None, str | None]:
+        event_type: str | None = None
+        event_id: str | None = None
+        data_lines: list[bytes] = []
+
+        for line in raw_event.split(b"\n"):
+            # comment line
+            if not line or line.startswith(b":"):
+                continue
+
+            field, _, value = line.partition(b":")
+            if value.startswith(b" "):
+                value = value[1:]
+
+            if field == b"data":
+                data_lines.append(value)
+            elif field == b"event":
+                event_type = value.decode("utf-8")
+            elif field == b"id":
+                event_id = value.decode("utf-8")
+
+        if not data_lines:
+            # event without data (e.g. 'event: ping'), only returned if typed and not ignored
+            if event_type is None:
+                return None, None, event_id
+            return event_type, b"", event_id
+
+        return event_type, b"\n".join(data_lines), event_id
@@ -249,3 +249,19 @@ class DifyGetDatasetMetadataResponse(BaseModelDTO):
 
     doc_metadata: list[DifyGetDatasetMetadataResponseMetadata]
     built_in_field_enabled: bool
+
+
+class DifyEndpointLatency(BaseModelDTO):
+    """Latency counters of a Dify API endpoint."""
+
+    endpoint: str
+    count: int = 0
+    error_count: int = 0
+    total_seconds: float = 0
+    max_seconds: float = 0
+
+    def get_average_seconds(self) -> float:
+        """Get the average duration of a call to the endpoint."""
+        if self.count == 0:
+            return 0
+        return self.total_seconds / self.count
@@ -1,17 +1,25 @@
 import json
+import math
+import threading
+import time
 from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Literal
 
 import requests
 from gws_core import ExternalApiService, FormData, Logger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from gws_ai_toolkit.rag.common.rag_credentials import CredentialsDataDify
+from gws_ai_toolkit.rag.common.sse_decoder import SseDecoder
 from gws_ai_toolkit.rag.dify.dify_class import (
     DifyChunksResponse,
     DifyCreateDatasetMetadataRequest,
     DifyCreateDatasetMetadataResponse,
     DifyDatasetDocument,
     DifyDocumentChunksResponse,
+    DifyEndpointLatency,
     DifyGetDatasetMetadataResponse,
     DifyGetDatasetMetadataResponseMetadata,
     DifyGetDocumentsResponse,
@@ -27,15 +35,82 @@ from gws_ai_toolkit.rag.dify.dify_class import (
 )
 
 
+class DifyRetry(Retry):
+    """Retry policy of the Dify API calls.
+
+    Retries on 429 and 5xx responses with an exponential backoff, and honours
+    the Retry-After header. POST requests are only retried when the server
+    did not process them (429 and 503) to avoid creating twice the same object.
+    """
+
+    RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+    POST_RETRY_STATUS_CODES = frozenset({429, 503})
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method and method.upper() == "POST" and status_code not in self.POST_RETRY_STATUS_CODES:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+
 class DifyService:
-    """Service to interact with Dify API"""
+    """Service to interact with Dify API
+
+    All the requests go through a pooled HTTP session shared by all the DifyService
+    instances with the same base url, so the connections are kept alive between calls
+    (no new TLS handshake per call). Failed calls (429, 5xx) are retried with backoff.
+    """
+
+    DEFAULT_POOL_SIZE = 10
+    DEFAULT_MAX_RETRIES = 3
+    DEFAULT_TIMEOUT = 10
+    RETRY_BACKOFF_FACTOR = 0.5
+    DOCUMENT_PAGE_LIMIT = 100
+    # Events of the chat stream that are not used, they are dropped without decoding the JSON
+    STREAM_IGNORED_EVENT_TYPES = frozenset({
+        "ping",
+        "workflow_started",
+        "workflow_finished",
+        "node_started",
+        "node_finished",
+        "iteration_started",
+        "iteration_next",
+        "iteration_completed",
+        "parallel_branch_started",
+        "parallel_branch_finished",
+        "agent_thought",
+        "message_file",
+        "tts_message",
+        "tts_message_end",
+    })
+    DEFAULT_MAX_CONCURRENT_PAGES = 4
 
     route: str
     api_key: str
+    pool_size: int
+    max_retries: int
+    timeout: float
+
+    # Sessions shared in the process, by base url, pool size and max retries
+    _sessions: dict[tuple[str, int, int], requests.Session] = {}
+    _sessions_lock = threading.Lock()
+
+    # Latency counters shared in the process, by endpoint
+    _latency_stats: dict[str, DifyEndpointLatency] = {}
+    _latency_lock = threading.Lock()
 
-    def __init__(self, route: str, api_key: str):
+    def __init__(
+        self,
+        route: str,
+        api_key: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
         self.route = route
         self.api_key = api_key
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.timeout = timeout
 
     def send_document(
         self, doc_path: str, dataset_id: str, options: DifySendDocumentOptions, filename: str | None = None
@@ -56,7 +131,7 @@ class DifyService:
             route,
             form_data=form_data,
             headers=self._get_http_headers(),
-            timeout=10,
+            timeout=self.timeout,
             raise_exception_if_error=True,
         )
 
@@ -102,7 +177,7 @@ class DifyService:
             route,
             form_data=form_data,
             headers=self._get_http_headers(),
-            timeout=10,
+            timeout=self.timeout,
             raise_exception_if_error=True,
         )
         return DifySendDocumentResponse.from_json(response.json())
@@ -207,8 +282,13 @@ class DifyService:
             "retrieval_model": retrieval_model,
         }
 
-        response = requests.post(
-            route, json=body, headers=self._get_http_headers(content_type=True), timeout=10
+        response = self._request(
+            "search_chunks",
+            "POST",
+            route,
+            json=body,
+            headers=self._get_http_headers(content_type=True),
+            timeout=self.timeout,
         )
 
         response.raise_for_status()
@@ -262,7 +342,14 @@ class DifyService:
         if keyword:
             params["keyword"] = keyword
 
-        response = requests.get(route, params=params, headers=self._get_http_headers(), timeout=10)
+        response = self._request(
+            "get_document_chunks",
+            "GET",
+            route,
+            params=params,
+            headers=self._get_http_headers(),
+            timeout=self.timeout,
+        )
 
         response.raise_for_status()
         response_data = response.json()
@@ -299,7 +386,9 @@ class DifyService:
         route = f"{self.route}/datasets/{dataset_id}/documents/{document_id}/upload-file"
 
         # Get file information
-        response = requests.get(route, headers=self._get_http_headers(), timeout=10)
+        response = self._request(
+            "get_document_file", "GET", route, headers=self._get_http_headers(), timeout=self.timeout
+        )
 
         response.raise_for_status()
         response_data = response.json()
@@ -333,7 +422,14 @@ class DifyService:
 
         params = {"page": page, "limit": limit}
 
-        response = requests.get(route, params=params, headers=self._get_http_headers(), timeout=10)
+        response = self._request(
+            "get_document_page",
+            "GET",
+            route,
+            params=params,
+            headers=self._get_http_headers(),
+            timeout=self.timeout,
+        )
 
         response.raise_for_status()
         return DifyGetDocumentsResponse.from_json(response.json())
@@ -356,18 +452,73 @@ class DifyService:
         requests.exceptions.HTTPError
             If the API request fails
         """
-        documents: list[DifyDatasetDocument] = []
-        page = 1
-        limit = 100
-        while True:
-            response = self.get_document_page(dataset_id, page, limit)
-            documents.extend(response.data)
+        return list(self.iter_documents(dataset_id))
+
+    def iter_documents(
+        self, dataset_id: str, max_workers: int = DEFAULT_MAX_CONCURRENT_PAGES
+    ) -> Generator[DifyDatasetDocument, None, None]:
+        """Iterate over all documents in a dataset.
 
-            if not response.has_more:
-                break
+        The first page is fetched alone to get the total number of documents, the
+        remaining pages are then fetched concurrently (with at most `max_workers`
+        requests at the same time). Documents are yielded in page order as soon as
+        their page is received, so the caller can start working before the full
+        list has arrived.
 
+        Parameters
+        ----------
+        dataset_id : str
+            Knowledge Base ID
+        max_workers : int, optional
+            Maximum number of pages fetched at the same time
+
+        Yields
+        ------
+        DifyDatasetDocument
+            Documents of the dataset
+
+        Raises
+        ------
+        requests.exceptions.HTTPError
+            If the API request fails
+        """
+        limit = self.DOCUMENT_PAGE_LIMIT
+        # documents can move between pages if the dataset is modified during the listing
+        yielded_ids: set[str] = set()
+
+        def _new_documents(response: DifyGetDocumentsResponse) -> list[DifyDatasetDocument]:
+            documents = [doc for doc in response.data if doc.id not in yielded_ids]
+            yielded_ids.update(doc.id for doc in documents)
+            return documents
+
+        first_page = self.get_document_page(dataset_id, 1, limit)
+        yield from _new_documents(first_page)
+
+        if not first_page.has_more:
+            return
+
+        page_count = max(math.ceil(first_page.total / limit), 2)
+        last_page = first_page
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, page_count - 1)))
+        try:
+            futures = [
+                executor.submit(self.get_document_page, dataset_id, page, limit)
+                for page in range(2, page_count + 1)
+            ]
+            for future in futures:
+                last_page = future.result()
+                yield from _new_documents(last_page)
+        finally:
+            # cancel the pending pages if the caller stopped the iteration or on error
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        # documents were added since the first page, read the remaining pages sequentially
+        page = page_count
+        while last_page.has_more:
             page += 1
-        return documents
+            last_page = self.get_document_page(dataset_id, page, limit)
+            yield from _new_documents(last_page)
 
     def get_document(self, dataset_id: str, document_id: str) -> DifyDatasetDocument | None:
         """Get a single document from a dataset.
@@ -392,7 +543,9 @@ class DifyService:
         route = f"{self.route}/datasets/{dataset_id}/documents/{document_id}"
 
         try:
-            response = requests.get(route, headers=self._get_http_headers(), timeout=10)
+            response = self._request(
+                "get_document", "GET", route, headers=self._get_http_headers(), timeout=self.timeout
+            )
 
             if response.status_code == 404:
                 return None
@@ -425,7 +578,9 @@ class DifyService:
         """
         route = f"{self.route}/datasets/{dataset_id}/documents/{document_id}"
 
-        response = requests.delete(route, headers=self._get_http_headers(), timeout=10)
+        response = self._request(
+            "delete_document", "DELETE", route, headers=self._get_http_headers(), timeout=self.timeout
+        )
 
         response.raise_for_status()
 
@@ -472,7 +627,9 @@ class DifyService:
         dify_response = DifySendEndMessageStreamResponse(conversation_id=None, sources=[])
 
         try:
-            with requests.post(
+            with self._request(
+                "send_message_stream",
+                "POST",
                 url,
                 headers=self._get_http_headers(content_type=True),
                 json=data,
@@ -480,61 +637,50 @@ class DifyService:
                 timeout=30,
             ) as response:
                 response.raise_for_status()
-                buffer = ""
-
-                for chunk in response.iter_content(chunk_size=1):
-                    if chunk:
-                        chunk_str = chunk.decode("utf-8")
-                        buffer += chunk_str
-
-                        if buffer.endswith("\n") and buffer.strip():
-                            try:
-                                line = buffer.strip()
-                                if line.startswith("data: "):
-                                    line = line[6:]  # Remove 'data: ' prefix
-                                    if line == "[DONE]":
-                                        break
-
-                                    json_data = json.loads(line)
-                                    # Update conversation_id in response object
-                                    dify_response.conversation_id = json_data["conversation_id"]
-
-                                    if "event" in json_data and json_data["event"] == "message":
-                                        # Yield message response for streaming text
-                                        if "answer" in json_data:
-                                            message_response = DifySendMessageStreamResponse(
-                                                id=json_data["id"],
-                                                answer=json_data["answer"],
-                                                conversation_id=dify_response.conversation_id,
-                                            )
-                                            yield message_response
-
-                                    if "event" in json_data and json_data["event"] == "message_end":
-                                        # Process sources if available
-                                        if (
-                                            "metadata" in json_data
-                                            and "retriever_resources" in json_data["metadata"]
-                                        ):
-                                            for source in json_data["metadata"][
-                                                "retriever_resources"
-                                            ]:
-                                                dify_response.sources.append(
-                                                    DifySendMessageSource(
-                                                        dataset_id=source["dataset_id"],
-                                                        dataset_name=source["dataset_name"],
-                                                        document_id=source["document_id"],
-                                                        document_name=source["document_name"],
-                                                        data_source_type="upload_file",
-                                                        retriever_from="api",
-                                                        score=source["score"],
-                                                    )
-                                                )
-
-                                        # Yield final response with metadata
-                                        yield dify_response
-                            except json.JSONDecodeError:
-                                pass
-                            buffer = ""
+
+                decoder = SseDecoder(ignored_event_types=self.STREAM_IGNORED_EVENT_TYPES)
+                for sse_event in decoder.iter_events(response.iter_content(chunk_size=None)):
+                    if sse_event.data == "[DONE]":
+                        break
+
+                    try:
+                        json_data = sse_event.get_json()
+                    except json.JSONDecodeError:
+                        continue
+
+                    # Update conversation_id in response object
+                    dify_response.conversation_id = json_data.get(
+                        "conversation_id", dify_response.conversation_id
+                    )
+                    event_type = json_data.get("event")
+
+                    if event_type == "message":
+                        # Yield message response for streaming text
+                        if "answer" in json_data:
+                            yield DifySendMessageStreamResponse(
+                                id=json_data["id"],
+                                answer=json_data["answer"],
+                                conversation_id=dify_response.conversation_id,
+                            )
+
+                    elif event_type == "message_end":
+                        # Process sources if available
+                        metadata = json_data.get("metadata") or {}
+                        for source in metadata.get("retriever_resources", []):
+                            dify_response.sources.append(
+                                DifySendMessageSource(
+                                    dataset_id=source["dataset_id"],
+                                    dataset_name=source["dataset_name"],
+                                    document_id=source["document_id"],
+                                    document_name=source["document_name"],
+                                    data_source_type="upload_file",
+                                    retriever_from="api",
+                                    score=source["score"],
+                                )
+                            )
+
+                        # Yield final response with metadata
+                        yield dify_response
 
         except requests.exceptions.RequestException as e:
             raise RuntimeError(f"Error calling Dify API: {str(e)}") from e
@@ -557,8 +703,13 @@ class DifyService:
             If the API request fails
         """
         route = f"{self.route}/datasets/{dataset_id}/metadata"
-        response = requests.post(
-            route, json=metadata.to_json_dict(), headers=self._get_http_headers(), timeout=30
+        response = self._request(
+            "create_dataset_metadata",
+            "POST",
+            route,
+            json=metadata.to_json_dict(),
+            headers=self._get_http_headers(),
+            timeout=30,
         )
         response.raise_for_status()
         return DifyCreateDatasetMetadataResponse.from_json(response.json())
@@ -575,7 +726,9 @@ class DifyService:
             If the API request fails
         """
         route = f"{self.route}/datasets/{dataset_id}/metadata"
-        response = requests.get(route, headers=self._get_http_headers(), timeout=30)
+        response = self._request(
+            "get_dataset_all_metadata", "GET", route, headers=self._get_http_headers(), timeout=30
+        )
         response.raise_for_status()
         return DifyGetDatasetMetadataResponse.from_json(response.json())
 
@@ -644,7 +797,9 @@ class DifyService:
         """
         route = f"{self.route}/datasets/{dataset_id}/documents/metadata"
 
-        response = requests.post(
+        response = self._request(
+            "update_document_metadata",
+            "POST",
             route,
             json={"operation_data": DifyUpdateDocumentsMetadataRequest.to_json_list(body)},
             headers=self._get_http_headers(content_type=True),
@@ -653,6 +808,96 @@ class DifyService:
 
         response.raise_for_status()
 
+    ################################### HTTP ###################################
+
+    def _request(self, endpoint: str, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request with the shared session and record the endpoint latency.
+        For streamed requests, the latency is the time to receive the response headers.
+
+        Parameters
+        ----------
+        endpoint : str
+            Name of the endpoint, used for the latency counters
+        method : str
+            HTTP method
+        url : str
+            Url of the request
+        **kwargs
+            Additional arguments passed to requests.Session.request
+        """
+        start = time.perf_counter()
+        has_error = False
+        try:
+            response = self._get_session().request(method, url, **kwargs)
+            has_error = response.status_code >= 400
+            return response
+        except Exception:
+            has_error = True
+            raise
+        finally:
+            self._record_latency(endpoint, time.perf_counter() - start, has_error)
+
+    def _get_session(self) -> requests.Session:
+        """Get the pooled session shared by the services with the same base url."""
+        key = (self.get_base_url(), self.pool_size, self.max_retries)
+        session = DifyService._sessions.get(key)
+        if session is not None:
+            return session
+
+        with DifyService._sessions_lock:
+            session = DifyService._sessions.get(key)
+            if session is None:
+                session = self._create_session()
+                DifyService._sessions[key] = session
+            return session
+
+    def _create_session(self) -> requests.Session:
+        retry = DifyRetry(
+            total=self.max_retries,
+            read=0,
+            backoff_factor=self.RETRY_BACKOFF_FACTOR,
+            status_forcelist=DifyRetry.RETRY_STATUS_CODES,
+            allowed_methods=None,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @classmethod
+    def _record_latency(cls, endpoint: str, duration: float, has_error: bool) -> None:
+        with cls._latency_lock:
+            stats = cls._latency_stats.get(endpoint)
+            if stats is None:
+                stats = DifyEndpointLatency(endpoint=endpoint)
+                cls._latency_stats[endpoint] = stats
+
+            stats.count += 1
+            stats.total_seconds += duration
+            stats.max_seconds = max(stats.max_seconds, duration)
+            if has_error:
+                stats.error_count += 1
+
+    @classmethod
+    def get_latency_stats(cls) -> dict[str, DifyEndpointLatency]:
+        """Get a copy of the latency counters of the Dify endpoints (since start or last reset)."""
+        with cls._latency_lock:
+            return {
+                endpoint: stats.model_copy() for endpoint, stats in cls._latency_stats.items()
+            }
+
+    @classmethod
+    def reset_latency_stats(cls) -> None:
+        """Reset the latency counters of the Dify endpoints."""
+        with cls._latency_lock:
+            cls._latency_stats = {}
+
     def _get_http_headers(self, content_type: bool = False) -> dict[str, str]:
         """Get the HTTP headers for the Dify API requests.
 
@@ -1,6 +1,8 @@
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
 from typing import Any
 
+from gws_core import Logger
+
 from gws_ai_toolkit.rag.common.base_rag_service import BaseRagService
 from gws_ai_toolkit.rag.common.rag_credentials import CredentialsDataRag
 from gws_ai_toolkit.rag.common.rag_models import (
@@ -12,6 +14,7 @@ from gws_ai_toolkit.rag.common.rag_models import (
 
 from .dify_class import (
     DifyChunkRecord,
+    DifyCreateDatasetMetadataRequest,
     DifyDatasetDocument,
     DifyMetadata,
     DifySendDocumentOptions,
@@ -26,9 +29,16 @@ from .dify_service import DifyService
 class RagDifyService(BaseRagService):
     """RAG service implementation for Dify that uses DifyService internally."""
 
+    # Maximum number of documents in a single metadata update request
+    METADATA_UPDATE_BATCH_SIZE = 50
+
+    # Ids of the dataset metadata fields by name, by dataset id
+    _dataset_metadata_ids: dict[str, dict[str, str]]
+
     def __init__(self, route: str, api_key: str):
         super().__init__(route, api_key)
         self._dify_service = DifyService(route, api_key)
+        self._dataset_metadata_ids = {}
 
     # Helper methods to convert Dify models to Rag models
     def _convert_to_rag_document(self, dify_doc: DifyDatasetDocument) -> RagDocument:
@@ -81,15 +91,65 @@ class RagDifyService(BaseRagService):
         return self._convert_to_rag_document(response.document)
 
     def update_document_metadata(self, dataset_id: str, document_id: str, metadata: dict) -> None:
-        options = DifyUpdateDocumentsMetadataRequest(document_id=document_id, metadata_list=[])
+        self.update_documents_metadata(dataset_id, {document_id: metadata})
+
+    def update_documents_metadata(self, dataset_id: str, documents_metadata: dict[str, dict]) -> None:
+        """Update the metadata of multiple documents with one Dify request per batch of documents.
+        The ids of the dataset metadata fields are cached by the service.
+        """
+        metadata_names = {key for metadata in documents_metadata.values() for key in metadata}
+        metadata_ids = self._get_dataset_metadata_ids(dataset_id, metadata_names)
+
+        requests_body = [
+            DifyUpdateDocumentsMetadataRequest(
+                document_id=document_id,
+                metadata_list=[
+                    DifyMetadata(id=metadata_ids[key], value=value, name=key)
+                    for key, value in metadata.items()
+                ],
+            )
+            for document_id, metadata in documents_metadata.items()
+        ]
+
+        try:
+            for i in range(0, len(requests_body), self.METADATA_UPDATE_BATCH_SIZE):
+                self._dify_service.update_document_metadata(
+                    dataset_id, requests_body[i: i + self.METADATA_UPDATE_BATCH_SIZE]
+                )
+        except Exception:
+            # the metadata fields may have been modified in Dify, reload them on next call
+            self._dataset_metadata_ids.pop(dataset_id, None)
+            raise
+
+    def _get_dataset_metadata_ids(self, dataset_id: str, metadata_names: set[str]) -> dict[str, str]:
+        """Get the ids of the dataset metadata fields by name, the missing fields are created."""
+        metadata_ids = self._dataset_metadata_ids.get(dataset_id)
+
+        if metadata_ids is None or not metadata_names.issubset(metadata_ids):
+            metadata_ids = self._load_dataset_metadata_ids(dataset_id)
+
+        missing_names = metadata_names - metadata_ids.keys()
+        if missing_names:
+            for name in missing_names:
+                Logger.info(f"The {name} metadata does not exist in dify. Creating it.")
+                self._dify_service.create_dataset_metadata(
+                    dataset_id, DifyCreateDatasetMetadataRequest(type="string", name=name)
+                )
 
-        for key, value in metadata.items():
-            # retrieve metadata id from dify
-            metadata = self.dify_service.get_or_create_dataset_metadata(dataset_id, key)
+            metadata_ids = self._load_dataset_metadata_ids(dataset_id)
+            missing_names = metadata_names - metadata_ids.keys()
+            if missing_names:
+                raise ValueError(
+                    f"The {', '.join(missing_names)} metadata could not be created in dify in dataset : {dataset_id}."
+                )
 
-            options.metadata_list.append(DifyMetadata(id=metadata.id, value=value, name=key))
+        return metadata_ids
 
-        self._dify_service.update_document_metadata(dataset_id, [options])
+    def _load_dataset_metadata_ids(self, dataset_id: str) -> dict[str, str]:
+        dataset_metadata = self._dify_service.get_dataset_all_metadata(dataset_id)
+        metadata_ids = {metadata.name: metadata.id for metadata in dataset_metadata.doc_metadata}
+        self._dataset_metadata_ids[dataset_id] = metadata_ids
+        return metadata_ids
 
     def parse_document(self, dataset_id: str, document_id: str) -> RagDocument:
         raise NotImplementedError("Dify does not support re-parsing documents directly.")
@@ -100,8 +160,12 @@ class RagDifyService(BaseRagService):
 
     def get_all_documents(self, dataset_id: str) -> list[RagDocument]:
         """Get all documents from a knowledge base."""
-        dify_documents = self._dify_service.get_all_documents(dataset_id)
-        return [self._convert_to_rag_document(doc) for doc in dify_documents]
+        return list(self.iter_documents(dataset_id))
+
+    def iter_documents(self, dataset_id: str) -> Iterator[RagDocument]:
+        """Iterate over the documents of a knowledge base while the pages are fetched."""
+        for dify_document in self._dify_service.iter_documents(dataset_id):
+            yield self._convert_to_rag_document(dify_document)
 
     def get_document(self, dataset_id: str, document_id: str) -> RagDocument | None:
         """Get a document from the knowledge base."""
@@ -1,6 +1,10 @@
+import itertools
+import json
 from collections.abc import Generator
 
+import requests
 from gws_ai_toolkit.rag.common.rag_credentials import CredentialsDataRagflow
+from gws_ai_toolkit.rag.common.sse_decoder import SseDecoder
 from gws_ai_toolkit.rag.ragflow.ragflow_class import (
     RagflowAskStreamResponse,
     RagFlowCreateChatRequest,
@@ -16,6 +20,9 @@ from ragflow_sdk import Chat, Chunk, DataSet, Document, RAGFlow, Session
 class RagFlowService:
     """Service to interact with RagFlow using the Python SDK"""
 
+    # Timeout in seconds to connect and between 2 chunks of a streamed answer
+    STREAM_TIMEOUT = 60
+
     _client: RAGFlow | None  # RagFlow client instance
     base_url: str
     api_key: str
@@ -547,18 +554,67 @@ class RagFlowService:
             if not session:
                 session = chat.create_session(name=query)
 
-            # Ask question with streaming - return raw SDK responses
-            for answer in session.ask(question=query, stream=True):
-                yield RagflowAskStreamResponse(
-                    content=answer.content,
-                    role=answer.role,
-                    reference=answer.reference,
-                    session_id=session.id,
-                )
+            # Ask question with streaming. The completion endpoint is read directly with the
+            # incremental SSE decoder instead of the SDK line parser.
+            response = requests.post(
+                f"{self._get_client().api_url}/chats/{chat_id}/completions",
+                json={"question": query, "stream": True, "session_id": session.id},
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                stream=True,
+                timeout=self.STREAM_TIMEOUT,
+            )
+            with response:
+                response.raise_for_status()
+                yield from self._read_ask_stream(response, session.id)
 
         except Exception as e:
             raise RuntimeError(f"Error asking question: {str(e)}") from e
 
+    def _read_ask_stream(
+        self, response: requests.Response, session_id: str
+    ) -> Generator[RagflowAskStreamResponse, None, None]:
+        """Read the answer chunks of a streamed completion response.
+
+        Raises a RuntimeError if RagFlow answers with an error: a JSON body instead of
+        an event stream (e.g. chat not found) or an event with a non-zero code.
+        """
+        chunks = response.iter_content(chunk_size=None)
+        first_chunk = next((chunk for chunk in chunks if chunk.strip()), b"")
+        if first_chunk.lstrip().startswith(b"{"):
+            # errors are returned as a plain JSON body, not as an event stream
+            body = first_chunk + b"".join(chunks)
+            try:
+                json_data = json.loads(body)
+            except ValueError:
+                json_data = {}
+            message = json_data.get("message") if isinstance(json_data, dict) else None
+            raise RuntimeError(message or f"Unexpected RagFlow response: {body[:200]!r}")
+
+        for sse_event in SseDecoder().iter_events(itertools.chain([first_chunk], chunks)):
+            try:
+                json_data = sse_event.get_json()
+            except json.JSONDecodeError:
+                continue
+
+            if json_data.get("code", 0) != 0:
+                raise RuntimeError(json_data.get("message") or "Unknown RagFlow error")
+
+            data = json_data.get("data")
+            # the last event of the stream has 'data' set to true
+            if data is True:
+                break
+            # the reasoning markers have no answer, they are skipped like in the SDK
+            if not isinstance(data, dict) or data.get("start_to_think") or data.get("end_to_think"):
+                continue
+
+            reference = data.get("reference")
+            yield RagflowAskStreamResponse(
+                content=data.get("answer", ""),
+                role="assistant",
+                reference=reference.get("chunks") if isinstance(reference, dict) else None,
+                session_id=session_id,
+            )
+
     @staticmethod
     def from_credentials(credentials: CredentialsDataRagflow):
         """Create RagFlowService from credentials.
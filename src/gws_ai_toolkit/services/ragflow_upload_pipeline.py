@@ -0,0 +1,435 @@
+"""Pipeline used to upload lab resources to a RagFlow dataset."""
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from gws_ai_toolkit.rag.common.rag_resource import RagResource
+from gws_ai_toolkit.rag.common.tag_rag_app_service import TagRagAppService
+from gws_ai_toolkit.rag.ragflow.ragflow_service import RagFlowService
+from gws_core import ResourceModel
+
+
+@dataclass
+class RagFlowUploadJob:
+    """Upload prepared on the caller thread and executed by the pipeline worker."""
+
+    rag_resource: RagResource
+    file_name: str
+    file_path: str
+    upload_file_name: str
+    is_updating: bool
+    old_document_id: str | None
+
+
+class RagFlowUploadPipeline:
+    """
+    Upload resources to a RagFlow dataset and mark them with the RAG sync tags.
+
+    The pipeline can be used synchronously with `upload_resource`, or in streaming
+    mode with `start`, `submit` and `close`. In streaming mode, the HTTP calls
+    (delete of the old document, upload and parsing) run in a worker thread that
+    consumes a bounded queue, so uploads overlap with the producer (for example a
+    download task). All the database operations (tag checks and sync tags) stay on
+    the caller thread.
+
+    Logs are sent to the optional logger (usually the running Task). The logs of the
+    worker thread are queued and sent from the caller thread, when the results are
+    applied.
+    """
+
+    STOP_SIGNAL = None
+
+    ragflow_service: RagFlowService
+    dataset_id: str
+    max_errors: int
+    queue_size: int
+    logger: Any
+
+    uploaded: list[dict]
+    skipped: list[dict]
+    failed: list[dict]
+
+    _job_queue: "queue.Queue[RagFlowUploadJob | None]"
+    _result_queue: "queue.Queue[tuple[RagFlowUploadJob, Any, Exception | None]]"
+    _log_queue: "queue.Queue[tuple[str, str]]"
+    _worker: threading.Thread | None
+    _submitted_ids: set[str]
+
+    def __init__(
+        self,
+        ragflow_service: RagFlowService,
+        dataset_id: str,
+        max_errors: int = 10,
+        queue_size: int = 10,
+        logger=None,
+    ):
+        self.ragflow_service = ragflow_service
+        self.dataset_id = dataset_id
+        self.max_errors = max_errors
+        self.queue_size = queue_size
+        self.logger = logger
+
+        self.uploaded = []
+        self.skipped = []
+        self.failed = []
+
+        self._job_queue = queue.Queue(maxsize=queue_size)
+        self._result_queue = queue.Queue()
+        self._log_queue = queue.Queue()
+        self._worker = None
+        self._submitted_ids = set()
+
+    ################################## SYNC MODE ##################################
+
+    def upload_resource(self, resource_model: ResourceModel) -> dict:
+        """
+        Upload a single resource and wait for the result. The result is also
+        stored in the pipeline results.
+
+        :param resource_model: The resource model to upload.
+        :return: Result with status ('uploaded', 'skipped' or 'failed') and data.
+        """
+        result = self._upload_resource(resource_model)
+        self._store_result(result)
+        return result
+
+    def _upload_resource(self, resource_model: ResourceModel) -> dict:
+        job_or_result = self._prepare_job(resource_model)
+        if not isinstance(job_or_result, RagFlowUploadJob):
+            return job_or_result
+
+        try:
+            uploaded_doc = self._execute_job(job_or_result)
+        except Exception as e:
+            job_or_result.rag_resource.clear_tmp_dir()
+            return {"status": "failed", "data": self._create_failure_result(resource_model, str(e))}
+
+        return self._finalize_job(job_or_result, uploaded_doc)
+
+    ################################## STREAMING MODE ##################################
+
+    def start(self) -> None:
+        """Start the upload worker thread."""
+        if self._worker is not None:
+            raise Exception("The upload pipeline is already started")
+
+        self._worker = threading.Thread(target=self._run_worker, name="ragflow-upload-pipeline", daemon=True)
+        self._worker.start()
+
+    def submit(self, resource_model: ResourceModel) -> None:
+        """
+        Submit a resource to the pipeline. The checks are done immediately and the
+        upload is queued. Blocks when the queue is full, so the producer can't get
+        ahead of the uploads by more than `queue_size` files.
+
+        :param resource_model: The resource model to upload.
+        """
+        if self._worker is None:
+            raise Exception("The upload pipeline is not started")
+
+        # the same resource can be provided twice (e.g. shared documentation)
+        if resource_model.id in self._submitted_ids:
+            return
+        self._submitted_ids.add(resource_model.id)
+
+        self._drain_results()
+
+        if self.max_errors_reached():
+            return
+
+        job_or_result = self._prepare_job(resource_model)
+        if not isinstance(job_or_result, RagFlowUploadJob):
+            self._store_result(job_or_result)
+            return
+
+        self._job_queue.put(job_or_result)
+
+    def close(self) -> dict[str, list[dict]]:
+        """
+        Wait for all the queued uploads to finish and stop the worker.
+
+        :return: Upload results with uploaded, skipped and failed lists.
+        """
+        if self._worker is not None:
+            self._job_queue.put(self.STOP_SIGNAL)
+            self._worker.join()
+            self._worker = None
+
+        self._drain_results()
+        return self.get_results()
+
+    def _run_worker(self) -> None:
+        while True:
+            job = self._job_queue.get()
+            if job is self.STOP_SIGNAL:
+                return
+
+            try:
+                uploaded_doc = self._execute_job(job)
+                self._result_queue.put((job, uploaded_doc, None))
+            except Exception as e:
+                self._result_queue.put((job, None, e))
+
+    def _drain_results(self) -> None:
+        """Apply the results of the finished uploads on the caller thread."""
+        while True:
+            try:
+                job, uploaded_doc, error = self._result_queue.get_nowait()
+            except queue.Empty:
+                # logs of the upload in progress
+                self._emit_worker_logs()
+                return
+
+            # the logs of the job are queued before its result
+            self._emit_worker_logs()
+
+            if error is not None:
+                job.rag_resource.clear_tmp_dir()
+                self._store_result({
+                    "status": "failed",
+                    "data": self._create_failure_result(job.rag_resource.resource_model, str(error)),
+                })
+                continue
+
+            try:
+                self._store_result(self._finalize_job(job, uploaded_doc))
+            except Exception as e:
+                self._store_result({
+                    "status": "failed",
+                    "data": self._create_failure_result(job.rag_resource.resource_model, str(e)),
+                })
+
+    ################################## COMMON ##################################
+
+    def get_results(self) -> dict[str, list[dict]]:
+        """Get the upload results."""
+        return {"uploaded": self.uploaded, "skipped": self.skipped, "failed": self.failed}
+
+    def max_errors_reached(self) -> bool:
+        """Check if the maximum number of errors was reached."""
+        return len(self.failed) >= self.max_errors
+
+    def _store_result(self, result: dict) -> None:
+        if result["status"] == "uploaded":
+            self.uploaded.append(result["data"])
+        elif result["status"] == "skipped":
+            self.skipped.append(result["data"])
+        elif result["status"] == "failed":
+            self.failed.append(result["data"])
+
+    def _prepare_job(self, resource_model: ResourceModel) -> RagFlowUploadJob | dict:
+        """
+        Check the resource and prepare the upload. Must be called on the caller thread.
+
+        :return: The upload job, or a result dict if the resource does not need to be uploaded.
+        """
+        try:
+            file_resource = resource_model.get_resource()
+            file_name = file_resource.name or resource_model.id
+
+            rag_resource = RagResource(resource_model)
+
+            # Check if already synced and up-to-date
+            if rag_resource.is_synced_with_rag() and rag_resource.is_up_to_date_in_rag():
+                self._log_info(f"Skipping '{file_name}' - already synced and up-to-date")
+                return {
+                    "status": "skipped",
+                    "data": {
+                        "resource_id": resource_model.id,
+                        "resource_name": file_name,
+                        "reason": "already_synced",
+                    },
+                }
+
+            # Check compatibility
+            if not rag_resource.is_compatible_with_rag():
+                self._log_warning(
+                    f"Skipping '{file_name}' - not compatible with RagFlow. "
+                    f"Supported formats: {RagResource.SUPPORTED_FILE_EXTENSIONS}, "
+                    f"Max size: {RagResource.MAX_FILE_SIZE_MB} MB"
+                )
+                return {
+                    "status": "skipped",
+                    "data": {
+                        "resource_id": resource_model.id,
+                        "resource_name": file_name,
+                        "reason": "incompatible",
+                    },
+                }
+
+            # Determine if updating or new upload
+            is_updating = rag_resource.is_synced_with_rag() and not rag_resource.is_up_to_date_in_rag()
+            old_document_id = rag_resource.get_document_id() if is_updating else None
+
+            if is_updating:
+                self._log_info(f"Updating '{file_name}' - file has been modified since last sync")
+
+            file = rag_resource.get_file()
+
+            return RagFlowUploadJob(
+                rag_resource=rag_resource,
+                file_name=file_name,
+                file_path=file.path,
+                upload_file_name=file.get_name(),
+                is_updating=is_updating,
+                old_document_id=old_document_id,
+            )
+        except Exception as e:
+            return {"status": "failed", "data": self._create_failure_result(resource_model, str(e))}
+
+    def _execute_job(self, job: RagFlowUploadJob):
+        """
+        Execute the RagFlow calls of an upload. Only HTTP calls are made here
+        so this can safely run in the worker thread.
+
+        :return: The uploaded RagFlow document.
+        """
+        # If updating, delete the old document first
+        if job.is_updating and job.old_document_id:
+            try:
+                self._log_info(f"Deleting old RagFlow document {job.old_document_id} for '{job.file_name}'...")
+                self.ragflow_service.delete_document(self.dataset_id, job.old_document_id)
+            except Exception as e:
+                self._log_warning(
+                    f"Could not delete old document {job.old_document_id}: {str(e)}. Proceeding with upload..."
+                )
+
+        # Upload document to RagFlow (new or replacement)
+        action = "Updating" if job.is_updating else "Uploading"
+        self._log_info(f"{action} '{job.file_name}' to RagFlow...")
+
+        uploaded_doc = self.ragflow_service.upload_document(
+            doc_paths=job.file_path,
+            dataset_id=self.dataset_id,
+            filename=job.upload_file_name,
+        )
+
+        # Parse the document
+        self._log_info(f"Parsing document '{job.file_name}' in RagFlow...")
+        self.ragflow_service.parse_documents(self.dataset_id, [uploaded_doc.id])
+
+        return uploaded_doc
+
+    def _finalize_job(self, job: RagFlowUploadJob, uploaded_doc) -> dict:
+        """Mark the resource as sent to RAG. Must be called on the caller thread."""
+        job.rag_resource.mark_resource_as_sent_to_rag(uploaded_doc.id, self.dataset_id)
+        job.rag_resource.clear_tmp_dir()
+
+        success_msg = f"Successfully {'updated' if job.is_updating else 'uploaded'} '{job.file_name}'"
+        if job.is_updating:
+            success_msg += f" (old doc: {job.old_document_id}, new doc: {uploaded_doc.id})"
+        self._log_success(success_msg)
+
+        return {
+            "status": "uploaded",
+            "data": {
+                "resource_id": job.rag_resource.get_id(),
+                "resource_name": job.file_name,
+                "ragflow_document_id": uploaded_doc.id,
+                "was_update": job.is_updating,
+            },
+        }
+
+    def _create_failure_result(self, resource_model: ResourceModel, error_msg: str) -> dict:
+        """Create a failure result dict."""
+        file_name = "Unknown"
+        try:
+            file_name = resource_model.get_resource().name or resource_model.id
+        except Exception:
+            pass
+
+        self._log_error(f"Failed to upload '{file_name}': {error_msg}")
+
+        return {
+            "resource_id": resource_model.id,
+            "resource_name": file_name,
+            "error": error_msg,
+        }
+
+    ################################## DELETIONS ##################################
+
+    def delete_marked_resources(self, tag_rag_service: TagRagAppService) -> list[dict]:
+        """
+        Delete from RagFlow and from the lab the resources marked for deletion.
+
+        :param tag_rag_service: The tag RAG service used to find the resources.
+        :return: List of deleted resource results.
+        """
+        deleted_results = []
+
+        # Get resources marked for deletion
+        resources_to_delete = tag_rag_service.get_resources_marked_for_deletion()
+
+        if not resources_to_delete:
+            return deleted_results
+
+        self._log_info(f"Found {len(resources_to_delete)} resource(s) marked for deletion")
+
+        for resource_model in resources_to_delete:
+            try:
+                file_resource = resource_model.get_resource()
+                file_name = file_resource.name or resource_model.id
+
+                self._log_info(f"Deleting '{file_name}' - marked for deletion (no longer exists in Community)")
+
+                # Use service method to handle deletion
+                deletion_result = tag_rag_service.delete_resource_from_rag_and_lab(
+                    resource_model, self.ragflow_service, self.dataset_id
+                )
+
+                deleted_results.append(deletion_result)
+
+                if deletion_result["deleted_from_lab"]:
+                    self._log_success(f"Deleted '{file_name}' from RagFlow and lab")
+                else:
+                    self._log_warning(
+                        f"Failed to delete '{file_name}': {deletion_result.get('error', 'Unknown error')}"
+                    )
+
+            except Exception as e:
+                self._log_error(f"Error processing deletion: {str(e)}")
+                deleted_results.append({
+                    "resource_id": resource_model.id,
+                    "resource_name": "Unknown",
+                    "deleted_from_rag": False,
+                    "deleted_from_lab": False,
+                    "error": str(e),
+                })
+
+        return deleted_results
+
+    ################################## LOGS ##################################
+
+    def _log_info(self, message: str) -> None:
+        self._log("log_info_message", message)
+
+    def _log_success(self, message: str) -> None:
+        self._log("log_success_message", message)
+
+    def _log_warning(self, message: str) -> None:
+        self._log("log_warning_message", message)
+
+    def _log_error(self, message: str) -> None:
+        self._log("log_error_message", message)
+
+    def _log(self, method_name: str, message: str) -> None:
+        if not self.logger:
+            return
+
+        # the logger (usually the Task) is only used from the caller thread
+        if self._worker is not None and threading.current_thread() is self._worker:
+            self._log_queue.put((method_name, message))
+            return
+
+        getattr(self.logger, method_name)(message)
+
+    def _emit_worker_logs(self) -> None:
+        """Send the logs queued by the worker thread. Must be called on the caller thread."""
+        while True:
+            try:
+                method_name, message = self._log_queue.get_nowait()
+            except queue.Empty:
+                return
+            getattr(self.logger, method_name)(message)
@@ -0,0 +1,193 @@
+from gws_ai_toolkit.rag.common.rag_credentials import CredentialsDataRagflow
+from gws_ai_toolkit.rag.common.tag_rag_app_service import TagRagAppService
+from gws_ai_toolkit.rag.ragflow.ragflow_service import RagFlowService
+from gws_ai_toolkit.services.community_resource_files_manager_service import (
+    CommunityResourceFilesManagerService,
+)
+from gws_ai_toolkit.services.ragflow_upload_pipeline import RagFlowUploadPipeline
+from gws_ai_toolkit.tasks.download_bricks_documentation import DownloadBricksDocumentation
+from gws_ai_toolkit.tasks.download_community_stories import DownloadCommunityStories
+from gws_core import (
+    BoolParam,
+    ConfigParams,
+    ConfigSpecs,
+    CredentialsParam,
+    IntParam,
+    JSONDict,
+    ListParam,
+    OutputSpec,
+    OutputSpecs,
+    ResourceModel,
+    Scenario,
+    StrParam,
+    TaskInputs,
+    TaskModel,
+    TaskOutputs,
+    task_decorator,
+)
+
+
+@task_decorator(
+    "DownloadAndPushCommunityToRagFlow",
+    human_name="Download Community files and push them to RagFlow",
+    short_description="Download bricks documentation and Community stories and stream them to a RagFlow Dataset",
+)
+class DownloadAndPushCommunityToRagFlow(DownloadBricksDocumentation, DownloadCommunityStories):
+    """
+    Download bricks documentation and Community stories and push them to a RagFlow Dataset in a single pipeline.
+
+    This task does the same work as `DownloadBricksDocumentation` + `DownloadCommunityStories`
+    followed by `PushResourcesToRagFlow`, but each File is handed to the RagFlow uploader
+    as soon as it is saved (or found unchanged) through a bounded queue. Uploads run in a
+    background worker and overlap with the downloads, and no full tag search is needed
+    to find the files to upload.
+
+    ## Features
+    - Downloads and tags the Community files exactly like the download tasks
+    - Uploads new and modified files while the download is still running
+    - Skips files already synced and up-to-date
+    - Handles deletion of resources marked with 'delete_in_next_sync' tag
+    - Handles errors gracefully with configurable max error threshold
+    - Returns detailed upload report
+
+    ## Requirements
+    - RagFlow API credentials (route + api_key)
+    - RagFlow dataset ID where documents will be uploaded
+    """
+
+    config_specs: ConfigSpecs = ConfigSpecs({
+        "brick_names": ListParam(
+            human_name="Brick names",
+            short_description="List of brick names to fetch documentation for (e.g., ['gws_core', 'gws_omix'])",
+            default_value=["gws_core"],
+        ),
+        "download_stories": BoolParam(
+            human_name="Download stories",
+            short_description="If true, the Community stories are also downloaded and pushed",
+            default_value=True,
+        ),
+        "page_size": IntParam(
+            human_name="Stories page size",
+            short_description="Number of stories to fetch per page",
+            default_value=100,
+            min_value=1,
+            max_value=1000,
+        ),
+        "api_key": CredentialsParam(
+            credentials_type=CredentialsDataRagflow,
+            human_name="RagFlow API Key",
+            short_description="A credentials that contains 'route' and 'api_key'",
+        ),
+        "dataset_id": StrParam(
+            human_name="RagFlow dataset id",
+            short_description="Id of the RagFlow dataset where to send the files",
+        ),
+        "max_errors": IntParam(
+            human_name="Max errors",
+            short_description="Maximum number of upload errors before stopping the upload",
+            default_value=10,
+            min_value=0,
+            optional=True,
+        ),
+        "queue_size": IntParam(
+            human_name="Upload queue size",
+            short_description="Maximum number of downloaded files waiting to be uploaded",
+            default_value=10,
+            min_value=1,
+        ),
+    })
+
+    output_specs = OutputSpecs({
+        "upload_report": OutputSpec(
+            JSONDict,
+            human_name="Upload report",
+            short_description="Detailed report of the upload operation",
+        ),
+    })
+
+    _pipeline: RagFlowUploadPipeline | None = None
+
+    def run(self, params: ConfigParams, inputs: TaskInputs) -> TaskOutputs:
+        """Download the Community files and stream them to RagFlow."""
+        brick_names = params.get_value("brick_names")
+        download_stories = params.get_value("download_stories")
+        page_size = params.get_value("page_size")
+        credentials: CredentialsDataRagflow = params.get_value("api_key")
+        dataset_id = params.get_value("dataset_id")
+        max_errors = params.get_value("max_errors")
+        queue_size = params.get_value("queue_size")
+
+        CommunityResourceFilesManagerService.ensure_tag_keys_exist(self)
+
+        # Get scenario and task model from the task context
+        scenario_id = self.get_scenario_id()
+        task_id = self.get_task_id()
+
+        scenario = Scenario.get_by_id_and_check(scenario_id) if scenario_id else None
+        task_model = TaskModel.get_by_id_and_check(task_id) if task_id else None
+
+        ragflow_service = RagFlowService.from_credentials(credentials)
+        self._pipeline = RagFlowUploadPipeline(
+            ragflow_service, dataset_id, max_errors=max_errors, queue_size=queue_size, logger=self
+        )
+
+        self._pipeline.start()
+        try:
+            self._process_bricks(brick_names, scenario, task_model)
+
+            if download_stories:
+                self._process_stories(page_size, scenario, task_model)
+        finally:
+            upload_results = self._pipeline.close()
+
+        # Process the deletions once all the files were checked by the download
+        send_to_rag_values = ["CommunityDocumentations", "CommunityTechnicalDocumentations"]
+        if download_stories:
+            send_to_rag_values.append("CommunityStories")
+
+        deleted_results = []
+        for send_to_rag_value in send_to_rag_values:
+            tag_rag_service = TagRagAppService(
+                rag_service=ragflow_service,
+                dataset_id=dataset_id,
+                additional_config={
+                    "tag_key": CommunityResourceFilesManagerService.SEND_TO_RAG_TAG_KEY,
+                    "tag_value": send_to_rag_value,
+                },
+            )
+            deleted_results.extend(self._pipeline.delete_marked_resources(tag_rag_service))
+
+        total_files = sum(len(results) for results in upload_results.values())
+        summary_msg = (
+            f"Upload complete: {len(upload_results['uploaded'])} uploaded, "
+            f"{len(upload_results['skipped'])} skipped, "
+            f"{len(upload_results['failed'])} failed out of {total_files} total"
+        )
+        if deleted_results:
+            summary_msg += f", {len(deleted_results)} deleted"
+        self.log_info_message(summary_msg)
+
+        report_data = {
+            "total_files": total_files,
+            "uploaded_count": len(upload_results["uploaded"]),
+            "skipped_count": len(upload_results["skipped"]),
+            "deleted_count": len(deleted_results),
+            "failed_count": len(upload_results["failed"]),
+            "dataset_id": dataset_id,
+            "uploaded_documents": upload_results["uploaded"],
+            "skipped_documents": upload_results["skipped"],
+            "deleted_documents": deleted_results,
+            "failed_documents": upload_results["failed"],
+        }
+
+        return {"upload_report": JSONDict(report_data)}
+
+    def _on_community_file_ready(self, resource_model: ResourceModel) -> None:
+        """Hand the File to the RagFlow upload pipeline."""
+        if self._pipeline is None:
+            return
+
+        if self._pipeline.max_errors_reached():
+            return
+
+        self._pipeline.submit(resource_model)
@@ -11,6 +11,7 @@ from gws_core import (
     ListParam,
     OutputSpec,
     OutputSpecs,
+    ResourceModel,
     Scenario,
     Tag,
     Task,
@@ -108,6 +109,23 @@ class DownloadBricksDocumentation(Task):
         scenario = Scenario.get_by_id_and_check(scenario_id) if scenario_id else None
         task_model = TaskModel.get_by_id_and_check(task_id) if task_id else None
 
+        self._process_bricks(brick_names, scenario, task_model)
+
+        return {"result": JSONDict({"is_finished": True})}
+
+    def _process_bricks(
+        self,
+        brick_names: list[str],
+        scenario: Scenario | None,
+        task_model: TaskModel | None
+    ) -> None:
+        """
+        Process the documentation and technical documentation of all the bricks.
+
+        :param brick_names: Names of the bricks.
+        :param scenario: Scenario context.
+        :param task_model: Task model context.
+        """
         total_docs_downloaded = 0
         total_docs_updated = 0
         total_docs_skipped = 0
@@ -150,7 +168,14 @@ class DownloadBricksDocumentation(Task):
         )
         self.log_info_message(f"{'='*80}")
 
-        return {"result": JSONDict({"is_finished": True})}
+    def _on_community_file_ready(self, resource_model: ResourceModel) -> None:
+        """
+        Hook called for each documentation File that is up to date in the lab,
+        whether it was just downloaded or skipped because unchanged.
+        Does nothing by default, override it to process the files while downloading.
+
+        :param resource_model: The resource model of the File.
+        """
 
     def _process_brick_documentation(
         self,
@@ -217,6 +242,7 @@ class DownloadBricksDocumentation(Task):
                 if existing_resource:
                     if not should_download:
                         skipped_count += 1
+                        self._on_community_file_ready(existing_resource)
 
                 if not should_download:
                     continue
@@ -256,6 +282,8 @@ class DownloadBricksDocumentation(Task):
                 else:
                     downloaded_count += 1
 
+                self._on_community_file_ready(file_model)
+
             except BaseHTTPException as e:
                 self.log_error_message(f"Failed to download '{doc_title}': HTTP {e.status_code} - {e.detail}")
                 failed_count += 1
@@ -358,6 +386,7 @@ class DownloadBricksDocumentation(Task):
                 if existing_resource:
                     if not should_download:
                         skipped_count += 1
+                        self._on_community_file_ready(existing_resource)
 
                 if not should_download:
                     continue
@@ -404,6 +433,8 @@ class DownloadBricksDocumentation(Task):
                 else:
                     downloaded_count += 1
 
+                self._on_community_file_ready(file_model)
+
             except BaseHTTPException as e:
                 self.log_error_message(f"Failed to download '{tech_doc_name}': HTTP {e.status_code} - {e.detail}")
                 failed_count += 1
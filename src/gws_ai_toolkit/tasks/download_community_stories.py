@@ -91,6 +91,30 @@ class DownloadCommunityStories(Task):
 
         CommunityResourceFilesManagerService.ensure_tag_keys_exist(self)
 
+        # Get scenario and task model from the task context
+        scenario_id = self.get_scenario_id()
+        task_id = self.get_task_id()
+
+        scenario = Scenario.get_by_id_and_check(scenario_id) if scenario_id else None
+        task_model = TaskModel.get_by_id_and_check(task_id) if task_id else None
+
+        self._process_stories(page_size, scenario, task_model)
+
+        return {"result": JSONDict({"is_finished": True})}
+
+    def _process_stories(
+        self,
+        page_size: int,
+        scenario: Scenario | None,
+        task_model: TaskModel | None
+    ) -> None:
+        """
+        Fetch all the Community stories and download the new or modified ones.
+
+        :param page_size: Number of stories per page.
+        :param scenario: Scenario context.
+        :param task_model: Task model context.
+        """
         # Step 1: Fetch all stories (with pagination)
         stories = self._fetch_all_stories(page_size)
 
@@ -103,20 +127,13 @@ class DownloadCommunityStories(Task):
             CommunityResourceFilesManagerService.handle_no_documentation_case(
                 existing_resources, "Community", "stories", self
             )
-            return {"result": JSONDict({"is_finished": True})}
+            return
 
         self.log_info_message(f"Found {len(stories)} story/stories")
 
         # Track which resources are still valid (exist in Community)
         resource_checked = {resource.id: False for resource in existing_resources}
 
-        # Get scenario and task model from the task context
-        scenario_id = self.get_scenario_id()
-        task_id = self.get_task_id()
-
-        scenario = Scenario.get_by_id_and_check(scenario_id) if scenario_id else None
-        task_model = TaskModel.get_by_id_and_check(task_id) if task_id else None
-
         downloaded_count = 0
         updated_count = 0
         skipped_count = 0
@@ -147,6 +164,7 @@ class DownloadCommunityStories(Task):
                 if existing_resource:
                     if not should_download:
                         skipped_count += 1
+                        self._on_community_file_ready(existing_resource)
 
                 if not should_download:
                     continue
@@ -185,6 +203,8 @@ class DownloadCommunityStories(Task):
                 else:
                     downloaded_count += 1
 
+                self._on_community_file_ready(file_model)
+
             except BaseHTTPException as e:
                 self.log_error_message(f"Failed to download '{story_title}': HTTP {e.status_code} - {e.detail}")
                 failed_count += 1
@@ -209,7 +229,14 @@ class DownloadCommunityStories(Task):
 
         self.log_success_message(summary_msg)
 
-        return {"result": JSONDict({"is_finished": True})}
+    def _on_community_file_ready(self, resource_model: ResourceModel) -> None:
+        """
+        Hook called for each story File that is up to date in the lab,
+        whether it was just downloaded or skipped because unchanged.
+        Does nothing by default, override it to process the files while downloading.
+
+        :param resource_model: The resource model of the File.
+        """
 
     def _fetch_all_stories(self, page_size: int) -> list[CommunityStoryDTO]:
         """
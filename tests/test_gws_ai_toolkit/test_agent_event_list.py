@@ -0,0 +1,146 @@
+import pickle
+import unittest
+
+from gws_ai_toolkit.core.agents.base_function_agent_events import (
+    CreateSubAgent,
+    FunctionCallEvent,
+    ResponseCompletedEvent,
+    ResponseCreatedEvent,
+    ResponseEvent,
+    ResponseFullTextEvent,
+    TextDeltaEvent,
+    UserQueryEventBase,
+    UserQueryTextEvent,
+)
+from gws_ai_toolkit.core.agents.table.agent_event_list import AgentEventList
+
+
+def create_events_with_sub_agent() -> list:
+    return [
+        UserQueryTextEvent(query="query", agent_id="A"),
+        ResponseCreatedEvent(response_id="R1", agent_id="A"),
+        FunctionCallEvent(call_id="C1", response_id="R1", function_name="f", arguments={}, agent_id="A"),
+        CreateSubAgent(response_id="R1", agent_id="B"),
+        UserQueryTextEvent(query="sub query", agent_id="B"),
+        ResponseCreatedEvent(response_id="R2", agent_id="B"),
+        TextDeltaEvent(delta="text", response_id="R2", agent_id="B"),
+        ResponseCompletedEvent(response_id="R2", agent_id="B"),
+        ResponseCompletedEvent(response_id="R1", agent_id="A"),
+    ]
+
+
+# test_agent_event_list.py
+class TestAgentEventList(unittest.TestCase):
+    """Test the indexed lookups of AgentEventList."""
+
+    def test_indexes(self):
+        events = create_events_with_sub_agent()
+        event_list = AgentEventList(events[:3])
+        for event in events[3:]:
+            event_list.append(event)
+
+        # last event by type, including the parent classes
+        self.assertIs(event_list.last_event(UserQueryEventBase), events[4])
+        self.assertIs(event_list.last_event(ResponseEvent), events[8])
+        self.assertIs(event_list.last_event(TextDeltaEvent), events[6])
+        self.assertIsNone(AgentEventList().last_event(ResponseEvent))
+
+        self.assertEqual(event_list.get_events_by_response_id("R2"), events[5:8])
+        self.assertEqual(event_list.get_events_by_response_id("unknown"), [])
+
+        self.assertIs(event_list.find_create_sub_agent_event("R1"), events[3])
+        self.assertIsNone(event_list.find_create_sub_agent_event("R2"))
+
+        # the sub agent events start at its CreateSubAgent event
+        self.assertEqual(event_list.get_agent_and_sub_agents_events("B"), events[3:8])
+        self.assertEqual(event_list.get_agent_and_sub_agents_events("A"), events)
+        self.assertEqual(event_list.get_agent_and_sub_agents_events("unknown"), [])
+
+    def test_pickle(self):
+        events = create_events_with_sub_agent()
+        event_list = pickle.loads(pickle.dumps(AgentEventList(events)))
+
+        self.assertEqual(len(event_list.get_all()), len(events))
+        self.assertEqual(event_list.find_create_sub_agent_event("R1").agent_id, "B")
+        self.assertEqual(event_list.last_event(ResponseEvent).response_id, "R1")
+
+    def test_compact_mode(self):
+        event_list = AgentEventList(compact_mode=True)
+        event_list.append(ResponseCreatedEvent(response_id="R1", agent_id="A"))
+        event_list.append(TextDeltaEvent(delta="Hello ", response_id="R1", agent_id="A"))
+        event_list.append(TextDeltaEvent(delta="world", response_id="R1", agent_id="A"))
+        event_list.append(ResponseFullTextEvent(response_id="R1", text="Hello world", agent_id="A"))
+        event_list.append(ResponseCompletedEvent(response_id="R1", agent_id="A"))
+
+        # interrupted response
+        event_list.append(ResponseCreatedEvent(response_id="R2", agent_id="A"))
+        event_list.append(TextDeltaEvent(delta="Inter", response_id="R2", agent_id="A"))
+        event_list.append(TextDeltaEvent(delta="rupted", response_id="R2", agent_id="A"))
+
+        self.assertEqual(
+            [event.type for event in event_list.get_all()],
+            ["response_created", "response_full_text", "response_completed", "response_created"],
+        )
+
+        event_list.flush_pending_text()
+        last_event = event_list.get_all()[-1]
+        self.assertIsInstance(last_event, ResponseFullTextEvent)
+        self.assertEqual((last_event.response_id, last_event.text), ("R2", "Interrupted"))
+
+    def test_compact(self):
+        events = [
+            ResponseCreatedEvent(response_id="R1", agent_id="A"),
+            TextDeltaEvent(delta="Hello ", response_id="R1", agent_id="A"),
+            TextDeltaEvent(delta="world", response_id="R1", agent_id="A"),
+            ResponseFullTextEvent(response_id="R1", text="Hello world", agent_id="A"),
+            ResponseCompletedEvent(response_id="R1", agent_id="A"),
+            ResponseCreatedEvent(response_id="R2", agent_id="A"),
+            TextDeltaEvent(delta="Inter", response_id="R2", agent_id="A"),
+            TextDeltaEvent(delta="rupted", response_id="R2", agent_id="A"),
+            ResponseCreatedEvent(response_id="R3", agent_id="A"),
+        ]
+        event_list = AgentEventList(events)
+        event_list.compact()
+
+        self.assertEqual(
+            [event.type for event in event_list.get_all()],
+            [
+                "response_created",
+                "response_full_text",
+                "response_completed",
+                "response_created",
+                "response_full_text",
+                "response_created",
+            ],
+        )
+        self.assertEqual(event_list.get_all()[4].text, "Interrupted")
+        self.assertIsNone(event_list.last_event(TextDeltaEvent))
+        self.assertEqual(len(event_list.get_events_by_response_id("R2")), 2)
+
+    def test_interleaved_sub_agents(self):
+        # 2 sub agents (B and C) created by the same response and running in parallel
+        events = [
+            ResponseCreatedEvent(response_id="R1", agent_id="A"),
+            FunctionCallEvent(call_id="C1", response_id="R1", function_name="f", arguments={}, agent_id="A"),
+            FunctionCallEvent(call_id="C2", response_id="R1", function_name="f", arguments={}, agent_id="A"),
+            CreateSubAgent(response_id="R1", agent_id="B", call_id="C1"),
+            CreateSubAgent(response_id="R1", agent_id="C", call_id="C2"),
+            ResponseCreatedEvent(response_id="RB", agent_id="B"),
+            ResponseCreatedEvent(response_id="RC", agent_id="C"),
+            TextDeltaEvent(delta="c", response_id="RC", agent_id="C"),
+            TextDeltaEvent(delta="b", response_id="RB", agent_id="B"),
+            ResponseCompletedEvent(response_id="RC", agent_id="C"),
+            ResponseCompletedEvent(response_id="RB", agent_id="B"),
+            ResponseCompletedEvent(response_id="R1", agent_id="A"),
+        ]
+        event_list = AgentEventList(events)
+
+        self.assertIs(event_list.find_create_sub_agent_event("R1", "C2"), events[4])
+        self.assertIs(event_list.find_create_sub_agent_event("R1"), events[3])
+
+        self.assertEqual(
+            event_list.get_agent_and_sub_agents_events("B"), [events[3], events[5], events[8], events[10]]
+        )
+        self.assertEqual(
+            event_list.get_agent_and_sub_agents_events("C"), [events[4], events[6], events[7], events[9]]
+        )
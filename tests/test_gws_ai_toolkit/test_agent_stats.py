@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+from gws_ai_toolkit.core.agents.agent_stats import AgentSessionStats
+from gws_ai_toolkit.core.agents.base_function_agent_events import (
+    ResponseCompletedEvent,
+    ResponseStatsEvent,
+)
+
+
+# test_agent_stats.py
+class TestAgentStats(TestCase):
+    """Test the aggregation of the responses stats of an agent session."""
+
+    def test_session_stats_with_sub_agent(self):
+        events = [
+            ResponseStatsEvent(
+                response_id="resp_1",
+                agent_id="main",
+                input_tokens=1000,
+                cached_tokens=800,
+                output_tokens=50,
+                stream_duration=1.0,
+                function_duration=3.0,
+                function_call_count=1,
+            ),
+            ResponseCompletedEvent(response_id="resp_1", agent_id="main"),
+            ResponseStatsEvent(
+                response_id="resp_2",
+                agent_id="sub",
+                input_tokens=500,
+                output_tokens=100,
+                stream_duration=1.5,
+                function_duration=1.0,
+                function_call_count=1,
+                parent_agent_id="main",
+                depth=1,
+            ),
+            ResponseStatsEvent(
+                response_id="resp_3",
+                agent_id="sub",
+                input_tokens=600,
+                cached_tokens=500,
+                output_tokens=10,
+                stream_duration=0.5,
+                retry_count=1,
+                parent_agent_id="main",
+                depth=1,
+            ),
+        ]
+
+        stats = AgentSessionStats.from_events(events)
+
+        self.assertEqual(stats.total.response_count, 3)
+        self.assertEqual(stats.total.input_tokens, 2100)
+        self.assertEqual(stats.total.cached_tokens, 1300)
+        self.assertEqual(stats.total.output_tokens, 160)
+        self.assertEqual(stats.total.stream_duration, 3.0)
+        # the function time of the sub agent is included in the function time of the main agent
+        self.assertEqual(stats.total.function_duration, 3.0)
+        self.assertEqual(stats.total.retry_count, 1)
+
+        self.assertEqual([agent.agent_id for agent in stats.agents], ["main", "sub"])
+        sub_stats = stats.agents[1]
+        self.assertEqual(sub_stats.parent_agent_id, "main")
+        self.assertEqual(sub_stats.depth, 1)
+        self.assertEqual(sub_stats.response_count, 2)
+        self.assertEqual(sub_stats.retry_count, 1)
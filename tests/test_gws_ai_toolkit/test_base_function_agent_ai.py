@@ -0,0 +1,326 @@
+import asyncio
+import time
+import traceback
+import unittest
+from collections.abc import Generator
+
+from gws_ai_toolkit.core.agents.agent_loop_policy import AgentLoopPolicy
+from gws_ai_toolkit.core.agents.agent_stats import AgentSessionStats
+from gws_ai_toolkit.core.agents.base_function_agent_ai import BaseFunctionAgentAi
+from gws_ai_toolkit.core.agents.base_function_agent_events import (
+    ErrorEvent,
+    FunctionCallEvent,
+    FunctionErrorEvent,
+    FunctionSuccessEvent,
+    ResponseCompletedEvent,
+    ResponseCreatedEvent,
+    ResponseStatsEvent,
+    TextDeltaEvent,
+    UserQueryTextEvent,
+)
+from gws_ai_toolkit.core.openai_client_registry import OpenAiClientRegistry
+
+
+class FakeTextAgentAi(BaseFunctionAgentAi):
+    """Agent that streams text deltas with a delay, without calling OpenAI."""
+
+    def __init__(self, delta_count: int, delay: float):
+        super().__init__("fake_key", "fake_model", 0.0)
+        self.delta_count = delta_count
+        self.delay = delay
+        self.finished = False
+
+    def _generate_stream_internal(self, input_messages: list[dict], user_query) -> Generator:
+        yield ResponseCreatedEvent(response_id="resp_1", agent_id=self.id)
+        for i in range(self.delta_count):
+            time.sleep(self.delay)
+            yield TextDeltaEvent(delta=f"token {i} ", response_id="resp_1", agent_id=self.id)
+        yield ResponseCompletedEvent(response_id="resp_1", agent_id=self.id)
+        self.finished = True
+
+    def _handle_function_call(self, function_call_event: FunctionCallEvent, user_query) -> Generator:
+        yield from []
+
+    def _get_ai_instruction(self, user_query) -> str:
+        return ""
+
+    def _get_tools(self) -> list[dict]:
+        return []
+
+
+class FakeParallelAgentAi(FakeTextAgentAi):
+    """Agent that calls a slow function on multiple tables in the same response."""
+
+    def __init__(self, tables: list[str]):
+        super().__init__(delta_count=0, delay=0)
+        self._parallel_tool_calls = True
+        self.tables = tables
+        self.received_messages: list[list[dict]] = []
+
+    def _generate_stream_internal(self, input_messages: list[dict], user_query) -> Generator:
+        self.received_messages.append(input_messages)
+        response_id = f"resp_{len(self.received_messages)}"
+        yield ResponseCreatedEvent(response_id=response_id, agent_id=self.id)
+
+        # call the function on each table only in the first response
+        if len(self.received_messages) == 1:
+            function_calls = [
+                FunctionCallEvent(
+                    call_id=f"call_{i}",
+                    response_id=response_id,
+                    function_name="slow_function",
+                    arguments={"table": table},
+                    agent_id=self.id,
+                )
+                for i, table in enumerate(self.tables)
+            ]
+            yield from function_calls
+            yield from self._handle_function_calls(function_calls, user_query)
+        yield ResponseCompletedEvent(response_id=response_id, agent_id=self.id)
+
+    def _handle_function_call(self, function_call_event: FunctionCallEvent, user_query) -> Generator:
+        table = function_call_event.arguments["table"]
+        for i in range(3):
+            time.sleep(0.05)
+            yield TextDeltaEvent(
+                delta=f"{table}_{i}", response_id=function_call_event.response_id, agent_id=self.id
+            )
+        yield FunctionSuccessEvent(
+            function_response=f"{table} done",
+            call_id=function_call_event.call_id,
+            response_id=function_call_event.response_id,
+            agent_id=self.id,
+        )
+
+    def _are_function_calls_independent(self, function_call_1, function_call_2) -> bool:
+        return function_call_1.arguments["table"] != function_call_2.arguments["table"]
+
+
+class FakeErrorAgentAi(FakeTextAgentAi):
+    """Agent whose function call always fails, with the given errors in turn."""
+
+    def __init__(self, error_messages: list[str]):
+        super().__init__(delta_count=0, delay=0)
+        self.error_messages = error_messages
+        self.call_count = 0
+
+    def _generate_stream_internal(self, input_messages: list[dict], user_query) -> Generator:
+        self.call_count += 1
+        response_id = f"resp_{self.call_count}"
+        yield ResponseCreatedEvent(response_id=response_id, agent_id=self.id)
+        error_message = self.error_messages[(self.call_count - 1) % len(self.error_messages)]
+        yield FunctionErrorEvent(
+            message="Error during code execution",
+            stack_trace=f"Traceback (most recent call last):\n  File \"<string>\", line 1, in <module>\n{error_message}",
+            call_id=f"call_{self.call_count}",
+            response_id=response_id,
+            agent_id=self.id,
+        )
+        yield ResponseCompletedEvent(response_id=response_id, agent_id=self.id)
+
+
+class FakeScriptedAgentAi(FakeTextAgentAi):
+    """Agent whose responses call a function with the given results in turn ('error' or 'success'),
+    then respond without function call."""
+
+    def __init__(self, function_results: list[str]):
+        super().__init__(delta_count=0, delay=0)
+        self.function_results = function_results
+        self.call_count = 0
+
+    def _generate_stream_internal(self, input_messages: list[dict], user_query) -> Generator:
+        self.call_count += 1
+        response_id = f"resp_{self.call_count}"
+        yield ResponseCreatedEvent(response_id=response_id, agent_id=self.id)
+        if self.call_count <= len(self.function_results):
+            if self.function_results[self.call_count - 1] == "error":
+                yield FunctionErrorEvent(
+                    message="Error during code execution",
+                    stack_trace="KeyError: 'a'",
+                    call_id=f"call_{self.call_count}",
+                    response_id=response_id,
+                    agent_id=self.id,
+                )
+            else:
+                yield FunctionSuccessEvent(
+                    function_response="done",
+                    call_id=f"call_{self.call_count}",
+                    response_id=response_id,
+                    agent_id=self.id,
+                )
+        yield ResponseStatsEvent(response_id=response_id, agent_id=self.id)
+        yield ResponseCompletedEvent(response_id=response_id, agent_id=self.id)
+
+
+# test_base_function_agent_ai.py
+class TestBaseFunctionAgentAi(unittest.TestCase):
+    """Test the agent loop of BaseFunctionAgentAi with a fake agent (no call to OpenAI)."""
+
+    def _create_user_query(self, agent: FakeTextAgentAi) -> UserQueryTextEvent:
+        return UserQueryTextEvent(query="Hello", agent_id=agent.id)
+
+    def test_call_agent_async_streams_events(self):
+        agent = FakeTextAgentAi(delta_count=5, delay=0.1)
+
+        async def consume():
+            start = time.perf_counter()
+            first_delta_time = None
+            events = []
+            async for event in agent.call_agent_async(self._create_user_query(agent)):
+                if isinstance(event, TextDeltaEvent) and first_delta_time is None:
+                    first_delta_time = time.perf_counter() - start
+                    # the agent is still running when the first delta is received
+                    self.assertFalse(agent.finished)
+                events.append(event)
+            return events, first_delta_time
+
+        events, first_delta_time = asyncio.run(consume())
+
+        self.assertIsInstance(events[0], UserQueryTextEvent)
+        self.assertEqual(len([event for event in events if isinstance(event, TextDeltaEvent)]), 5)
+        self.assertIsInstance(events[-1], ResponseCompletedEvent)
+        self.assertLess(first_delta_time, 0.4)
+
+    def test_call_agent_async_stop(self):
+        agent = FakeTextAgentAi(delta_count=20, delay=0.05)
+
+        async def consume_first_delta():
+            async for event in agent.call_agent_async(self._create_user_query(agent)):
+                if isinstance(event, TextDeltaEvent):
+                    break
+            # let the worker thread see the stop
+            await asyncio.sleep(0.2)
+
+        asyncio.run(consume_first_delta())
+        self.assertFalse(agent.finished)
+
+    def test_call_agent_async_error(self):
+        agent = FakeTextAgentAi(delta_count=1, delay=0)
+
+        def raise_error(input_messages, user_query):
+            yield ResponseCreatedEvent(response_id="resp_1", agent_id=agent.id)
+            raise ValueError("OpenAI error")
+
+        agent._generate_stream_internal = raise_error
+
+        async def consume():
+            return [event async for event in agent.call_agent_async(self._create_user_query(agent))]
+
+        with self.assertRaises(ValueError):
+            asyncio.run(consume())
+
+    def test_text_deltas_are_not_stored(self):
+        agent = FakeTextAgentAi(delta_count=100, delay=0)
+
+        events = list(agent.call_agent(self._create_user_query(agent)))
+
+        # the deltas are yielded but only the other events are stored
+        self.assertEqual(len([event for event in events if isinstance(event, TextDeltaEvent)]), 100)
+        self.assertEqual(len(agent.get_events().get_all()), 3)
+        self.assertIsNone(agent.get_events().last_event(TextDeltaEvent))
+
+    def test_openai_client_is_shared(self):
+        agent_1 = FakeTextAgentAi(delta_count=1, delay=0)
+        agent_2 = FakeTextAgentAi(delta_count=1, delay=0)
+
+        # the agents with the same api key share the same client
+        self.assertIs(agent_1._get_openai_client(), agent_2._get_openai_client())
+        self.assertIs(agent_1._get_openai_client(), OpenAiClientRegistry.get_client("fake_key"))
+        self.assertIsNot(agent_1._get_openai_client(), OpenAiClientRegistry.get_client("other_key"))
+        self.assertIsNot(
+            agent_1._get_openai_client(),
+            OpenAiClientRegistry.get_client("fake_key", base_url="https://openai.test.com/v1"),
+        )
+
+    def test_parallel_function_calls(self):
+        agent = FakeParallelAgentAi(tables=["a", "b", "c", "a"])
+        user_query = self._create_user_query(agent)
+
+        start = time.perf_counter()
+        events = list(agent.call_agent(user_query))
+        duration = time.perf_counter() - start
+
+        # the 2 calls on table 'a' run one after the other, in parallel with 'b' and 'c'
+        groups = agent._group_dependent_function_calls(
+            [event for event in events if isinstance(event, FunctionCallEvent)]
+        )
+        self.assertEqual([[call.arguments["table"] for call in group] for group in groups], [["a", "a"], ["b"], ["c"]])
+        self.assertLess(duration, 0.55)
+
+        # the events of each call keep their order
+        deltas = [event.delta for event in events if isinstance(event, TextDeltaEvent)]
+        self.assertEqual(len(deltas), 12)
+        for table in ["b", "c"]:
+            self.assertEqual([d for d in deltas if d.startswith(table)], [f"{table}_{i}" for i in range(3)])
+
+        # all the results are sent back in the next request
+        outputs = agent.received_messages[1]
+        self.assertEqual(
+            sorted(output["call_id"] for output in outputs), ["call_0", "call_1", "call_2", "call_3"]
+        )
+        self.assertTrue(all(output["type"] == "function_call_output" for output in outputs))
+
+    def test_loop_policy_max_errors(self):
+        agent = FakeErrorAgentAi(["KeyError: 'a'", "KeyError: 'b'"])
+
+        events = list(agent.call_agent(self._create_user_query(agent)))
+
+        # the errors are different, the loop stops at the maximum number of errors
+        self.assertEqual(agent.call_count, BaseFunctionAgentAi.MAX_CONSECUTIVE_ERRORS)
+        self.assertIsInstance(events[-1], ErrorEvent)
+        self.assertIn("Maximum consecutive errors", events[-1].message)
+
+    def test_retry_count(self):
+        agent = FakeScriptedAgentAi(["error", "success", "success"])
+
+        events = list(agent.call_agent(self._create_user_query(agent)))
+
+        # only the response right after the error is a retry
+        stats_events = [event for event in events if isinstance(event, ResponseStatsEvent)]
+        self.assertEqual([event.retry_count for event in stats_events], [0, 1, 0, 0])
+        self.assertEqual(AgentSessionStats.from_events(events).total.retry_count, 1)
+
+    def test_loop_policy_identical_errors(self):
+        agent = FakeErrorAgentAi(["KeyError: 'a'"])
+        agent.set_loop_policy(AgentLoopPolicy(max_identical_errors=2))
+
+        events = list(agent.call_agent(self._create_user_query(agent)))
+
+        self.assertEqual(agent.call_count, 2)
+        self.assertIn("same error", events[-1].message)
+
+    def test_loop_policy_deadline(self):
+        agent = FakeErrorAgentAi(["KeyError: 'a'", "KeyError: 'b'"])
+        agent.set_loop_policy(AgentLoopPolicy(deadline=0.25))
+
+        original_generate = agent._generate_stream_internal
+
+        def slow_generate(input_messages, user_query):
+            time.sleep(0.1)
+            yield from original_generate(input_messages, user_query)
+
+        agent._generate_stream_internal = slow_generate
+        events = list(agent.call_agent(self._create_user_query(agent)))
+
+        self.assertEqual(agent.call_count, 3)
+        self.assertIn("Maximum duration", events[-1].message)
+
+    def test_trim_stack_trace(self):
+        code = "def transform(df):\n    return df['missing']\n\ntransform({})\n"
+        try:
+            exec(code, {})  # pylint: disable=exec-used
+        except KeyError:
+            stack_trace = traceback.format_exc()
+
+        # add library frames between the generated code and the error
+        library_frames = "".join(f'  File "/lib/pandas/frame_{i}.py", line {i}, in get\n    call_{i}()\n' for i in range(10))
+        stack_trace = stack_trace.replace("KeyError: 'missing'", library_frames + "KeyError: 'missing'")
+
+        trimmed = AgentLoopPolicy().trim_stack_trace(stack_trace)
+
+        self.assertIn('File "<string>", line 4, in <module>', trimmed)
+        self.assertIn('File "<string>", line 2, in transform', trimmed)
+        self.assertIn("frame_9.py", trimmed)
+        self.assertNotIn("frame_5.py", trimmed)
+        self.assertTrue(trimmed.endswith("KeyError: 'missing'"))
+        self.assertLess(len(trimmed), len(stack_trace))
@@ -233,3 +233,49 @@ class TestChatConversationService(BaseTestCase):
 
         # Clean up
         conversation.delete_instance()
+
+    def test_get_messages_of_conversation_with_sources(self):
+        """Test loading the messages of a conversation with the sources of each message."""
+        source_messages = [
+            ChatMessageSource(
+                sources=[
+                    RagChatSource(
+                        id=str(uuid4()),
+                        document_id=f"doc_{message_index}_{source_index}",
+                        document_name=f"document_{source_index}.pdf",
+                        score=0.5,
+                        chunk=RagChatSourceChunk(
+                            chunk_id=f"chunk_{source_index}", content="Chunk content", score=0.5
+                        ),
+                    )
+                    for source_index in range(message_index * 10)
+                ],
+                content=f"Answer {message_index}",
+            )
+            for message_index in range(3)
+        ]
+        conversation_dto = SaveChatConversationDTO(
+            chat_app_name=self.test_chat_app.name,
+            configuration={},
+            mode="chat",
+            label="Conversation with many sources",
+            messages=[ChatUserMessageText(content="Question")] + source_messages,
+        )
+        conversation = self.service.save_conversation(conversation_dto)
+
+        messages = self.service.get_messages_of_conversation(str(conversation.id))
+
+        # Messages are ordered and each message has its own sources
+        self.assertEqual(len(messages), 4)
+        self.assertEqual(messages[0].content, "Question")
+        for message_index, message in enumerate(messages[1:]):
+            self.assertIsInstance(message, ChatMessageSource)
+            self.assertEqual(message.content, f"Answer {message_index}")
+            self.assertEqual(
+                {source.document_id for source in message.sources},
+                {f"doc_{message_index}_{source_index}" for source_index in range(message_index * 10)},
+            )
+        self.assertEqual(messages[3].sources[0].chunk.content, "Chunk content")
+
+        # Clean up
+        conversation.delete_instance()
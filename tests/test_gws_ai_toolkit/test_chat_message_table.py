@@ -0,0 +1,155 @@
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from gws_core import Table
+
+from gws_ai_toolkit.models.chat.message.chat_message_base import ChatMessageBase
+from gws_ai_toolkit.models.chat.message.chat_message_table import (
+    ChatMessageTable,
+    read_table_file,
+    write_table_file,
+)
+
+
+# test_chat_message_table.py
+class TestChatMessageTable(unittest.TestCase):
+    """Test the columnar persistence of the table messages."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.conversation = SimpleNamespace(get_conversation_folder_path=lambda: self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_write_read_table_file(self):
+        dataframe = pd.DataFrame(
+            {
+                "int": [1, 2, 3],
+                "float": [1.5, np.nan, 3.5],
+                "date": pd.to_datetime(["2024-01-01", "2024-01-02", None]),
+                "category": pd.Categorical(["a", "b", "a"]),
+            }
+        )
+
+        file_path = write_table_file(dataframe, os.path.join(self.temp_dir.name, "table"))
+
+        self.assertTrue(file_path.endswith(".arrow"))
+        # the temporary file is renamed
+        self.assertEqual(os.listdir(self.temp_dir.name), ["table.arrow"])
+        # the dtypes are kept, unlike with CSV
+        pd.testing.assert_frame_equal(read_table_file(file_path), dataframe)
+
+    def test_read_csv_file(self):
+        """The tables of the messages saved before the Arrow files are CSV files"""
+        file_path = os.path.join(self.temp_dir.name, "table_1.csv")
+        pd.DataFrame({"A": [1, 2], "B": ["x", "y"]}).to_csv(file_path, index=False)
+
+        message = ChatMessageTable(id="1")
+        message.fill_from_model(self._create_message_model("table_1.csv", "Old table"))
+
+        table = message.get_table()
+        self.assertEqual(table.get_data()["A"].tolist(), [1, 2])
+        self.assertEqual(table.name, "Old table")
+
+    def test_lazy_load(self):
+        table = Table(pd.DataFrame({"A": range(10), "B": [f"value {i}" for i in range(10)]}))
+        table.name = "Result"
+        message_model = SimpleNamespace(id="1", conversation=self.conversation, filename=None)
+        ChatMessageTable(table=table)._save_table_to_message(message_model)
+        self.assertEqual(message_model.filename, "table_1.arrow")
+
+        message = ChatMessageTable(id="1")
+        message.fill_from_model(self._create_message_model("table_1.arrow", "Result"))
+
+        # only the metadata is loaded, the front DTO doesn't read the file
+        self.assertIsNone(message.table)
+        self.assertEqual(message.to_front_dto().table_name, "Result")
+        self.assertIsNone(message.table)
+
+        loaded_table = message.get_table()
+        pd.testing.assert_frame_equal(loaded_table.get_data(), table.get_data())
+        self.assertEqual(loaded_table.name, "Result")
+        self.assertIs(message.get_table(), loaded_table)
+
+    def test_lazy_hydration(self):
+        write_table_file(pd.DataFrame({"A": [1, 2]}), os.path.join(self.temp_dir.name, "table_1"))
+        message_model = self._create_message_model("table_1.arrow", "Result")
+
+        eager_message = ChatMessageBase.from_chat_message_model(message_model)
+        self.assertIsInstance(eager_message, ChatMessageTable)
+        self.assertEqual(eager_message.table.get_data()["A"].tolist(), [1, 2])
+
+        lazy_message = ChatMessageBase.from_chat_message_model(message_model, lazy=True)
+        self.assertIsNone(lazy_message.table)
+        self.assertEqual(lazy_message.to_front_dto().table_name, "Result")
+        self.assertIsNone(lazy_message.table)
+        self.assertEqual(lazy_message.get_table().get_data()["A"].tolist(), [1, 2])
+
+    def test_missing_file(self):
+        message = ChatMessageTable(id="1")
+        message.fill_from_model(self._create_message_model("table_1.arrow", "Table"))
+
+        self.assertIsNone(message.get_table())
+        self.assertEqual(message.to_front_dto().table_name, "Table")
+
+    def test_unreadable_file(self):
+        with open(os.path.join(self.temp_dir.name, "table_1.arrow"), "w", encoding="utf-8") as file:
+            file.write("not an arrow file")
+        message = ChatMessageTable(id="1")
+        message.fill_from_model(self._create_message_model("table_1.arrow", "Table"))
+
+        with patch("gws_ai_toolkit.models.chat.message.chat_message_table.Logger") as logger:
+            self.assertIsNone(message.get_table())
+            # the error is logged and the file is not read again
+            self.assertIsNone(message.get_table())
+        logger.error.assert_called_once()
+        logger.log_exception_stack_trace.assert_called_once()
+
+    @unittest.skipIf(
+        not os.getenv("RUN_BENCHMARKS"), "Benchmark, set the RUN_BENCHMARKS environment variable to run it"
+    )
+    def test_table_file_benchmark(self):
+        """Compare the size and the read time of a table of 1M rows saved as CSV and as Arrow."""
+        row_count = 1_000_000
+        rng = np.random.default_rng(0)
+        dataframe = pd.DataFrame(
+            {
+                "id": np.arange(row_count),
+                "value": rng.normal(size=row_count),
+                "group": pd.Categorical(rng.choice(["a", "b", "c"], size=row_count)),
+                "date": pd.date_range("2020-01-01", periods=row_count, freq="min"),
+            }
+        )
+        csv_path = os.path.join(self.temp_dir.name, "table.csv")
+        dataframe.to_csv(csv_path, index=False)
+        arrow_path = write_table_file(dataframe, os.path.join(self.temp_dir.name, "table"))
+
+        start = time.perf_counter()
+        pd.read_csv(csv_path)
+        csv_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        read_table_file(arrow_path)
+        arrow_duration = time.perf_counter() - start
+
+        self.assertLess(os.path.getsize(arrow_path), os.path.getsize(csv_path))
+        # the Arrow file is not parsed, the margin is large (about 20 times faster)
+        self.assertLess(arrow_duration, csv_duration / 2)
+
+    def _create_message_model(self, filename: str, table_name: str) -> SimpleNamespace:
+        file_path = os.path.join(self.temp_dir.name, filename)
+        return SimpleNamespace(
+            id="1",
+            type="table",
+            external_id=None,
+            user=SimpleNamespace(to_dto=lambda: None),
+            data={"table_name": table_name},
+            get_filepath_if_exists=lambda: file_path if os.path.exists(file_path) else None,
+        )
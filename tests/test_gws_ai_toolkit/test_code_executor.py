@@ -0,0 +1,258 @@
+import os
+import time
+import tracemalloc
+from unittest import TestCase, skipIf
+
+import numpy as np
+import pandas as pd
+
+from gws_ai_toolkit.core.agents.code_execution_error import CodeExecutionError
+from gws_ai_toolkit.core.agents.code_executor import (
+    CodeExecutor,
+    get_dataframe_sample,
+    is_pandas_copy_on_write_enabled,
+)
+from gws_ai_toolkit.core.agents.compiled_code_cache import CompiledCodeCache
+
+
+def run_transform_chain(executor: CodeExecutor, dataframe: pd.DataFrame, copy_input: bool, step_count: int) -> int:
+    """Run a chain of transformations, each one on the result of the previous one like
+    successive requests to the transform agent. Return the peak of allocated memory."""
+    tables = [dataframe]
+    tracemalloc.start()
+    try:
+        for i in range(step_count):
+            first_line = "transformed_df = df.copy()" if copy_input else "transformed_df = df"
+            code = f"{first_line}\ntransformed_df['step_{i}'] = transformed_df['value'] * {i}\n"
+            results = executor.execute(code, {"pd": pd, "df": tables[-1]}, ["transformed_df"])
+            # the tables of the conversation are kept
+            tables.append(results["transformed_df"])
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class TestCodeExecutor(TestCase):
+    """Test the in-process execution of the generated code."""
+
+    def test_execute(self):
+        results = CodeExecutor().execute("result = value * 2\nother = 1\n", {"value": 21}, ["result", "missing"])
+        self.assertEqual(results, {"result": 42})
+
+        with self.assertRaises(CodeExecutionError) as context:
+            CodeExecutor().execute("result = 1 / 0\n", {}, ["result"])
+        self.assertIn("ZeroDivisionError", context.exception.stack_trace)
+
+    def test_copy_on_write_protects_inputs(self):
+        if not is_pandas_copy_on_write_enabled():
+            self.skipTest("Copy-on-Write is not enabled for the process")
+
+        dataframe = pd.DataFrame({"a": [1, 2, 3], "b": [4.0, 5.0, 6.0]})
+        other = pd.DataFrame({"c": [1]})
+        code = (
+            "df.loc[0, 'a'] = 100\n"
+            "df['b'] = 0.0\n"
+            "tables['other'].loc[0, 'c'] = -1\n"
+            "transformed_df = df\n"
+        )
+
+        results = CodeExecutor(copy_on_write=True).execute(
+            code, {"df": dataframe, "tables": {"other": other}}, ["transformed_df"]
+        )
+
+        self.assertEqual(results["transformed_df"]["a"].tolist(), [100, 2, 3])
+        self.assertEqual(dataframe["a"].tolist(), [1, 2, 3])
+        self.assertEqual(dataframe["b"].tolist(), [4.0, 5.0, 6.0])
+        self.assertEqual(other["c"].tolist(), [1])
+
+    def test_copy_on_write_disabled_copies_shared_results(self):
+        """Without Copy-on-Write for the process, the option is not changed and the results that
+        share memory with an input are copied"""
+        if is_pandas_copy_on_write_enabled():
+            self.skipTest("Copy-on-Write is enabled for the process")
+
+        dataframe = pd.DataFrame({"a": [1, 2, 3], "b": [4.0, 5.0, 6.0]})
+        code = (
+            "enabled = pd.get_option('mode.copy_on_write')\n"
+            "transformed_df = df\n"
+            "tables = {'rows': df.iloc[:2], 'new': pd.DataFrame({'c': [1]})}\n"
+        )
+
+        results = CodeExecutor(copy_on_write=True).execute(
+            code, {"pd": pd, "df": dataframe}, ["enabled", "transformed_df", "tables"]
+        )
+
+        self.assertFalse(results["enabled"])
+        self.assertFalse(pd.get_option("mode.copy_on_write"))
+        self.assertFalse(CodeExecutor(copy_on_write=True).protects_inputs())
+
+        # the results can be modified in place without changing the input
+        results["transformed_df"].loc[0, "a"] = 100
+        results["tables"]["rows"].loc[1, "b"] = -1.0
+        self.assertEqual(dataframe["a"].tolist(), [1, 2, 3])
+        self.assertEqual(dataframe["b"].tolist(), [4.0, 5.0, 6.0])
+
+    @skipIf(not os.getenv("RUN_BENCHMARKS"), "Benchmark, set the RUN_BENCHMARKS environment variable to run it")
+    def test_copy_on_write_benchmark(self):
+        """Compare the peak memory of a chain of 5 transformations on a 5M rows table, with an eager
+        copy of the input (previous prompt) and with copy on write."""
+        if not is_pandas_copy_on_write_enabled():
+            self.skipTest("Copy-on-Write is not enabled for the process")
+
+        row_count = 5_000_000
+        dataframe = pd.DataFrame({
+            "value": np.random.default_rng(0).random(row_count),
+            "category": np.arange(row_count) % 10,
+        })
+
+        eager_peak = run_transform_chain(CodeExecutor(), dataframe, copy_input=True, step_count=5)
+        copy_on_write_peak = run_transform_chain(
+            CodeExecutor(copy_on_write=True), dataframe, copy_input=False, step_count=5
+        )
+
+        # the eager copies keep a copy of the table for each step
+        self.assertLess(copy_on_write_peak, eager_peak / 2)
+
+
+class TestCodeExecutorSample(TestCase):
+    """Test the execution of the generated code on a sample before the full data."""
+
+    def _create_dataframe(self, row_count: int) -> pd.DataFrame:
+        dataframe = pd.DataFrame({
+            "value": np.arange(row_count, dtype=float),
+            "count": np.arange(row_count, dtype=np.int32),
+            "category": pd.Categorical(np.where(np.arange(row_count) == row_count - 1, "rare", "common")),
+            "label": [f"label_{i % 3}" for i in range(row_count)],
+        })
+        dataframe.loc[dataframe["count"] % 100 == 50, "value"] = np.nan
+        return dataframe
+
+    def test_dataframe_sample(self):
+        dataframe = self._create_dataframe(10000)
+
+        sample = get_dataframe_sample(dataframe, 50)
+
+        self.assertEqual(len(sample), 50)
+        self.assertEqual(sample.dtypes.to_dict(), dataframe.dtypes.to_dict())
+        self.assertTrue(sample.index.is_monotonic_increasing)
+        self.assertEqual(sample.index[0], 0)
+        # the rare values and the missing values are kept
+        self.assertEqual(set(sample["category"]), {"common", "rare"})
+        self.assertEqual(set(sample["label"]), {"label_0", "label_1", "label_2"})
+        self.assertTrue(sample["value"].isna().any())
+        self.assertTrue(sample.equals(get_dataframe_sample(dataframe, 50)))
+
+    def test_sample_error(self):
+        dataframe = self._create_dataframe(1000)
+        row_counts: list[int] = []
+        code = "row_counts.append(len(df))\ntransformed_df = df['label'] + 1\n"
+
+        with self.assertRaises(CodeExecutionError) as context:
+            CodeExecutor(sample_row_count=100).execute(
+                code, {"df": dataframe, "row_counts": row_counts}, ["transformed_df"]
+            )
+
+        self.assertIn("TypeError", context.exception.stack_trace)
+        # the code was not executed on the full data
+        self.assertEqual(row_counts, [100])
+
+    def test_sample_success(self):
+        dataframe = self._create_dataframe(1000)
+        row_counts: list[int] = []
+        # the row does not exist in the sample, the code is executed on the full data anyway
+        code = "row_counts.append(len(df))\nrow = df.iloc[500]\ntransformed_df = df[df['count'] > 10]\n"
+
+        results = CodeExecutor(sample_row_count=100).execute(
+            code, {"df": dataframe, "row_counts": row_counts}, ["transformed_df"]
+        )
+
+        self.assertEqual(row_counts, [100, 1000])
+        self.assertEqual(len(results["transformed_df"]), 989)
+
+        # a row label missing from the sample raises a KeyError, the code is executed on the full data
+        sample = get_dataframe_sample(dataframe, 100)
+        missing_label = next(label for label in dataframe.index if label not in sample.index)
+        row_counts.clear()
+        code = f"row_counts.append(len(df))\ntransformed_df = df.loc[[{missing_label}]]\n"
+        results = CodeExecutor(sample_row_count=100).execute(
+            code, {"df": dataframe, "row_counts": row_counts}, ["transformed_df"]
+        )
+        self.assertEqual(row_counts, [100, 1000])
+        self.assertEqual(results["transformed_df"].index.tolist(), [missing_label])
+
+        # small tables are executed directly
+        row_counts.clear()
+        CodeExecutor(sample_row_count=1000).execute(code, {"df": dataframe, "row_counts": row_counts}, [])
+        self.assertEqual(row_counts, [1000])
+
+    @skipIf(not os.getenv("RUN_BENCHMARKS"), "Benchmark, set the RUN_BENCHMARKS environment variable to run it")
+    def test_sample_benchmark(self):
+        """Compare the time to get the error of a wrong code on a 5M rows table with and without
+        the sample execution."""
+        row_count = 5_000_000
+        dataframe = pd.DataFrame({
+            "value": np.random.default_rng(0).random(row_count),
+            "category": np.arange(row_count) % 10,
+        })
+        code = (
+            "transformed_df = df.sort_values('value')\n"
+            "transformed_df['total'] = transformed_df['category'].str.upper()\n"
+        )
+
+        timings = {}
+        for name, executor in [("full", CodeExecutor()), ("sample", CodeExecutor(sample_row_count=1000))]:
+            start = time.perf_counter()
+            with self.assertRaises(CodeExecutionError):
+                executor.execute(code, {"df": dataframe}, ["transformed_df"])
+            timings[name] = time.perf_counter() - start
+
+        # the sort of the full table is skipped, the margin is large (about 100 times faster)
+        self.assertLess(timings["sample"], timings["full"] / 5)
+
+
+class TestCompiledCodeCache(TestCase):
+    """Test the cache of the compiled generated code."""
+
+    def setUp(self):
+        CompiledCodeCache.clear()
+
+    def tearDown(self):
+        CompiledCodeCache.clear()
+
+    def test_compiled_code_cache(self):
+        code = "transformed_df = df.rename(columns={'a': 'b'})\n"
+        compiled_code = CompiledCodeCache.get_compiled_code(code)
+        self.assertIs(CompiledCodeCache.get_compiled_code(code), compiled_code)
+        self.assertEqual(CompiledCodeCache.get_size(), 1)
+
+        for i in range(3):
+            dataframe = pd.DataFrame({"a": [i]})
+            results = CodeExecutor().execute(code, {"df": dataframe}, ["transformed_df"])
+            self.assertEqual(results["transformed_df"]["b"].tolist(), [i])
+        self.assertEqual(CompiledCodeCache.get_size(), 1)
+
+        # invalid code is not cached, the error points to the generated code
+        with self.assertRaises(CodeExecutionError) as context:
+            CodeExecutor().execute("transformed_df = (\n", {}, ["transformed_df"])
+        self.assertIn('File "<string>"', context.exception.stack_trace)
+        self.assertIn("SyntaxError", context.exception.stack_trace)
+        self.assertEqual(CompiledCodeCache.get_size(), 1)
+
+    @skipIf(not os.getenv("RUN_BENCHMARKS"), "Benchmark, set the RUN_BENCHMARKS environment variable to run it")
+    def test_compiled_code_cache_benchmark(self):
+        """Compare the replay of the same code with and without compilation."""
+        code = "\n".join(f"value_{i} = sum(range({i})) + len('{'x' * 50}')" for i in range(200))
+        run_count = 200
+
+        start = time.perf_counter()
+        for _ in range(run_count):
+            exec(code, {})
+        exec_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(run_count):
+            exec(CompiledCodeCache.get_compiled_code(code), {})
+        cached_duration = time.perf_counter() - start
+
+        # the compilation is most of the time of this code
+        self.assertLess(cached_duration, exec_duration / 2)
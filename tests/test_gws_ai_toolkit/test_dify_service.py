@@ -0,0 +1,209 @@
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from gws_ai_toolkit.rag.common.base_rag_app_service import BaseRagAppService
+from gws_ai_toolkit.rag.dify.dify_class import (
+    DifyCreateDatasetMetadataRequest,
+    DifyDatasetDocument,
+    DifyGetDatasetMetadataResponse,
+    DifyGetDatasetMetadataResponseMetadata,
+    DifyGetDocumentsResponse,
+    DifyUpdateDocumentsMetadataRequest,
+)
+from gws_ai_toolkit.rag.dify.dify_service import DifyRetry, DifyService
+from gws_ai_toolkit.rag.dify.rag_dify_service import RagDifyService
+
+
+class FakePagesDifyService(DifyService):
+    """DifyService that returns fake document pages."""
+
+    def __init__(self, document_count: int):
+        super().__init__("https://dify.test.com/v1", "key")
+        self.document_count = document_count
+        self.requested_pages: list[int] = []
+
+    def get_document_page(self, dataset_id: str, page: int, limit: int) -> DifyGetDocumentsResponse:
+        self.requested_pages.append(page)
+        start = (page - 1) * limit
+        end = min(start + limit, self.document_count)
+        documents = [self._create_document(str(i)) for i in range(start, end)]
+        return DifyGetDocumentsResponse(
+            data=documents,
+            has_more=end < self.document_count,
+            limit=limit,
+            total=self.document_count,
+            page=page,
+        )
+
+    def _create_document(self, id_: str) -> DifyDatasetDocument:
+        return DifyDatasetDocument(
+            id=id_, position=0, data_source_type="upload_file", data_source_info={},
+            dataset_process_rule_id="rule", name=f"doc_{id_}", created_from="api", created_by="user",
+            created_at=0, tokens=10, indexing_status="completed", enabled=True, archived=False,
+        )
+
+
+class FakeMetadataDifyService(DifyService):
+    """DifyService that stores the dataset metadata and counts the metadata calls."""
+
+    def __init__(self):
+        super().__init__("https://dify.test.com/v1", "key")
+        self.metadata_names: list[str] = ["existing"]
+        self.get_metadata_calls = 0
+        self.update_calls: list[list[DifyUpdateDocumentsMetadataRequest]] = []
+        self.deleted_document_ids: list[str] = []
+
+    def get_dataset_all_metadata(self, dataset_id: str) -> DifyGetDatasetMetadataResponse:
+        self.get_metadata_calls += 1
+        return DifyGetDatasetMetadataResponse(
+            doc_metadata=[
+                DifyGetDatasetMetadataResponseMetadata(id=f"id_{name}", name=name, type="string", count=0)
+                for name in self.metadata_names
+            ],
+            built_in_field_enabled=False,
+        )
+
+    def create_dataset_metadata(self, dataset_id: str, metadata: DifyCreateDatasetMetadataRequest):
+        self.metadata_names.append(metadata.name)
+
+    def update_document_metadata(self, dataset_id: str, body: list[DifyUpdateDocumentsMetadataRequest]) -> None:
+        self.update_calls.append(body)
+
+    def delete_document(self, dataset_id: str, document_id: str) -> None:
+        self.deleted_document_ids.append(document_id)
+
+
+# test_dify_service.py
+class TestDifyService(TestCase):
+    """Test the HTTP layer of DifyService (no call to Dify)."""
+
+    def test_retry_policy(self):
+        retry = DifyRetry(
+            total=3, status_forcelist=DifyRetry.RETRY_STATUS_CODES, allowed_methods=None
+        )
+
+        # GET and DELETE are retried on all the retry status codes
+        self.assertTrue(retry.is_retry("GET", 429))
+        self.assertTrue(retry.is_retry("GET", 502))
+        self.assertTrue(retry.is_retry("DELETE", 500))
+        self.assertFalse(retry.is_retry("GET", 404))
+
+        # POST is only retried when the request was not processed
+        self.assertTrue(retry.is_retry("POST", 429))
+        self.assertTrue(retry.is_retry("POST", 503))
+        self.assertFalse(retry.is_retry("POST", 500))
+
+        # the policy is kept when urllib3 creates the next retry object
+        self.assertIsInstance(retry.increment("GET", "/test"), DifyRetry)
+
+    def test_session_is_shared(self):
+        service_1 = DifyService("https://dify.test.com/v1", "key_1")
+        service_2 = DifyService("https://dify.test.com/v1", "key_2")
+        service_3 = DifyService("https://dify.test.com/v1", "key_1", pool_size=20)
+
+        self.assertIs(service_1._get_session(), service_2._get_session())
+        self.assertIsNot(service_1._get_session(), service_3._get_session())
+
+    def test_latency_stats(self):
+        DifyService.reset_latency_stats()
+
+        DifyService._record_latency("get_document", 0.2, False)
+        DifyService._record_latency("get_document", 0.4, True)
+
+        stats = DifyService.get_latency_stats()["get_document"]
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(stats.error_count, 1)
+        self.assertAlmostEqual(stats.max_seconds, 0.4)
+        self.assertAlmostEqual(stats.get_average_seconds(), 0.3)
+
+        DifyService.reset_latency_stats()
+        self.assertEqual(DifyService.get_latency_stats(), {})
+
+    def test_iter_documents(self):
+        service = FakePagesDifyService(document_count=450)
+
+        documents = service.get_all_documents("dataset")
+
+        # all the documents are returned in page order
+        self.assertEqual([doc.id for doc in documents], [str(i) for i in range(450)])
+        self.assertEqual(sorted(service.requested_pages), [1, 2, 3, 4, 5])
+
+        # single page
+        service = FakePagesDifyService(document_count=20)
+        self.assertEqual(len(service.get_all_documents("dataset")), 20)
+        self.assertEqual(service.requested_pages, [1])
+
+    def test_iter_documents_is_lazy(self):
+        service = FakePagesDifyService(document_count=1000)
+
+        # consume the first page only, the next pages are not requested
+        iterator = service.iter_documents("dataset", max_workers=1)
+        first_page = [next(iterator) for _ in range(DifyService.DOCUMENT_PAGE_LIMIT)]
+        self.assertEqual([doc.id for doc in first_page], [str(i) for i in range(DifyService.DOCUMENT_PAGE_LIMIT)])
+        iterator.close()
+        self.assertEqual(service.requested_pages, [1])
+
+        # stopping the iteration during the second page cancels the pending pages, only the
+        # page fetched by the single worker can be requested
+        service = FakePagesDifyService(document_count=1000)
+        iterator = service.iter_documents("dataset", max_workers=1)
+        for _ in range(DifyService.DOCUMENT_PAGE_LIMIT + 1):
+            next(iterator)
+        iterator.close()
+        self.assertIn(service.requested_pages, ([1, 2], [1, 2, 3]))
+
+    def test_bulk_update_documents_metadata(self):
+        rag_service = RagDifyService("https://dify.test.com/v1", "key")
+        fake_service = FakeMetadataDifyService()
+        rag_service._dify_service = fake_service
+        rag_service.METADATA_UPDATE_BATCH_SIZE = 2
+
+        documents_metadata = {f"doc_{i}": {"existing": "a", "new": str(i)} for i in range(5)}
+        rag_service.update_documents_metadata("dataset", documents_metadata)
+
+        # the missing metadata is created and the metadata list is loaded before and after the creation
+        self.assertEqual(fake_service.metadata_names, ["existing", "new"])
+        self.assertEqual(fake_service.get_metadata_calls, 2)
+
+        # one request per batch of documents
+        self.assertEqual([len(body) for body in fake_service.update_calls], [2, 2, 1])
+        first_request = fake_service.update_calls[0][0]
+        self.assertEqual(first_request.document_id, "doc_0")
+        self.assertEqual(
+            {(meta.id, meta.value) for meta in first_request.metadata_list},
+            {("id_existing", "a"), ("id_new", "0")},
+        )
+
+        # the metadata ids are cached for the next documents
+        rag_service.update_document_metadata("dataset", "doc_5", {"new": "5"})
+        self.assertEqual(fake_service.get_metadata_calls, 2)
+        self.assertEqual(len(fake_service.update_calls), 4)
+
+    def test_send_resources_metadata_error(self):
+        rag_service = RagDifyService("https://dify.test.com/v1", "key")
+        fake_service = FakeMetadataDifyService()
+        rag_service._dify_service = fake_service
+        app_service = BaseRagAppService(rag_service, "dataset")
+        rag_resources = [SimpleNamespace(resource_model=SimpleNamespace(id=str(i))) for i in range(3)]
+
+        def get_document_metadata(rag_resource) -> dict[str, str]:
+            if rag_resource.resource_model.id == "1":
+                raise ValueError("Metadata error")
+            return {"existing": rag_resource.resource_model.id}
+
+        with patch.object(
+            app_service,
+            "_upload_resource_document",
+            side_effect=lambda rag_resource, _: SimpleNamespace(id=f"doc_{rag_resource.resource_model.id}"),
+        ), patch.object(
+            app_service, "get_document_metadata_before_sync", side_effect=get_document_metadata
+        ), patch.object(app_service, "_mark_resource_as_sent_to_rag") as mark_resource_as_sent_to_rag:
+            errors = app_service.send_resources_to_rag(rag_resources, None)
+
+        # only the resource with the metadata error fails, the other metadata are updated at once
+        self.assertEqual(list(errors.keys()), ["1"])
+        self.assertEqual(fake_service.deleted_document_ids, ["doc_1"])
+        self.assertEqual(len(fake_service.update_calls), 1)
+        self.assertEqual([request.document_id for request in fake_service.update_calls[0]], ["doc_0", "doc_2"])
+        self.assertEqual(mark_resource_as_sent_to_rag.call_count, 2)
@@ -1,6 +1,10 @@
 import os
 import tempfile
+import threading
+import time
 import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
 
 from gws_ai_toolkit import DownloadBricksDocumentation
 from gws_ai_toolkit.core.community_dto import (
@@ -11,6 +15,10 @@ from gws_ai_toolkit.core.community_dto import (
 from gws_ai_toolkit.services.community_resource_files_manager_service import (
     CommunityResourceFilesManagerService,
 )
+from gws_ai_toolkit.services.ragflow_upload_pipeline import RagFlowUploadPipeline
+from gws_ai_toolkit.tasks.download_and_push_community_to_ragflow import (
+    DownloadAndPushCommunityToRagFlow,
+)
 from gws_ai_toolkit.tasks.download_community_stories import DownloadCommunityStories
 from gws_ai_toolkit.tasks.push_resources_to_ragflow import PushResourcesToRagFlow
 from gws_core import BaseTestCase, File, JSONDict, Tag
@@ -284,3 +292,184 @@ class TestPushResourcesToRagFlow(BaseTestCase):
 
         # Verify that the download_result input is of type JSONDict
         self.assertIn(JSONDict, download_result_spec.resource_types)
+
+
+class TestDownloadAndPushCommunityToRagFlow(BaseTestCase):
+    """
+    Test the DownloadAndPushCommunityToRagFlow task.
+
+    Tests verify that the pipelined task reuses the download tasks and
+    outputs an upload report.
+    """
+
+    def test_task_reuses_download_tasks(self):
+        """
+        Test that the pipelined task inherits the download logic and overrides the file hook.
+        """
+        self.assertTrue(issubclass(DownloadAndPushCommunityToRagFlow, DownloadBricksDocumentation))
+        self.assertTrue(issubclass(DownloadAndPushCommunityToRagFlow, DownloadCommunityStories))
+
+        # The hook is a no-op in the download tasks and overridden in the pipelined task
+        self.assertIsNot(
+            DownloadAndPushCommunityToRagFlow._on_community_file_ready,
+            DownloadBricksDocumentation._on_community_file_ready,
+        )
+
+    def test_task_outputs_upload_report(self):
+        """
+        Test that the pipelined task outputs the upload report.
+        """
+        self.assertIn("upload_report", DownloadAndPushCommunityToRagFlow.output_specs._specs)
+        self.assertIn("queue_size", DownloadAndPushCommunityToRagFlow.config_specs.specs)
+
+
+class _FakeRagResource:
+    """RagResource without database, the resources are never synced"""
+
+    def __init__(self, resource_model):
+        self.resource_model = resource_model
+        self.marked_from_thread = None
+
+    def is_synced_with_rag(self) -> bool:
+        return False
+
+    def is_up_to_date_in_rag(self) -> bool:
+        return False
+
+    def is_compatible_with_rag(self) -> bool:
+        return True
+
+    def get_file(self):
+        return SimpleNamespace(path=f"/tmp/{self.resource_model.id}.md", get_name=lambda: f"{self.resource_model.id}.md")
+
+    def mark_resource_as_sent_to_rag(self, document_id: str, dataset_id: str) -> None:
+        self.marked_from_thread = threading.current_thread()
+
+    def clear_tmp_dir(self) -> None:
+        pass
+
+    def get_id(self) -> str:
+        return self.resource_model.id
+
+
+class _FakeRagFlowService:
+    """RagFlowService recording the uploads, the upload can fail or block until released"""
+
+    def __init__(self, fail: bool = False, blocking: bool = False):
+        self.fail = fail
+        self.uploaded_files: list[str] = []
+        self.upload_started = threading.Event()
+        self.release = threading.Event()
+        if not blocking:
+            self.release.set()
+
+    def upload_document(self, doc_paths: str, dataset_id: str, filename: str):
+        self.upload_started.set()
+        self.release.wait(5)
+        self.uploaded_files.append(filename)
+        if self.fail:
+            raise Exception("Upload failed")
+        return SimpleNamespace(id=f"doc_{filename}")
+
+    def parse_documents(self, dataset_id: str, document_ids: list[str]) -> None:
+        pass
+
+
+class _FakeLogger:
+    """Task logger recording the thread of each message"""
+
+    def __init__(self):
+        self.threads: list[threading.Thread] = []
+
+    def _log(self, message: str) -> None:
+        self.threads.append(threading.current_thread())
+
+    log_info_message = log_success_message = log_warning_message = log_error_message = _log
+
+
+@patch("gws_ai_toolkit.services.ragflow_upload_pipeline.RagResource", _FakeRagResource)
+class TestRagFlowUploadPipeline(unittest.TestCase):
+    """
+    Test the streaming mode of the RagFlowUploadPipeline with a fake RagFlow service.
+    """
+
+    def test_submit_and_close(self):
+        """
+        Test that the submitted resources are uploaded once and that the logs and the
+        database operations are made on the caller thread.
+        """
+        service = _FakeRagFlowService()
+        logger = _FakeLogger()
+        pipeline = RagFlowUploadPipeline(service, "dataset", logger=logger)
+
+        resource_models = [self._create_resource_model(f"resource_{i}") for i in range(3)]
+        pipeline.start()
+        for resource_model in resource_models:
+            pipeline.submit(resource_model)
+        # the same resource submitted twice is uploaded once
+        pipeline.submit(resource_models[0])
+        results = pipeline.close()
+
+        self.assertEqual(len(results["uploaded"]), 3)
+        self.assertEqual(results["failed"], [])
+        self.assertEqual(sorted(service.uploaded_files), ["resource_0.md", "resource_1.md", "resource_2.md"])
+
+        # the worker logs (upload, parsing) are emitted from the caller thread
+        self.assertGreater(len(logger.threads), 3)
+        self.assertEqual(set(logger.threads), {threading.current_thread()})
+
+    def test_stop_after_max_errors(self):
+        """
+        Test that the resources are not uploaded anymore once max_errors uploads failed.
+        """
+        service = _FakeRagFlowService(fail=True)
+        pipeline = RagFlowUploadPipeline(service, "dataset", max_errors=2)
+
+        pipeline.start()
+        pipeline.submit(self._create_resource_model("resource_0"))
+        pipeline.submit(self._create_resource_model("resource_1"))
+        self._wait_for(lambda: pipeline._result_queue.qsize() == 2)
+
+        pipeline.submit(self._create_resource_model("resource_2"))
+        results = pipeline.close()
+
+        self.assertTrue(pipeline.max_errors_reached())
+        self.assertEqual(len(results["failed"]), 2)
+        self.assertEqual(results["uploaded"], [])
+        self.assertEqual(service.uploaded_files, ["resource_0.md", "resource_1.md"])
+
+    def test_submit_blocks_when_queue_is_full(self):
+        """
+        Test that submit blocks when queue_size uploads are waiting.
+        """
+        service = _FakeRagFlowService(blocking=True)
+        pipeline = RagFlowUploadPipeline(service, "dataset", queue_size=1)
+
+        pipeline.start()
+        pipeline.submit(self._create_resource_model("resource_0"))
+        # the first upload is running, the second one fills the queue
+        self.assertTrue(service.upload_started.wait(5))
+        pipeline.submit(self._create_resource_model("resource_1"))
+
+        producer = threading.Thread(target=pipeline.submit, args=(self._create_resource_model("resource_2"),))
+        producer.start()
+        producer.join(0.2)
+        self.assertTrue(producer.is_alive())
+
+        service.release.set()
+        producer.join(5)
+        self.assertFalse(producer.is_alive())
+
+        results = pipeline.close()
+        self.assertEqual(len(results["uploaded"]), 3)
+
+    def _create_resource_model(self, id_: str) -> SimpleNamespace:
+        resource = SimpleNamespace(name=id_)
+        return SimpleNamespace(id=id_, get_resource=lambda: resource)
+
+    def _wait_for(self, condition) -> None:
+        deadline = time.monotonic() + 5
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail("Timeout while waiting for the pipeline")
+            time.sleep(0.01)
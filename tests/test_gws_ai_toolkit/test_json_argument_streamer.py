@@ -0,0 +1,48 @@
+import json
+from unittest import TestCase
+
+from gws_ai_toolkit.core.agents.json_argument_streamer import JsonArgumentStreamer
+
+
+def stream_argument(arguments: str, chunk_size: int, argument_name: str = "code") -> tuple[str, JsonArgumentStreamer]:
+    streamer = JsonArgumentStreamer(argument_name)
+    parts = [streamer.feed(arguments[i: i + chunk_size]) for i in range(0, len(arguments), chunk_size)]
+    return "".join(parts), streamer
+
+
+# test_json_argument_streamer.py
+class TestJsonArgumentStreamer(TestCase):
+    """Test the incremental parsing of the JSON arguments of the function calls."""
+
+    def test_stream_code_argument(self):
+        code = 'import pandas as pd\n\tdf["col \\"a\\""] = df["b"].apply(lambda x: x / 2)  # é 😀  '
+        arguments = json.dumps(
+            {"plot_name": "A \"code\" plot", "options": {"code": "not this one", "list": ["code", "{"]}, "code": code},
+        )
+
+        # the ASCII dump escapes the non ASCII characters (\uXXXX and surrogate pairs)
+        for dumped in [arguments, json.dumps(json.loads(arguments), ensure_ascii=False)]:
+            for chunk_size in [1, 2, 3, 5, 7, 1000]:
+                streamed_code, streamer = stream_argument(dumped, chunk_size)
+
+                self.assertEqual(streamed_code, code)
+                self.assertEqual(streamer.get_keys(), ["plot_name", "options", "code"])
+                self.assertTrue(streamer.is_argument_complete())
+                self.assertTrue(streamer.is_complete())
+
+    def test_missing_argument(self):
+        streamed_code, streamer = stream_argument('{"plot_name": "Plot", "code_2": "x"', 4)
+
+        self.assertEqual(streamed_code, "")
+        self.assertFalse(streamer.has_argument())
+        self.assertFalse(streamer.is_complete())
+
+    def test_partial_argument(self):
+        streamer = JsonArgumentStreamer("code")
+
+        self.assertEqual(streamer.feed('{"code": "print('), "print(")
+        self.assertTrue(streamer.has_argument())
+        self.assertFalse(streamer.is_argument_complete())
+        self.assertEqual(streamer.feed("1)\\"), "1)")
+        self.assertEqual(streamer.feed('n"'), "\n")
+        self.assertTrue(streamer.is_argument_complete())
@@ -0,0 +1,256 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from collections.abc import Generator
+
+from gws_ai_toolkit.core.agents.base_function_agent_ai import BaseFunctionAgentAi
+from gws_ai_toolkit.core.agents.base_function_agent_events import (
+    CodeDeltaEvent,
+    FunctionCallEvent,
+    FunctionSuccessEvent,
+    ResponseCompletedEvent,
+    ResponseFullTextEvent,
+    ResponseStatsEvent,
+    UserQueryTextEvent,
+)
+from gws_ai_toolkit.core.agents.openai_stream_recording import (
+    OpenAiStreamRecording,
+    RecordingOpenAiClient,
+    ReplayOpenAiClient,
+)
+from gws_ai_toolkit.core.openai_client_registry import OpenAiClientRegistry
+
+
+def create_session_responses() -> list[dict]:
+    """Create the responses of a session where the agent calls the add function then answers."""
+    function_call_response = [
+        {"type": "response.created", "sequence_number": 0, "response": {"id": "resp_1"}},
+        {
+            "type": "response.output_item.done",
+            "sequence_number": 1,
+            "output_index": 0,
+            "item": {
+                "type": "function_call",
+                "id": "fc_1",
+                "call_id": "call_1",
+                "name": "add",
+                "arguments": json.dumps({"a": 1, "b": 2}),
+                "status": "completed",
+            },
+        },
+        {
+            "type": "response.completed",
+            "sequence_number": 2,
+            "response": {
+                "id": "resp_1",
+                "usage": {
+                    "input_tokens": 100,
+                    "input_tokens_details": {"cached_tokens": 80},
+                    "output_tokens": 20,
+                    "output_tokens_details": {"reasoning_tokens": 0},
+                    "total_tokens": 120,
+                },
+            },
+        },
+    ]
+
+    text_response = [{"type": "response.created", "sequence_number": 0, "response": {"id": "resp_2"}}]
+    for i, delta in enumerate(["The ", "result ", "is ", "3"]):
+        text_response.append({
+            "type": "response.output_text.delta",
+            "sequence_number": i + 1,
+            "item_id": "msg_1",
+            "output_index": 0,
+            "content_index": 0,
+            "delta": delta,
+            "logprobs": [],
+        })
+    text_response.append({"type": "response.completed", "sequence_number": 5, "response": {"id": "resp_2"}})
+
+    return [
+        {"request_key": "", "events": function_call_response},
+        {"request_key": "", "events": text_response},
+    ]
+
+
+class AddAgentAi(BaseFunctionAgentAi):
+    """Agent with an add function."""
+
+    def __init__(self, openai_api_key: str, function_delay: float = 0):
+        super().__init__(openai_api_key, "gpt-4o", 0.0)
+        self.function_delay = function_delay
+
+    def _handle_function_call(self, function_call_event: FunctionCallEvent, user_query) -> Generator:
+        time.sleep(self.function_delay)
+        arguments = function_call_event.arguments
+        yield FunctionSuccessEvent(
+            function_response=str(arguments["a"] + arguments["b"]),
+            call_id=function_call_event.call_id,
+            response_id=function_call_event.response_id,
+            agent_id=self.id,
+        )
+
+    def _get_ai_instruction(self, user_query) -> str:
+        return "Use the add function to compute the sums."
+
+    def _get_tools(self) -> list[dict]:
+        return [{
+            "type": "function",
+            "name": "add",
+            "description": "Add 2 numbers",
+            "parameters": {
+                "type": "object",
+                "properties": {"a": {"type": "number"}, "b": {"type": "number"}},
+                "required": ["a", "b"],
+            },
+        }]
+
+
+# test_openai_stream_recording.py
+class TestOpenAiStreamRecording(unittest.TestCase):
+    """Test the recording and the offline replay of the OpenAI responses of an agent session."""
+
+    API_KEY = "replay_test_key"
+
+    def tearDown(self):
+        OpenAiClientRegistry.unregister_client(self.API_KEY)
+
+    def _call_agent(self, agent: AddAgentAi | None = None) -> list:
+        agent = agent or AddAgentAi(self.API_KEY)
+        return list(agent.call_agent(UserQueryTextEvent(query="What is 1 + 2?", agent_id=agent.id)))
+
+    def _record_session(self) -> OpenAiStreamRecording:
+        # the scripted responses stand for the OpenAI API
+        api_client = ReplayOpenAiClient(OpenAiStreamRecording(create_session_responses()), match_requests=False)
+        recording = OpenAiStreamRecording()
+        OpenAiClientRegistry.register_client(RecordingOpenAiClient(api_client, recording), self.API_KEY)
+
+        self._call_agent()
+        return recording
+
+    def test_record_and_replay(self):
+        recording = self._record_session()
+        self.assertEqual(recording.get_responses_count(), 2)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "session.json")
+            recording.save(file_path)
+            loaded_recording = OpenAiStreamRecording.load(file_path)
+
+        OpenAiClientRegistry.register_client(ReplayOpenAiClient(loaded_recording), self.API_KEY)
+        events = self._call_agent()
+
+        function_success = [event for event in events if isinstance(event, FunctionSuccessEvent)]
+        self.assertEqual(len(function_success), 1)
+        self.assertEqual(function_success[0].function_response, "3")
+        full_texts = [event for event in events if isinstance(event, ResponseFullTextEvent)]
+        self.assertEqual(full_texts[-1].text, "The result is 3")
+        self.assertEqual(loaded_recording.get_responses_count(), 0)
+
+    def test_response_stats(self):
+        recording = self._record_session()
+        OpenAiClientRegistry.register_client(ReplayOpenAiClient(recording), self.API_KEY)
+
+        agent = AddAgentAi(self.API_KEY, function_delay=0.05)
+        events = self._call_agent(agent)
+
+        stats_events = [event for event in events if isinstance(event, ResponseStatsEvent)]
+        self.assertEqual(len(stats_events), 2)
+        # the stats are emitted just before the end of the response
+        stats_index = events.index(stats_events[0])
+        self.assertIsInstance(events[stats_index + 1], ResponseCompletedEvent)
+
+        function_stats, text_stats = stats_events
+        self.assertEqual(function_stats.input_tokens, 100)
+        self.assertEqual(function_stats.cached_tokens, 80)
+        self.assertEqual(function_stats.output_tokens, 20)
+        self.assertEqual(function_stats.function_call_count, 1)
+        self.assertGreaterEqual(function_stats.function_duration, 0.05)
+        self.assertIsNone(function_stats.time_to_first_delta)
+        # no usage in the second recorded response
+        self.assertEqual(text_stats.input_tokens, 0)
+        self.assertIsNotNone(text_stats.time_to_first_delta)
+        self.assertEqual(text_stats.function_duration, 0)
+
+        session_stats = agent.get_session_stats()
+        self.assertEqual(session_stats.total.response_count, 2)
+        self.assertEqual(session_stats.total.input_tokens, 100)
+        self.assertEqual(session_stats.total.function_call_count, 1)
+        self.assertEqual(len(session_stats.agents), 1)
+        self.assertEqual(session_stats.agents[0].agent_id, agent.id)
+        self.assertEqual(session_stats.agents[0].depth, 0)
+
+    def test_code_delta_events(self):
+        arguments = json.dumps({"code": "result = a + b\nprint(result)", "a": 1, "b": 2})
+        item = {"type": "function_call", "id": "fc_1", "call_id": "call_1", "name": "add", "arguments": ""}
+        events = [
+            {"type": "response.created", "sequence_number": 0, "response": {"id": "resp_1"}},
+            {"type": "response.output_item.added", "sequence_number": 1, "output_index": 0, "item": item},
+        ]
+        for i in range(0, len(arguments), 6):
+            events.append({
+                "type": "response.function_call_arguments.delta",
+                "sequence_number": len(events),
+                "item_id": "fc_1",
+                "output_index": 0,
+                "delta": arguments[i: i + 6],
+            })
+        events.append({
+            "type": "response.output_item.done",
+            "sequence_number": len(events),
+            "output_index": 0,
+            "item": {**item, "arguments": arguments, "status": "completed"},
+        })
+        events.append({"type": "response.completed", "sequence_number": len(events), "response": {"id": "resp_1"}})
+
+        responses = [{"request_key": "", "events": events}, create_session_responses()[1]]
+        OpenAiClientRegistry.register_client(
+            ReplayOpenAiClient(OpenAiStreamRecording(responses), match_requests=False), self.API_KEY
+        )
+        agent = AddAgentAi(self.API_KEY)
+        agent_events = self._call_agent(agent)
+
+        code_deltas = [event for event in agent_events if isinstance(event, CodeDeltaEvent)]
+        self.assertGreater(len(code_deltas), 1)
+        self.assertEqual("".join(event.delta for event in code_deltas), "result = a + b\nprint(result)")
+        self.assertEqual({(event.call_id, event.function_name) for event in code_deltas}, {("call_1", "add")})
+        # the code deltas are received before the function call and are not stored
+        function_call_index = next(i for i, event in enumerate(agent_events) if isinstance(event, FunctionCallEvent))
+        self.assertLess(agent_events.index(code_deltas[-1]), function_call_index)
+        self.assertIsNone(agent.get_events().last_event(CodeDeltaEvent))
+
+    def test_replay_unknown_request(self):
+        recording = self._record_session()
+
+        # change the request of the first call
+        class OtherAgentAi(AddAgentAi):
+            def _get_ai_instruction(self, user_query) -> str:
+                return "Other instructions"
+
+        OpenAiClientRegistry.register_client(ReplayOpenAiClient(recording), self.API_KEY)
+        agent = OtherAgentAi(self.API_KEY)
+        with self.assertRaises(ValueError):
+            list(agent.call_agent(UserQueryTextEvent(query="What is 1 + 2?", agent_id=agent.id)))
+
+    @unittest.skipIf(
+        not os.getenv("RUN_BENCHMARKS"), "Benchmark, set the RUN_BENCHMARKS environment variable to run it"
+    )
+    def test_replay_benchmark(self):
+        """Measure the agent orchestration overhead on a replayed session (no network), the
+        replayed sessions must be identical and take less than 50 ms each."""
+        recording_dict = self._record_session().to_json_dict()
+
+        run_count = 200
+        event_types: set[tuple[str, ...]] = set()
+        start = time.perf_counter()
+        for _ in range(run_count):
+            OpenAiClientRegistry.register_client(
+                ReplayOpenAiClient(OpenAiStreamRecording.from_json_dict(recording_dict)), self.API_KEY
+            )
+            event_types.add(tuple(type(event).__name__ for event in self._call_agent()))
+        duration = time.perf_counter() - start
+
+        self.assertEqual(len(event_types), 1)
+        self.assertLess(duration / run_count, 0.05)
@@ -0,0 +1,120 @@
+import os
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from gws_ai_toolkit.core.agents.table.plotly_figure_decimator import PlotlyFigureDecimator
+
+
+# test_plotly_figure_decimator.py
+class TestPlotlyFigureDecimator(unittest.TestCase):
+    """Test the decimation of the figures generated on large tables."""
+
+    def test_small_figure(self):
+        figure = go.Figure(go.Scatter(x=np.arange(100), y=np.arange(100)))
+        self.assertIs(PlotlyFigureDecimator().decimate(figure), figure)
+
+    def test_webgl(self):
+        figure = go.Figure(go.Scatter(x=np.arange(10000), y=np.arange(10000), mode="markers"))
+        figure.update_layout(title="Title")
+
+        decimated_figure = PlotlyFigureDecimator().decimate(figure)
+
+        self.assertIs(decimated_figure, figure)
+        self.assertEqual(decimated_figure.data[0].type, "scattergl")
+        self.assertEqual(len(decimated_figure.data[0].y), 10000)
+        self.assertEqual(decimated_figure.layout.title.text, "Title")
+
+    def test_line_decimation(self):
+        point_count = 1_000_000
+        y = np.sin(np.arange(point_count) / 1000)
+        y[123456] = 50
+        y[654321] = -50
+        y[500000:500010] = np.nan
+        dates = pd.date_range("2020-01-01", periods=point_count, freq="min")
+        figure = go.Figure(go.Scatter(
+            x=dates,
+            y=y,
+            mode="lines",
+            text=[f"point {i}" for i in range(point_count)],
+        ))
+
+        decimated_figure = PlotlyFigureDecimator(line_bucket_count=1000).decimate(figure)
+
+        trace = decimated_figure.data[0]
+        self.assertEqual(trace.type, "scattergl")
+        self.assertLessEqual(len(trace.y), 5000)
+        # the peaks, the gap and the ends of the line are kept
+        self.assertEqual(np.nanmax(trace.y), 50)
+        self.assertEqual(np.nanmin(trace.y), -50)
+        self.assertTrue(np.isnan(trace.y).any())
+        self.assertEqual(trace.y[0], y[0])
+        self.assertEqual(trace.y[-1], y[-1])
+        # the texts are decimated with the points
+        self.assertEqual(len(trace.text), len(trace.y))
+        peak_index = int(np.argmax(trace.y == 50))
+        self.assertEqual(trace.text[peak_index], "point 123456")
+        self.assertEqual(np.asarray(trace.x)[peak_index], dates[123456].to_datetime64())
+
+    def test_scatter_binning(self):
+        point_count = 2_000_000
+        rng = np.random.default_rng(0)
+        x = rng.normal(size=point_count)
+        y = rng.normal(size=point_count)
+        colors = np.arange(point_count)
+        figure = go.Figure(go.Scatter(x=x, y=y, mode="markers", marker={"color": colors, "colorscale": "Viridis"}))
+
+        decimated_figure = PlotlyFigureDecimator(scatter_grid_size=200).decimate(figure)
+
+        trace = decimated_figure.data[0]
+        self.assertEqual(trace.type, "scattergl")
+        self.assertLessEqual(len(trace.x), 200 * 200)
+        self.assertEqual(len(trace.marker.color), len(trace.x))
+        self.assertEqual(trace.marker.colorscale, go.Scatter(marker={"colorscale": "Viridis"}).marker.colorscale)
+        # the kept points are points of the figure with their color
+        kept_indexes = np.asarray(trace.marker.color)
+        np.testing.assert_array_equal(np.asarray(trace.x), x[kept_indexes])
+        np.testing.assert_array_equal(np.asarray(trace.y), y[kept_indexes])
+        # the extreme points are kept
+        self.assertEqual(np.max(trace.x), np.max(x))
+        self.assertEqual(np.min(trace.y), np.min(y))
+
+    def test_not_decimated_traces(self):
+        point_count = 50000
+        # unsorted line and categorical values are only drawn with WebGL
+        unsorted_line = go.Scatter(x=np.random.default_rng(0).random(point_count), y=np.arange(point_count))
+        categories = go.Scatter(
+            x=np.arange(point_count), y=np.array(["a", "b"] * (point_count // 2), dtype=object), mode="markers"
+        )
+        histogram = go.Histogram(x=np.arange(point_count))
+        figure = go.Figure([unsorted_line, categories, histogram])
+
+        decimated_figure = PlotlyFigureDecimator().decimate(figure)
+
+        self.assertEqual([trace.type for trace in decimated_figure.data], ["scattergl", "scattergl", "histogram"])
+        self.assertEqual([len(trace.x) for trace in decimated_figure.data], [point_count] * 3)
+
+    @unittest.skipIf(
+        not os.getenv("RUN_BENCHMARKS"), "Benchmark, set the RUN_BENCHMARKS environment variable to run it"
+    )
+    def test_decimation_benchmark(self):
+        """Compare the size and the serialization time of a scatter plot of 2M points with and
+        without decimation."""
+        point_count = 2_000_000
+        rng = np.random.default_rng(0)
+        figure = go.Figure(go.Scatter(x=rng.normal(size=point_count), y=rng.normal(size=point_count), mode="markers"))
+
+        start = time.perf_counter()
+        full_json = figure.to_json()
+        full_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decimated_json = PlotlyFigureDecimator().decimate(figure).to_json()
+        decimated_duration = time.perf_counter() - start
+
+        # the decimated figure depends on the grid size, not on the number of points
+        self.assertLess(len(decimated_json), len(full_json) / 10)
+        self.assertLess(decimated_duration, full_duration)
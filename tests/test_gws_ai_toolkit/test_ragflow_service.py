@@ -291,3 +291,53 @@ class TestRagFlowService(TestCase):
                     self.service.delete_sessions(self.test_chat_id, [created_session_id])
                 except Exception as e:
                     print(f"Warning: Failed to clean up created session: {e}")
+
+
+class _FakeStreamResponse:
+    """Response of the completion endpoint, the body is returned in chunks"""
+
+    def __init__(self, body: bytes, chunk_size: int = 16):
+        self._body = body
+        self._chunk_size = chunk_size
+
+    def iter_content(self, chunk_size=None):
+        for i in range(0, len(self._body), self._chunk_size):
+            yield self._body[i: i + self._chunk_size]
+
+
+class TestRagFlowServiceAskStreamReader(TestCase):
+    """Unit tests of the reading of the streamed completion responses (no RagFlow server)."""
+
+    def setUp(self):
+        self.service = RagFlowService(base_url="http://localhost:9380", api_key="key")
+
+    def test_read_stream(self):
+        body = (
+            b'data:{"code": 0, "data": {"answer": "", "start_to_think": true}}\n\n'
+            b'data:{"code": 0, "data": {"answer": "", "end_to_think": true}}\n\n'
+            b'data:{"code": 0, "data": {"answer": "Hello", "reference": {}}}\n\n'
+            b'data:{"code": 0, "data": {"answer": "Hello world", "reference": {"chunks": [{"id": "c1"}]}}}\n\n'
+            b'data:{"code": 0, "data": true}\n\n'
+        )
+
+        responses = list(self.service._read_ask_stream(_FakeStreamResponse(body), "session_1"))
+
+        # the reasoning markers are skipped
+        self.assertEqual([response.content for response in responses], ["Hello", "Hello world"])
+        self.assertEqual(responses[1].reference, [{"id": "c1"}])
+        self.assertEqual(responses[1].session_id, "session_1")
+
+    def test_read_json_error_body(self):
+        body = b'{"code": 102, "message": "chat not found"}'
+
+        with self.assertRaisesRegex(RuntimeError, "chat not found"):
+            list(self.service._read_ask_stream(_FakeStreamResponse(body), "session_1"))
+
+    def test_read_error_event(self):
+        body = (
+            b'data:{"code": 0, "data": {"answer": "Hello"}}\n\n'
+            b'data:{"code": 500, "message": "model error", "data": {"answer": "**ERROR**"}}\n\n'
+        )
+
+        with self.assertRaisesRegex(RuntimeError, "model error"):
+            list(self.service._read_ask_stream(_FakeStreamResponse(body), "session_1"))
@@ -0,0 +1,114 @@
+import json
+import os
+import time
+from unittest import TestCase, skipIf
+
+from gws_ai_toolkit.rag.common.sse_decoder import SseDecoder
+from gws_ai_toolkit.rag.dify.dify_service import DifyService
+
+
+def create_recorded_dify_stream(message_count: int) -> bytes:
+    """Create a synthetic Dify chat stream similar to a recorded one:
+    workflow/node events, pings, message events and a final message_end event."""
+    events: list[dict] = [{"event": "workflow_started", "conversation_id": "conv", "data": {"id": "wf"}}]
+    for i in range(message_count):
+        if i % 20 == 0:
+            events.append({"event": "node_started", "conversation_id": "conv", "data": {"inputs": "x" * 200}})
+            events.append({"event": "node_finished", "conversation_id": "conv", "data": {"outputs": "y" * 200}})
+        events.append({"event": "message", "id": "msg", "conversation_id": "conv", "answer": f"token {i} é "})
+
+    events.append({
+        "event": "message_end",
+        "conversation_id": "conv",
+        "metadata": {"retriever_resources": []},
+    })
+
+    parts: list[bytes] = []
+    for i, event in enumerate(events):
+        if i % 50 == 0:
+            parts.append(b"event: ping\n\n")
+        parts.append(b"data: " + json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n\n")
+    return b"".join(parts)
+
+
+def split_in_chunks(data: bytes, chunk_size: int) -> list[bytes]:
+    return [data[i: i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+
+# test_sse_decoder.py
+class TestSseDecoder(TestCase):
+    """Test the incremental server-sent events decoder used by the Dify and RagFlow streams."""
+
+    def test_split_chunks(self):
+        stream = 'data: {"event": "message", "answer": "héllo"}\n\ndata: {"event": "message_end"}\n\n'.encode()
+
+        for chunk_size in [1, 2, 3, 7, 1000]:
+            decoder = SseDecoder()
+            events = list(decoder.iter_events(split_in_chunks(stream, chunk_size)))
+
+            self.assertEqual(len(events), 2)
+            self.assertEqual(events[0].get_json()["answer"], "héllo")
+            self.assertEqual(events[1].get_type(), "message_end")
+
+    def test_crlf_and_multiline(self):
+        stream = b": comment\r\nevent: update\r\nid: 1\r\ndata: line 1\r\ndata: line 2\r\n\r\ndata:no space\r\n\r\n"
+
+        for chunk_size in [1, 5, 1000]:
+            decoder = SseDecoder()
+            events = list(decoder.iter_events(split_in_chunks(stream, chunk_size)))
+
+            self.assertEqual(len(events), 2)
+            self.assertEqual(events[0].event, "update")
+            self.assertEqual(events[0].id, "1")
+            self.assertEqual(events[0].data, "line 1\nline 2")
+            self.assertEqual(events[1].data, "no space")
+
+    def test_ignored_events(self):
+        stream = (
+            b"event: ping\n\n"
+            b'data: {"event": "node_started", "data": "not a json}\n\n'
+            b'data: {"event": "message", "answer": "a"}\n\n'
+            b"data: [DONE]"
+        )
+        decoder = SseDecoder(ignored_event_types=["ping", "node_started"])
+        events = list(decoder.iter_events([stream]))
+
+        # ignored events are dropped without decoding the JSON, the last event is flushed
+        self.assertEqual([event.data for event in events], ['{"event": "message", "answer": "a"}', "[DONE]"])
+
+    @skipIf(not os.getenv("RUN_BENCHMARKS"), "Benchmark, set the RUN_BENCHMARKS environment variable to run it")
+    def test_decoder_benchmark(self):
+        """Compare the decoder with the previous line by line parsing on a multi-MB stream."""
+        stream = create_recorded_dify_stream(20000)
+        chunks = split_in_chunks(stream, 1024)
+
+        # previous implementation: byte by byte accumulation and JSON decoding of every event
+        start = time.perf_counter()
+        old_answers = []
+        buffer = b""
+        for chunk in chunks:
+            for i in range(len(chunk)):
+                byte = chunk[i: i + 1]
+                buffer += byte
+                if byte == b"\n":
+                    line = buffer.decode("utf-8").strip()
+                    buffer = b""
+                    if line.startswith("data: "):
+                        json_data = json.loads(line[6:])
+                        if json_data["event"] == "message":
+                            old_answers.append(json_data["answer"])
+        old_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new_answers = []
+        decoder = SseDecoder(ignored_event_types=DifyService.STREAM_IGNORED_EVENT_TYPES)
+        for event in decoder.iter_events(chunks):
+            json_data = event.get_json()
+            if json_data["event"] == "message":
+                new_answers.append(json_data["answer"])
+        new_duration = time.perf_counter() - start
+
+        self.assertEqual(new_answers, old_answers)
+        self.assertEqual(len(new_answers), 20000)
+        # the byte by byte parsing is the bottleneck (about 5 times slower)
+        self.assertLess(new_duration, old_duration / 2)
@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from gws_ai_toolkit.core.agents.code_execution_error import CodeExecutionError
+from gws_ai_toolkit.core.agents.subprocess_code_executor import (
+    SubprocessCodeExecutor,
+    SubprocessCodeExecutorPool,
+)
+
+
+# test_subprocess_code_executor.py
+class TestSubprocessCodeExecutor(TestCase):
+    """Test the execution of generated code in the pool of subprocesses."""
+
+    executor = SubprocessCodeExecutor(max_workers=2, timeout=5, cpu_time_limit=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        SubprocessCodeExecutorPool.close_all()
+
+    def test_transform_dataframes(self):
+        dataframe = pd.DataFrame({
+            "name": ["a", "b", "c"],
+            "value": [1.5, 2.5, np.nan],
+            "date": pd.to_datetime(["2024-01-01", "2024-02-01", "2024-03-01"]),
+            # nested values are not converted with Arrow
+            "tags": [["x"], [], ["y", "z"]],
+        })
+        code = (
+            "transformed_df = df.copy()\n"
+            "transformed_df['double'] = df['value'] * 2\n"
+            "result_tables = {'first': tables['t1'].head(1), 'count': pd.DataFrame({'n': [len(tables['t2'])]})}\n"
+        )
+
+        results = self.executor.execute(
+            code,
+            {"pd": pd, "np": np, "df": dataframe, "tables": {"t1": dataframe, "t2": dataframe}},
+            ["transformed_df", "result_tables", "missing"],
+        )
+
+        self.assertEqual(set(results.keys()), {"transformed_df", "result_tables"})
+        expected = dataframe.copy()
+        expected["double"] = dataframe["value"] * 2
+        pd.testing.assert_frame_equal(results["transformed_df"], expected)
+        self.assertEqual(results["result_tables"]["count"]["n"].tolist(), [3])
+        self.assertEqual(results["result_tables"]["first"]["tags"].tolist(), [["x"]])
+
+    def test_plotly_figure(self):
+        dataframe = pd.DataFrame({"name": ["a", "b"], "value": [1, 2]})
+        code = "fig = go.Figure(data=[go.Bar(x=df['name'], y=df['value'])])\n"
+        results = self.executor.execute(code, {"go": go, "df": dataframe}, ["fig"])
+
+        self.assertIsInstance(results["fig"], go.Figure)
+        expected_figure = go.Figure(data=[go.Bar(x=dataframe["name"], y=dataframe["value"])])
+        self.assertEqual(json.loads(results["fig"].to_json())["data"], json.loads(expected_figure.to_json())["data"])
+
+    def test_error_stack_trace(self):
+        with self.assertRaises(CodeExecutionError) as context:
+            self.executor.execute("transformed_df = df['missing']\n", {"df": pd.DataFrame({"a": [1]})}, [])
+
+        self.assertIn("Error executing generated code", context.exception.message)
+        self.assertIn('File "<string>", line 1', context.exception.stack_trace)
+        self.assertIn("KeyError", context.exception.stack_trace)
+
+    def test_limits(self):
+        # infinite loop stopped by the CPU time limit, the worker is still usable
+        start = time.perf_counter()
+        with self.assertRaises(CodeExecutionError) as context:
+            self.executor.execute("while True:\n    pass\n", {}, [])
+        self.assertIn("CPU time limit", context.exception.message)
+        self.assertLess(time.perf_counter() - start, 5)
+
+        # sleeping code doesn't use CPU time, it is stopped by the timeout and the worker is replaced
+        executor = SubprocessCodeExecutor(max_workers=1, timeout=0.5)
+        with self.assertRaises(CodeExecutionError) as context:
+            executor.execute("import time\ntime.sleep(10)\n", {}, [])
+        self.assertIn("took more than", context.exception.message)
+
+        results = executor.execute("result = pd.DataFrame({'value': [1 + 1]})\n", {"pd": pd}, ["result"])
+        self.assertEqual(results["result"]["value"].tolist(), [2])
+
+    def test_parallel_executions(self):
+        self.executor.warm_up()
+        code = "import time\ntime.sleep(0.5)\nresult = pd.DataFrame({'value': [value * 2]})\n"
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=2) as thread_pool:
+            futures = [
+                thread_pool.submit(self.executor.execute, code, {"pd": pd, "value": i}, ["result"]) for i in range(2)
+            ]
+            results = [future.result()["result"]["value"].iloc[0] for future in futures]
+        duration = time.perf_counter() - start
+
+        self.assertEqual(results, [0, 2])
+        # the 2 executions run at the same time in different workers
+        self.assertLess(duration, 0.9)
+
+    def test_column_labels(self):
+        dataframe = pd.DataFrame({"group": ["a", "b", "a"], "year": [2023, 2024, 2024], "value": [1, 2, 3]})
+        code = "pivot_df = df.pivot_table(index='group', columns='year', values='value', aggfunc='sum')\n"
+
+        results = self.executor.execute(code, {"df": dataframe}, ["pivot_df"])
+
+        expected = dataframe.pivot_table(index="group", columns="year", values="value", aggfunc="sum")
+        pd.testing.assert_frame_equal(results["pivot_df"], expected)
+
+        # duplicated column labels
+        results = self.executor.execute("result = pd.concat([df, df], axis=1)\n", {"pd": pd, "df": dataframe}, ["result"])
+        self.assertEqual(results["result"].columns.tolist(), ["group", "year", "value"] * 2)
+
+    def test_unsupported_results(self):
+        with self.assertRaises(CodeExecutionError) as context:
+            self.executor.execute("result = 1\n", {}, ["result"])
+        self.assertIn("results of type int are not supported", context.exception.message)
+
+        # the result is not unpickled in the app, the code of __reduce__ is never run
+        with tempfile.TemporaryDirectory() as temp_dir:
+            marker_path = os.path.join(temp_dir, "marker")
+            code = (
+                "class Result:\n"
+                "    def __reduce__(self):\n"
+                "        return (open, (marker_path, 'w'))\n"
+                "result = Result()\n"
+            )
+            with self.assertRaises(CodeExecutionError):
+                self.executor.execute(code, {"marker_path": marker_path}, ["result"])
+            self.assertFalse(os.path.exists(marker_path))
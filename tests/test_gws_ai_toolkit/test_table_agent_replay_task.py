@@ -2,7 +2,9 @@
 Unit tests for TableAgentReplay task
 """
 
+import os
 import unittest
+from unittest.mock import patch
 
 import pandas as pd
 from gws_ai_toolkit.core.agents.table.table_agent_replay_task import TableAgentReplayTask
@@ -182,3 +184,84 @@ class TestTableAgentReplayTask(unittest.TestCase):
             "hello", renamed_df.columns, "Renamed table should not have 'hello' column"
         )
         self.assertIn("y_values", renamed_df.columns, "Renamed table should have 'y_values' column")
+
+    def test_replay_batch(self):
+        """Test the replay of the same events on many input sets"""
+        input_table_sets = self._create_batch_input_table_sets(3)
+
+        output_resource_sets = TableAgentReplayTask.replay_batch(
+            self._get_batch_serialized_events(), input_table_sets, max_workers=2
+        )
+
+        self._check_batch_output_resource_sets(output_resource_sets, 3)
+
+    def test_replay_batch_in_process(self):
+        """Test the replay of many input sets in the current process with a single worker"""
+        input_table_sets = self._create_batch_input_table_sets(2)
+
+        # the recorded events are replayed, the OpenAI API is not called
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test_key"}), patch(
+            "gws_ai_toolkit.core.agents.table.table_agent_replay_task.ProcessPoolExecutor"
+        ) as process_pool_executor:
+            output_resource_sets = TableAgentReplayTask.replay_batch(
+                self._get_batch_serialized_events(), input_table_sets, max_workers=1
+            )
+
+        process_pool_executor.assert_not_called()
+        self._check_batch_output_resource_sets(output_resource_sets, 2)
+
+    def _get_batch_serialized_events(self) -> list:
+        return [
+            {
+                "type": "user_tables",
+                "query": "Rename the column 'hello' to 'x_values'",
+                "agent_id": "7aa25334-2d6a-4101-8463-3ce9a513c08e",
+                "table_keys": ["test_data"],
+                "output_table_names": None,
+            },
+            {
+                "response_id": "resp_1",
+                "agent_id": "7aa25334-2d6a-4101-8463-3ce9a513c08e",
+                "call_id": "call_1",
+                "type": "function_call",
+                "function_name": "transform_table",
+                "arguments": {
+                    "table_name": "test_data",
+                    "output_table_name": "test_data_renamed",
+                    "user_request": "Rename the column 'hello' to 'x_values'",
+                },
+            },
+            {
+                "response_id": "resp_1",
+                "agent_id": "eca776ce-5a88-470d-8ccc-40e8ff1a6d5e",
+                "type": "create_sub_agent",
+            },
+            {
+                "response_id": "resp_2",
+                "agent_id": "eca776ce-5a88-470d-8ccc-40e8ff1a6d5e",
+                "call_id": "call_2",
+                "type": "function_call",
+                "function_name": "transform_dataframe",
+                "arguments": {
+                    "code": "transformed_df = df.rename(columns={'hello': 'x_values'})",
+                    "transformed_table_name": "test_data_renamed",
+                },
+            },
+        ]
+
+    def _create_batch_input_table_sets(self, count: int) -> list[dict[str, Table]]:
+        input_table_sets = []
+        for i in range(count):
+            input_table = Table(pd.DataFrame({"hello": [i, i + 1], "y_values": [2, 4]}))
+            input_table.name = "test_data"
+            input_table_sets.append({"test_data": input_table})
+        return input_table_sets
+
+    def _check_batch_output_resource_sets(self, output_resource_sets: list[ResourceSet], count: int) -> None:
+        self.assertEqual(len(output_resource_sets), count)
+        for i, output_resource_set in enumerate(output_resource_sets):
+            output_resources = output_resource_set.get_resources()
+            self.assertEqual(list(output_resources.keys()), ["test_data_renamed"])
+            renamed_df = output_resources["test_data_renamed"].to_dataframe()
+            self.assertEqual(list(renamed_df.columns), ["x_values", "y_values"])
+            self.assertEqual(renamed_df["x_values"].tolist(), [i, i + 1])
@@ -0,0 +1,54 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import pandas as pd
+from gws_ai_toolkit.core.agents.table.table_ai_description_cache import TableAiDescriptionCache
+from gws_core import Table
+
+
+# test_table_ai_description_cache.py
+class TestTableAiDescriptionCache(TestCase):
+    """Test the memoization of the table AI descriptions."""
+
+    def test_description_is_cached(self):
+        TableAiDescriptionCache.clear()
+        table = Table(pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}))
+        other_table = Table(pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}))
+
+        with patch.object(Table, "get_ai_description", return_value="description") as get_ai_description:
+            for _ in range(5):
+                self.assertEqual(TableAiDescriptionCache.get_ai_description(table), "description")
+            self.assertEqual(get_ai_description.call_count, 1)
+
+            # another table object has its own description
+            TableAiDescriptionCache.get_ai_description(other_table)
+            self.assertEqual(get_ai_description.call_count, 2)
+
+            # the description is computed again when the data changes
+            table.set_data(pd.DataFrame({"a": [1, 2, 3], "c": [1.0, 2.0, 3.0]}))
+            TableAiDescriptionCache.get_ai_description(table)
+            self.assertEqual(get_ai_description.call_count, 3)
+
+            table.get_data().iloc[0, 0] = 10
+            TableAiDescriptionCache.get_ai_description(table)
+            self.assertEqual(get_ai_description.call_count, 4)
+
+    def test_schema_summary(self):
+        TableAiDescriptionCache.clear()
+        table = Table(pd.DataFrame({"a": [1, 2, 3], "b": [1.5, 2.5, 3.5]}))
+
+        with patch.object(Table, "get_ai_description", return_value="description") as get_ai_description:
+            summary = TableAiDescriptionCache.get_schema_summary(table)
+            # the schema summary doesn't compute the detailed description
+            self.assertEqual(get_ai_description.call_count, 0)
+
+        self.assertIn("Rows: 3, columns: 2", summary)
+        self.assertIn("- a (int64)", summary)
+        self.assertIn("- b (float64)", summary)
+        self.assertIs(TableAiDescriptionCache.get_schema_summary(table), summary)
+
+        # the sketch changes with the data
+        table.get_data().iloc[0, 0] = 10
+        other_summary = TableAiDescriptionCache.get_schema_summary(table)
+        self.assertNotEqual(other_summary, summary)
+        self.assertEqual(other_summary.splitlines()[1:], summary.splitlines()[1:])
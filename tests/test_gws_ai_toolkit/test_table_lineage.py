@@ -0,0 +1,114 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import pandas as pd
+from gws_ai_toolkit.core.agents.code_execution_error import CodeExecutionError
+from gws_ai_toolkit.core.agents.table.table_lineage import TableLineage, get_table_fingerprint
+from gws_core import Table
+
+
+def create_table(dataframe: pd.DataFrame, name: str) -> Table:
+    table = Table(dataframe)
+    table.name = name
+    return table
+
+
+# test_table_lineage.py
+class TestTableLineage(TestCase):
+    """Test the recomputation of the derived tables when a table changes."""
+
+    def _create_lineage(self) -> tuple[TableLineage, dict[str, Table]]:
+        """sales -> sales_x2 -> merged <- products, and products -> products_clean"""
+        sales = create_table(pd.DataFrame({"product": ["a", "b"], "amount": [1, 2]}), "sales")
+        products = create_table(pd.DataFrame({"product": ["a", "b"], "price": [10, 20]}), "products")
+        sales_x2 = create_table(pd.DataFrame({"product": ["a", "b"], "amount": [2, 4]}), "sales_x2")
+        products_clean = create_table(products.get_data().copy(), "products_clean")
+        merged = create_table(sales_x2.get_data().merge(products.get_data()), "merged")
+
+        lineage = TableLineage()
+        lineage.add_transform(
+            "transformed_df = df.copy()\ntransformed_df['amount'] = transformed_df['amount'] * 2",
+            {"sales": sales},
+            "sales_x2",
+        )
+        lineage.add_transform("transformed_df = df.dropna()", {"products": products}, "products_clean")
+        lineage.add_multi_transform(
+            "result_tables = {'merged': tables['sales_x2'].merge(tables['products'])}",
+            {"sales_x2": sales_x2, "products": products},
+            ["merged"],
+        )
+        tables = {
+            "sales": sales,
+            "products": products,
+            "sales_x2": sales_x2,
+            "products_clean": products_clean,
+            "merged": merged,
+        }
+        return lineage, tables
+
+    def test_downstream_tables(self):
+        lineage, tables = self._create_lineage()
+
+        self.assertEqual(lineage.get_downstream_table_names(["sales"]), ["sales_x2", "merged"])
+        self.assertEqual(lineage.get_downstream_table_names(["products"]), ["products_clean", "merged"])
+        self.assertEqual(lineage.get_downstream_table_names(["merged"]), [])
+        self.assertIsNone(lineage.get_step("sales"))
+        self.assertEqual(lineage.get_step("merged").input_table_names, ["sales_x2", "products"])
+        self.assertEqual(lineage.get_stale_table_names(tables), [])
+
+        # the lineage is stored with the agent
+        self.assertEqual(TableLineage.from_json(lineage.to_json_dict()), lineage)
+
+    def test_recompute(self):
+        lineage, tables = self._create_lineage()
+
+        # the source file of sales is reloaded
+        tables["sales"] = create_table(pd.DataFrame({"product": ["a", "b"], "amount": [5, 6]}), "sales")
+        self.assertEqual(lineage.get_stale_table_names(tables), ["sales_x2", "merged"])
+
+        recomputed_tables = lineage.recompute(tables)
+
+        # products_clean doesn't depend on sales, it is not recomputed
+        self.assertEqual(list(recomputed_tables.keys()), ["sales_x2", "merged"])
+        self.assertEqual(recomputed_tables["sales_x2"].get_data()["amount"].tolist(), [10, 12])
+        self.assertEqual(recomputed_tables["merged"].get_data()["amount"].tolist(), [10, 12])
+        self.assertEqual(recomputed_tables["merged"].get_data()["price"].tolist(), [10, 20])
+        self.assertEqual(recomputed_tables["sales_x2"].name, "sales_x2")
+
+        tables.update(recomputed_tables)
+        self.assertEqual(lineage.get_stale_table_names(tables), [])
+        self.assertEqual(lineage.get_step("sales_x2").input_fingerprints["sales"], get_table_fingerprint(tables["sales"]))
+
+    def test_recompute_error(self):
+        lineage, tables = self._create_lineage()
+
+        tables["sales"] = create_table(pd.DataFrame({"product": ["a"], "quantity": [5]}), "sales")
+        with self.assertRaises(CodeExecutionError):
+            lineage.recompute(tables)
+
+        del tables["products"]
+        with self.assertRaises(ValueError):
+            lineage.recompute(tables, ["products"])
+
+    def test_replace_step(self):
+        lineage, _ = self._create_lineage()
+        sales = create_table(pd.DataFrame({"product": ["a"], "amount": [1]}), "sales")
+
+        lineage.add_transform("transformed_df = df.head(1)", {"sales": sales}, "products_clean")
+
+        self.assertEqual(len(lineage.steps), 3)
+        self.assertEqual(lineage.get_step("products_clean").input_table_names, ["sales"])
+        self.assertEqual(lineage.get_downstream_table_names(["products"]), ["merged"])
+
+    def test_parallel_add_step(self):
+        """The transformations of disjoint tables handled by parallel sub agents are all recorded"""
+        lineage = TableLineage()
+        tables = [create_table(pd.DataFrame({"value": [i]}), f"table_{i}") for i in range(200)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for table in tables:
+                executor.submit(
+                    lineage.add_transform, "transformed_df = df", {table.name: table}, f"{table.name}_out"
+                )
+
+        self.assertEqual(len(lineage.steps), 200)